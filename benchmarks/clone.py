@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time taken by ``clone()`` for the classes of ``core.objects``.
+
+Clones one instance of each class ``n`` times, five times over, and
+prints the mean time of a clone in the fastest round, in microseconds. A Pokémon is cloned after its
+``current`` stats are built, as it is in a battle.
+
+Usage
+-----
+    $ python benchmarks/clone.py
+    $ python benchmarks/clone.py -n 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/benchmarks', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import numpy as np
+
+from phanpy.core.objects import Move, Pokemon, Status, Trainer
+
+
+def _pokemon():
+    p = Pokemon('pikachu')
+    p.current
+    return p
+
+
+CASES = [('Status', lambda: Status(5) + Status('confused', 3)),
+         ('Move', lambda: Move('tackle')),
+         ('Pokemon', _pokemon),
+         ('Trainer', lambda: Trainer('Satoshi', 6))]
+
+
+def per_clone(instance, n):
+    """Microseconds per ``instance.clone()``."""
+    return min(timeit.repeat(instance.clone, number=n, repeat=5)) / n * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', type=int, default=2000,
+                        help='clones per class (default: 2000)')
+    args = parser.parse_args(argv)
+
+    np.random.seed(0)
+    for name, make in CASES:
+        print('{:<8} {:>8.1f} µs'.format(name, per_clone(make(), args.n)))
+
+
+if __name__ == '__main__':
+    main()
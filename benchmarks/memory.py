@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Memory used by each instance of the classes of ``core.objects``.
+
+Builds ``n`` instances of each class, keeps them alive, and divides
+the memory allocated meanwhile (as traced by ``tracemalloc``) by
+``n``. Data shared between instances, such as the tables, is only
+counted once, so the numbers are what one more instance costs.
+
+Usage
+-----
+    $ python benchmarks/memory.py
+    $ python benchmarks/memory.py -n 500
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/benchmarks', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import numpy as np
+
+from phanpy.core.objects import Item, Move, Pokemon, Status, Trainer
+
+CASES = [('Status', lambda i: Status(5)),
+         ('Item', lambda i: Item(1 + i % 100)),
+         ('Move', lambda i: Move(1 + i % 400)),
+         ('Pokemon', lambda i: Pokemon(1 + i % 490)),
+         ('Trainer', lambda i: Trainer(str(i), 3))]
+
+
+def per_instance(make, n):
+    """Bytes allocated per instance made by ``make(i)``."""
+    # Warm up the caches and registries first.
+    make(0)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [make(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del instances
+    return (after - before) / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', type=int, default=200,
+                        help='instances per class (default: 200)')
+    args = parser.parse_args(argv)
+
+    np.random.seed(0)
+    for name, make in CASES:
+        n = max(1, args.n // 10) if name == 'Trainer' else args.n
+        print('{:<8} {:>10,.0f} bytes'.format(name, per_instance(make, n)))
+
+
+if __name__ == '__main__':
+    main()
@@ -127,6 +127,13 @@ status_damage(...)
     ``poison`` or ``burn``, apply the effect. Return nothing.
 
 
+metronome(...)
+    metronome(f, version_group_id=None)
+
+    The id of a random move for ``f``'s metronome: one of
+    ``metronome_pool(version_group_id)``, which ``f`` does not know.
+
+
 effect(...)
     effect(f1, m1, f2, m2)
 
@@ -139,7 +146,38 @@ attack(...)
 
     Apply the damage to ``f2`` (if makes a hit). Apply the move's effects
     and all the side-effects. Apply the status damage at the end.
-    Return nothing.
+    Return whether the move hit.
+
+
+battle(...)
+    battle(p1, p2, max_turns=100, log=None)
+
+    Let ``p1`` and ``p2`` use random moves against each other until
+    one of them faints. Every action is passed to ``log``, if any (see
+    ``core.replay``).
+
+    Returns
+    -------
+    (winner, turns) : (Pokemon or None, int)
+
+
+battle_events(...)
+    battle_events(p1, p2, max_turns=100, log=None)
+
+    The same battle as a generator of ``Event``s: the moves used, the
+    damage dealt, the statuses inflicted and the pokemon fainted. It
+    returns ``(winner, turns)``.
+
+
+trainer_battle(...)
+    trainer_battle(t1, t2, max_turns=100)
+
+    Let the parties of trainers ``t1`` and ``t2`` battle one pokemon
+    at a time, until one party has fainted.
+
+    Returns
+    -------
+    (winner, turns) : (Trainer or None, int)
 
 '''
 
@@ -161,18 +199,38 @@ sys.path.append(root_path) if root_path not in sys.path else None
 # from os import sys, path
 # sys.path.append(path.abspath('.'))
 
-from collections import deque
+from collections import namedtuple
 from functools import reduce
 import numpy as np
 from numpy.random import binomial, uniform, randint, choice
+from pandas import read_csv
 
 from phanpy.core.tables import efficacy
-from phanpy.core.objects import Item, Status
+from phanpy.core.damage import critical_hits, hit_chances
+from phanpy.core.objects import Item, Move, Status
 import phanpy.core.tables as tb
 
 move_natural_gift = tb.move_natural_gift
 which_ability = tb.which_ability
 
+# An event of ``battle_events``.
+Event = namedtuple('Event', ['turn', 'kind', 'pokemon', 'value'])
+
+# Moves that []{move:metronome} never selects.
+METRONOME_BANNED = ('assist', 'chatter', 'copycat', 'counter', 'covet',
+                    'destiny-bond', 'detect', 'endure', 'feint',
+                    'focus-punch', 'follow-me', 'helping-hand', 'me-first',
+                    'metronome', 'mimic', 'mirror-coat', 'mirror-move',
+                    'protect', 'quick-guard', 'sketch', 'sleep-talk',
+                    'snatch', 'struggle', 'switcheroo', 'thief', 'trick',
+                    'wide-guard')
+
+# Shadow moves and the like have ids from 10001.
+_MAX_MOVE_ID = 10000
+
+# Move ids eligible for metronome, keyed by version group id.
+_metronome_pools = {}
+
 def attacking_order(p1, p1_move, p2, p2_move):
     """Determine the attacking order based on the priorities of the
     mvoes, the speed of each pokemon, their held items, and their
@@ -356,7 +414,9 @@ def is_mobile(f, m):
         # Pokémon attacked itself with a 40-power typeless physical
         # attack (without the possibility of a critical hit).
         if binomial(1, 0.5):
-            f1.current.hp -= 2 + (2 * (f1.level/5 + 1) * 40 * A/D) // 50
+            A = f.current.attack
+            D = f.current.defense
+            f.current.hp -= 2 + (2 * (f.level/5 + 1) * 40 * A/D) // 50
             return False
         else:
             return True
@@ -424,7 +484,8 @@ def makes_hit(f1, m1, f2):
 
 
 def critical(f1, m1):
-    """Returns 2 if a hit is critical else 1 (Gen.II ~ Gen.V).
+    """Returns the critical modifier of the generation (2 up to Gen.V,
+    1.5 since) if a hit is critical else 1.
 
     # XXX: moves exempt from critical hit calculation?
     """
@@ -432,19 +493,13 @@ def critical(f1, m1):
 
     f1.stage.critical = np.clip(a=f1.stage.critical, a_max=4, a_min=0)
 
-    critical_chances = {0: 1/16.,
-                        1: 1/8.,
-                        2: 1/4.,
-                        3: 1/3.,
-                        4: 1/2.}
+    critical_modifier, critical_chances = critical_hits()
 
-    p = critical_chances[f1.stage.critical]
+    p = critical_chances[int(f1.stage.critical)]
 
     critical_rv = binomial(1, p)
 
-    # Since critical_rv is either 0 or 1, and we want the return either
-    # 1 or 2, we can just add 1 to the random variable.
-    return critical_rv + 1
+    return critical_modifier if critical_rv else 1
 
 
 def stab(f1, m1):
@@ -472,12 +527,15 @@ def burn(f1, m1):
         return 1
 
 
-def base_damage(f1, m1, f2, m2):
+def base_damage(f1, m1, f2, m2, return_critical=False):
     """Return the damage for all moves deals regular damage.
+
+    If ``return_critical``, also return whether it was a critical hit.
     """
     effect = m1.effect_id
 
     critical_modifier = critical(f1, m1)
+    critical_hit = critical_modifier > 1
     type_modifier = efficacy(m1.type, f2.types)
     random_modifier = uniform(0.85, 1.)
     stab_modifier = stab(f1, m1)
@@ -581,7 +639,8 @@ def base_damage(f1, m1, f2, m2):
             power = 40
 
         else:
-            return -.25 * f2.stats.hp
+            heal = -.25 * f2.stats.hp
+            return (heal, False) if return_critical else heal
 
     elif effect == 124:
         # Inflicts {mechanic:regular-damage}.
@@ -865,18 +924,29 @@ def base_damage(f1, m1, f2, m2):
     base_damage = (2 + (2 * (f1.level/5 + 1) * power * A/D) // 50) * modifiers
 
     if not np.isnan(m1.min_hits):
-        # If the move hits multiple times.
+        # If the move hits multiple times, with the chances of the
+        # generation.
         # XXX: in the actual game, the critical modifier is determined
         # every time the move makes a hit.
-        return base_damage * choice(np.arange(m1.min_hits,
-                                              m1.max_hits+1))
-    else:
-        return base_damage
+        hits, chances = hit_chances(m1.min_hits, m1.max_hits)
+        base_damage = base_damage * choice(hits, p=chances)
 
+    return (base_damage, critical_hit) if return_critical else base_damage
 
-def calculate_damage(f1, m1, f2, m2):
+
+def calculate_damage(f1, m1, f2, m2, return_critical=False):
     """Calculate the damage including the moves dealing direct damages
     and regular damages.
+
+    If ``return_critical``, also return whether it was a critical hit.
+    """
+    damage, critical_hit = _calculate_damage(f1, m1, f2, m2)
+    return (damage, critical_hit) if return_critical else damage
+
+
+def _calculate_damage(f1, m1, f2, m2):
+    """The damage of ``calculate_damage``, and whether it was a critical
+    hit.
     """
     effect = m1.effect_id
 
@@ -894,28 +964,28 @@ def calculate_damage(f1, m1, f2, m2):
         #
         # This move cannot be selected by []{move:sleep-talk}.
         # XXX: group moves with `charge` flag into a new function.
-        f1.flags += Status('bide', 2)
-        return 0
+        f1.status += Status('bide', 2)
+        return 0, False
 
     elif effect == 41:
         # Inflicts [typeless]{mechanic:typeless} damage equal to half
         # the target's remaining [HP]{mechanic:hp}.
-        return f2.current.hp/2.
+        return f2.current.hp/2., False
 
     elif effect == 42:
         # Inflicts 40 points of damage.
-        return immuned(40.)
+        return immuned(40.), False
 
     elif effect == 88:
         # Inflicts damage equal to the user's level.  Type immunity
         # applies, but other type effects are ignored.
-        return immuned(f1.level)
+        return immuned(f1.level), False
 
     elif effect == 89:
         # Inflicts [typeless]{mechanic:typeless} damage between 50% and
         # 150% of the user's level, selected at random in increments of
         # 10%.
-        return f1.level * randint(5, 15)/10.
+        return f1.level * randint(5, 15)/10., False
 
     elif effect == 90:
         # Targets the last opposing Pokémon to hit the user with a
@@ -925,15 +995,16 @@ def calculate_damage(f1, m1, f2, m2):
         # Type immunity applies, but other type effects are ignored.
 
         if f1.order == 2:
-            received_damage = f1.history.damage[0]
+            damages = f1.history.damage
+            received_damage = damages[0] if damages else 0
             if m2.damage_class_id == 2:
-                return immuned(received_damage * 2)
+                return immuned(received_damage * 2), False
 
-        return 0
+        return 0, False
 
     elif effect == 131:
         # Inflicts exactly 20 damage.
-        return immuned(20.)
+        return immuned(20.), False
 
     elif effect == 145:
         # Targets the last opposing Pokémon to hit the user with a
@@ -944,11 +1015,12 @@ def calculate_damage(f1, m1, f2, m2):
         # Type immunity applies, but other type effects are ignored.
 
         if f1.order == 2:
-            received_damage = f1.history.damage[0]
+            damages = f1.history.damage
+            received_damage = damages[0] if damages else 0
             if received_damage and m2.damage_class_id == 3:
-                return immuned(received_damage * 2)
+                return immuned(received_damage * 2), False
 
-        return 0
+        return 0, False
 
     elif effect == 155:
         # Inflicts {mechanic:typeless} {mechanic:regular-damage}.
@@ -960,11 +1032,17 @@ def calculate_damage(f1, m1, f2, m2):
         # The random factor in the damage formula is not used.
         # []{type:dark} Pokémon still get [STAB]{mechanic:stab}.
 
-        damage = 0
-        for pokemon in f1.trainer.party():
-            if pokemon.status.volatile.all():
-                damage += regular_damage(pokemon, m1, f2, m2)
-        return damage
+        damage, any_critical = 0, False
+        party = f1.trainer.party() if f1.trainer else [f1]
+        for pokemon in party:
+            status = pokemon.status
+            major = (status.id[~status.volatile] > 0).any()
+            if pokemon.current.hp > 0 and not major:
+                hit, critical_hit = base_damage(pokemon, m1, f2, m2,
+                                                    return_critical=True)
+                damage += hit
+                any_critical |= critical_hit
+        return damage, any_critical
 
     elif effect == 190:
         # Inflicts exactly enough damage to lower the target's
@@ -974,7 +1052,7 @@ def calculate_damage(f1, m1, f2, m2):
         # This effect counts as damage for moves that respond to damage.
         return immuned(np.clip(a=f2.current.hp - f1.current.hp,
                                a_min=0,
-                               a_max=f2.current.hp))
+                               a_max=f2.current.hp)), False
 
     elif effect == 228:
         # Targets the last opposing Pokémon to hit the user with a
@@ -984,11 +1062,12 @@ def calculate_damage(f1, m1, f2, m2):
         # Type immunity applies, but other type effects are ignored.
 
         if f1.order == 2:
-            received_damage = f1.history.damage[0]
+            damages = f1.history.damage
+            received_damage = damages[0] if damages else 0
             if m2.damage_class_id != 1:
-                return immuned(received_damage * 1.5)
+                return immuned(received_damage * 1.5), False
 
-        return 0.
+        return 0., False
 
     elif effect == 321:
         # Inflicts damage equal to the user's remaining
@@ -997,11 +1076,11 @@ def calculate_damage(f1, m1, f2, m2):
         damage = f1.current.hp
         f1.current.hp = 0
 
-        return damage
+        return damage, False
 
     else:
         # All cases up to Gen.5 should be covered.
-        return regular_damage(f1, m1, f2, m2)
+        return base_damage(f1, m1, f2, m2, return_critical=True)
 
 
 def stat_changer(f1, m1, f2, m2):
@@ -1052,16 +1131,19 @@ def ailment_inflictor(f1, m1, f2, m2):
     """Inflicts ailment to the selected target."""
 
     ailment_id = m1.meta_ailment_id
-    ailment_chance = 100. if np.isnan(m1.ailment_chance) else m1.ailment_chance
-    lasting_turns = None if np.isnan(m1.min_turns) else randint(m1.min_turns,
-                                                                m1.max_turns+1)
+    # A chance of 0 is that of the moves whose only effect is the
+    # ailment: they always inflict it when they hit.
+    ailment_chance = (100. if np.isnan(m1.ailment_chance)
+                      or m1.ailment_chance == 0 else m1.ailment_chance)
+    lasting_turns = (float('inf') if np.isnan(m1.min_turns)
+                     else randint(m1.min_turns, m1.max_turns+1))
     ailment = Status(ailment_id, lasting_turns)
 
     if binomial(1, ailment_chance/100.):
         if m1.target_id == 7:
             # Self-inflicted ailment
             f1.status += ailment
-            if m1.effect == 38:
+            if m1.effect_id == 38:
                 # User sleeps for two turns, completely healing itself.
                 # At the beginning of each round, ``is_mobile()``
                 # should check if 'rest' is in ``f1.flags`` and if
@@ -1083,7 +1165,7 @@ def ailment_inflictor(f1, m1, f2, m2):
             f2.status += ailment
 
 
-def status_damage(f1):
+def status_damage(f1, f2=None):
     """Takes the damage if the pokemon has certain statuses. The damage
     is effect **at the end of the turn**.
     """
@@ -1113,12 +1195,58 @@ def status_damage(f1):
 
         damage = f1.stats.hp // 16.
 
-        if f2.item.name == 'binding-band':
+        if f2 is not None and f2.item.name == 'binding-band':
             damage *= 2.
 
         f1.current.hp -= damage
 
 
+def metronome_pool(version_group_id=None):
+    """The ids of the moves metronome can select in a version group.
+
+    That is, the moves of its generation, but those of
+    ``METRONOME_BANNED``. The pool is built once per version group.
+
+    Returns
+    -------
+    move_ids : numpy.ndarray
+        Sorted and read-only.
+    """
+    if version_group_id is None:
+        version_group_id = tb.VERSION_GROUP_ID
+
+    if version_group_id not in _metronome_pools:
+        with open(tb.DATA_PATH + 'moves.csv') as csv_file:
+            moves = read_csv(csv_file)
+
+        generation_id = tb.which_generation(version_group_id)
+        condition = ((moves['generation_id'] <= generation_id)
+                     & (moves['id'] <= _MAX_MOVE_ID)
+                     & ~moves['identifier'].isin(METRONOME_BANNED))
+
+        pool = np.sort(moves['id'][condition].values)
+        pool.flags.writeable = False
+        _metronome_pools[version_group_id] = pool
+
+    return _metronome_pools[version_group_id]
+
+
+def metronome(f, version_group_id=None):
+    """The id of a move selected by metronome, used by ``f``.
+
+    A uniform draw from ``metronome_pool``, drawn again while it is a
+    move ``f`` already knows.
+    """
+    pool = metronome_pool(version_group_id)
+    known = {m.id for m in f.moves}
+
+    move_id = pool[randint(len(pool))]
+    while move_id in known:
+        move_id = pool[randint(len(pool))]
+
+    return int(move_id)
+
+
 def effect(f1, m1, f2, m2):
     """Activates m1's effect if it is a unique effect.
 
@@ -1221,19 +1349,7 @@ def effect(f1, m1, f2, m2):
         # []{move:mirror-move}, nor selected by []{move:assist},
         # []{move:metronome}, or []{move:sleep-talk}.
 
-        ineligible_moves = deque([x.name for x in f1.moves])
-        ineligible_moves.extend(['assist', 'chatter', 'copycat', 'counter',
-                                 'covet', 'destiny-bond', 'detect', 'endure',
-                                 'feint', 'focus-punch', 'follow-me',
-                                 'helping-hand', 'me-first', 'metronome',
-                                 'mimic', 'mirror-coat', 'mirror-move',
-                                 'protect', 'quick-guard', 'sketch',
-                                 'sleep-talk', 'snatch', 'struggle',
-                                 'switcheroo', 'thief', 'trick', 'wide-guard'])
-
-        all_moves = deque([x for x in tb.moves.identifier.values])
-        eligible_moves = list(set(all_moves) - set(ineligible_moves))
-        m1 = np.random.choice(eligible_moves)
+        m1 = metronome(f1)
 
     elif effect == 95:
         # If the user targets the same target again before the end of
@@ -1263,24 +1379,24 @@ def effect(f1, m1, f2, m2):
         # [failed]{mechanic:failed}, or if its last used move has 0 PP
         # remaining, this move will fail.
 
-        move_names = [x.name for x in f2.moves]
-        try:
-            last_move = f2.flags['last-successfully-used-move']
-            index = np.where(move_names == last_move)[0][0]
-            f2.moves[index].pp -= 4
-        except KeyError:
-            pass
+        move_ids = [x.id for x in f2.moves]
+        last_move = f2.flags.get('last-successfully-used-move')
+        if last_move in move_ids:
+            f2.moves[move_ids.index(last_move)].pp -= 4
 
     elif effect == 112:
         pass
 
 
 # Order, move, and item should be determined before calling this function.
-def attack(f1, m1, f2, m2):
+def attack(f1, m1, f2, m2, return_critical=False):
     """f1 uses m1 to attack f2.
 
     Given f1 is mobile. Given f1 attacks first.
 
+    Returns whether the move hit and, if ``return_critical``, whether
+    it was a critical hit.
+
     Moves with different meta-categories have different behaviors.
     There are 14 different meta-categories according to veekun.com.
 
@@ -1289,6 +1405,8 @@ def attack(f1, m1, f2, m2):
         other damage
     """
 
+    critical_hit = False
+
     if makes_hit(f1, m1, f2):
         # Determine if the move is hit or not.
 
@@ -1298,7 +1416,9 @@ def attack(f1, m1, f2, m2):
             # `direct_damage` checks if a move deals direct damage,
             # and if not, then returns the regular damage.
 
-            damage = np.floor(calculate_damage(f1, m1, f2, m2))
+            damage, critical_hit = calculate_damage(f1, m1, f2, m2,
+                                                    return_critical=True)
+            damage = np.floor(damage)
 
             # print("{} dealt {} to {}!\n".format(f1.name, damage, f2.name))
 
@@ -1323,7 +1443,189 @@ def attack(f1, m1, f2, m2):
 
         effect(f1, m1, f2, m2)
         m1.pp -= 1
-        status_damage(f1)
+        status_damage(f1, f2)
+        hit = True
 
     else:
-        pass
+        hit = False
+
+    return (hit, critical_hit) if return_critical else hit
+
+
+def battle(p1, p2, max_turns=100, log=None):
+    """Simulate a 1-on-1 battle between ``p1`` and ``p2``.
+
+    Every turn each pokemon uses a random move with PP left, until one
+    of them faints or ``max_turns`` turns have passed.
+
+    ``log`` is a ``replay.ReplayWriter``, or anything with the same
+    ``action`` method; it is given every move used (or not, when the
+    pokemon could not move), and whether it was a critical hit.
+
+    Returns
+    -------
+    winner : Pokemon or None
+        The pokemon left standing. ``None`` if both of them fainted or
+        no one fainted within ``max_turns`` turns.
+    turns : int
+        The number of turns played.
+    """
+    # Without events the generator returns at once.
+    try:
+        next(_battle(p1, p2, max_turns, log, events=False))
+    except StopIteration as stop:
+        return stop.value
+
+
+def battle_events(p1, p2, max_turns=100, log=None):
+    """Simulate a 1-on-1 battle like ``battle``, one event at a time.
+
+    Every event is an ``Event(turn, kind, pokemon, value)``:
+
+    ================  ==================================================
+    kind              value
+    ================  ==================================================
+    ``'move'``        the ``Move`` used, which hit
+    ``'miss'``        the ``Move`` used, which missed
+    ``'immobile'``    the ``Move`` that could not be used
+    ``'damage'``      the hp lost (negative when healed)
+    ``'status'``      the name of a status inflicted
+    ``'faint'``       ``None``
+    ``'end'``         the number of turns; ``pokemon`` is the winner
+    ================  ==================================================
+
+    The battle only goes on as the events are consumed.
+
+    Usage
+    -----
+        >>> for event in battle_events(Pokemon(445), Pokemon(213)):
+        ...     if event.kind == 'damage':
+        ...         print(event.pokemon.name, event.value)
+    """
+    return (yield from _battle(p1, p2, max_turns, log, events=True))
+
+
+def _snapshot(*pokemon):
+    return [(p.current.hp, set(p.status)) for p in pokemon]
+
+
+def _action_events(turn, f, m, g, mobile, hit, before):
+    """The events of ``f`` using ``m`` against ``g``."""
+    kind = 'move' if hit else 'miss' if mobile else 'immobile'
+    yield Event(turn, kind, f, m)
+
+    for p, (hp, status) in zip((g, f), before):
+        if p.current.hp != hp:
+            yield Event(turn, 'damage', p, hp - p.current.hp)
+
+        for name in sorted(set(p.status) - status):
+            yield Event(turn, 'status', p, name)
+
+        if p.current.hp <= 0 < hp:
+            yield Event(turn, 'faint', p, None)
+
+
+def _battle(p1, p2, max_turns, log, events):
+    """The turn loop of ``battle`` and ``battle_events``, which yields
+    events only if ``events`` is true.
+    """
+    turn = 0
+
+    while turn < max_turns:
+        turn += 1
+
+        m1 = choose_move(p1)
+        m2 = choose_move(p2)
+
+        f1, m1, f2, m2 = attacking_order(p1, m1, p2, m2)
+
+        for (f, m, g, n) in [(f1, m1, f2, m2), (f2, m2, f1, m1)]:
+
+            if log is not None:
+                hp = g.current.hp
+
+            if events:
+                before = _snapshot(g, f)
+
+            mobile = is_mobile(f, m)
+            hit, critical_hit = (attack(f, m, g, n, return_critical=True)
+                                 if mobile else (False, False))
+
+            if log is not None:
+                log.action(turn, f, m, g, mobile, hit, hp, critical_hit)
+
+            if events:
+                yield from _action_events(turn, f, m, g, mobile, hit, before)
+
+            if f1.current.hp <= 0 or f2.current.hp <= 0:
+                break
+
+        if p1.current.hp <= 0 or p2.current.hp <= 0:
+            break
+
+        f1.status.reduce()
+        f2.status.reduce()
+
+    if p1.current.hp > 0 and p2.current.hp <= 0:
+        winner = p1
+
+    elif p2.current.hp > 0 and p1.current.hp <= 0:
+        winner = p2
+
+    else:
+        winner = None
+
+    if events:
+        yield Event(turn, 'end', winner, turn)
+
+    return winner, turn
+
+
+def trainer_battle(t1, t2, max_turns=100):
+    """Simulate a battle between the parties of ``t1`` and ``t2``.
+
+    The first pokemon of each party still standing battle 1-on-1 with
+    ``battle``; the winner stays in, with what hp it has left, against
+    the next pokemon of the other party.
+
+    Returns
+    -------
+    winner : Trainer or None
+        ``None`` if both parties fainted or the battle lasted more than
+        ``max_turns`` turns in total.
+    turns : int
+    """
+
+    def standing(trainer):
+        return [p for p in trainer.party() if p.current.hp > 0]
+
+    turns = 0
+
+    while standing(t1) and standing(t2) and turns < max_turns:
+        __, turn = battle(standing(t1)[0], standing(t2)[0],
+                          max_turns - turns)
+        # A 1-on-1 battle that runs out of turns uses up all of them.
+        turns += turn
+
+    if standing(t1) and not standing(t2):
+        return t1, turns
+
+    elif standing(t2) and not standing(t1):
+        return t2, turns
+
+    else:
+        return None, turns
+
+
+def choose_move(f):
+    """Randomly pick one of ``f``'s moves that still has PP left.
+
+    Falls back to ``struggle`` when all PP's are used up.
+    """
+    usable = [m for m in f.moves if m.pp > 0]
+
+    if usable:
+        return usable[randint(0, len(usable))]
+
+    else:
+        return Move('struggle')
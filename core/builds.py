@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Random Pokémon builds, drawn in bulk.
+
+``generate_random_pokemon`` draws what ``Pokemon.__init__`` draws for
+one Pokémon (gender, IVs, EVs, nature, ability and moves), for many
+Pokémon at once and with the same distributions, and returns them as
+columns: a ``Builds`` of arrays with one row per Pokémon. Each column
+takes a handful of NumPy calls, whatever the number of Pokémon.
+
+Usage
+-----
+    >>> builds = generate_random_pokemon([445, 213], level=50, n=100000,
+    ...                                  rng=0)
+    >>> builds.stats.mean(axis=0)
+    >>> builds.pokemon(0)
+    garchomp
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+import phanpy.core.objects as ob
+from phanpy.core.learnsets import learnset_index
+
+# `gender`, as in `Pokemon.gender`.
+FEMALE, MALE, GENDERLESS = 1, 2, 3
+
+# Natures are drawn from 1 to 24, as in `Pokemon.__init__`.
+NATURES = (1, 25)
+
+TOTAL_EV = 510
+
+# Its hp is always 1.
+SHEDINJA = 292
+
+
+class Builds(namedtuple('Builds', ['pokemon_id', 'level', 'gender', 'iv',
+                                   'ev', 'nature_id', 'ability_id', 'moves',
+                                   'stats'])):
+    """A batch of builds, one row per Pokémon.
+
+    ``iv``, ``ev`` and ``stats`` have a column per stat (hp, attack,
+    defense, special-attack, special-defense, speed); ``moves`` has 4
+    columns of move ids, padded with 0.
+    """
+
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.pokemon_id)
+
+    def pokemon(self, i):
+        """The ``i``-th build as a ``Pokemon``."""
+        p = ob.Pokemon(int(self.pokemon_id[i]), int(self.level[i]))
+        p.gender = int(self.gender[i])
+        p.set_iv([int(x) for x in self.iv[i]])
+        p.set_ev([float(x) for x in self.ev[i]])
+        p.set_nature(int(self.nature_id[i]))
+        p.ability = int(self.ability_id[i])
+        p.moves = [ob.Move(int(m)) for m in self.moves[i] if m]
+        return p
+
+
+def _default_forms(species_ids):
+    pokemon = tb.pokemon[tb.pokemon['is_default'] == 1]
+    pokemon_ids = (pokemon.set_index('species_id')['id']
+                   .reindex(species_ids).values)
+
+    if np.isnan(pokemon_ids).any():
+        missing = np.asarray(species_ids)[np.isnan(pokemon_ids)]
+        raise KeyError("No species {}.".format(list(missing)))
+
+    return pokemon_ids.astype('int32')
+
+
+def _genders(species_ids, rng):
+    rates = (tb.pokemon_species.set_index('id')['gender_rate']
+             .reindex(species_ids).values)
+    female = rng.random(len(species_ids)) < rates / 8.
+    return np.where(rates == -1, GENDERLESS,
+                    np.where(female, FEMALE, MALE)).astype('int8')
+
+
+def _evs(n, rng):
+    """``TOTAL_EV`` split at 5 uniform marks, as in ``Pokemon``."""
+    marks = np.sort(rng.random((n, 5)), axis=1)
+    marks = np.hstack([np.zeros((n, 1)), marks, np.ones((n, 1))])
+    return np.diff(np.floor(marks * TOTAL_EV), axis=1).astype('int16')
+
+
+def _abilities(pokemon_ids, rng):
+    """A uniform choice among the abilities (not hidden) of each."""
+    pa = tb.pokemon_abilities
+    pa = pa[pa['is_hidden'] == 0].sort_values(['pokemon_id', 'slot'])
+
+    size = max(pa['pokemon_id'].max(), pokemon_ids.max()) + 1
+    counts = np.bincount(pa['pokemon_id'], minlength=size)
+    ptr = np.append(0, np.cumsum(counts))
+
+    picks = ptr[pokemon_ids] + (rng.random(len(pokemon_ids))
+                                * counts[pokemon_ids]).astype(int)
+    return pa['ability_id'].values[picks].astype('int16')
+
+
+def _moves(pokemon_ids, levels, version_group_id, rng):
+    """Up to 4 learnable moves of each, drawn without replacement.
+
+    The rows of a same Pokémon and level draw their moves at once,
+    with Floyd's algorithm: ``k`` draws of integers pick a uniform
+    ``k``-subset of the ``m`` learnable moves. Pokémon without a
+    learnset in the version group get no move.
+    """
+    moves = np.zeros((len(pokemon_ids), 4), dtype='int32')
+    index = learnset_index()
+
+    keys = pokemon_ids.astype('int64') << 16 | levels
+    groups, inverse = np.unique(keys, return_inverse=True)
+
+    for g, key in enumerate(groups):
+        rows = np.flatnonzero(inverse == g)
+        if (key >> 16, version_group_id) not in index:
+            continue
+        learnable = index.learnable(key >> 16, version_group_id,
+                                    key & 0xffff)
+        m = len(learnable)
+        k = min(4, m)
+
+        chosen = np.empty((len(rows), k), dtype='int64')
+        for i, j in enumerate(range(m - k, m)):
+            t = rng.integers(0, j + 1, size=len(rows))
+            taken = (chosen[:, :i] == t[:, np.newaxis]).any(axis=1)
+            chosen[:, i] = np.where(taken, j, t)
+
+        moves[rows, :k] = learnable[rng.permuted(chosen, axis=1)]
+
+    return moves
+
+
+def stats(pokemon_ids, levels, iv, ev, nature_ids):
+    """The stats of many Pokémon, as ``Pokemon.stats`` for one.
+
+    Returns
+    -------
+    stats : numpy.ndarray
+        Of shape ``(len(pokemon_ids), 6)``.
+    """
+    ps = tb.pokemon_stats
+    base = (ps.pivot(index='pokemon_id', columns='stat_id',
+                     values='base_stat')
+            .reindex(np.unique(pokemon_ids)))
+    rows = np.searchsorted(base.index.values, pokemon_ids)
+    base = base.values[rows]
+
+    levels = np.asarray(levels)[:, np.newaxis]
+    inner = (2. * base + iv + ev // 4.) * levels // 100.
+
+    out = np.floor(inner + 5.) * tb.nature_modifiers[nature_ids - 1] // 1.
+    out[:, 0] = np.floor(inner[:, 0]) + levels[:, 0] + 10.
+    out[pokemon_ids == SHEDINJA, 0] = 1.
+    return out.astype('int32')
+
+
+def generate_random_pokemon(species_ids, level=50, n=1, rng=None,
+                            version_group_id=None):
+    """Draw ``n`` random builds of the default form of each species.
+
+    Parameters
+    ----------
+    species_ids : int or array_like
+    level : int or array_like, default 50
+        One level, or one per species.
+    n : int, default 1
+        Builds per species.
+    rng : numpy.random.Generator or int, optional
+        A generator, or a seed for one.
+    version_group_id : int, optional
+        Where the moves are learnt. Defaults to ``tb.VERSION_GROUP_ID``.
+
+    Returns
+    -------
+    builds : Builds
+        ``n`` rows for the first species, then ``n`` for the next...
+    """
+    rng = np.random.default_rng(rng)
+    if version_group_id is None:
+        version_group_id = tb.VERSION_GROUP_ID
+
+    species_ids = np.atleast_1d(species_ids)
+    levels = np.broadcast_to(level, species_ids.shape)
+    if ((levels < 1) | (levels > 100)).any():
+        raise ValueError("`level` has to be between 1 and 100.")
+
+    pokemon_ids = np.repeat(_default_forms(species_ids), n)
+    species_ids = np.repeat(species_ids, n)
+    levels = np.repeat(levels, n).astype('int16')
+    total = len(pokemon_ids)
+
+    iv = rng.integers(1, 32, size=(total, 6), dtype='int8')
+    ev = _evs(total, rng)
+    nature_ids = rng.integers(*NATURES, size=total, dtype='int8')
+
+    return Builds(pokemon_id=pokemon_ids,
+                  level=levels,
+                  gender=_genders(species_ids, rng),
+                  iv=iv,
+                  ev=ev,
+                  nature_id=nature_ids,
+                  ability_id=_abilities(pokemon_ids, rng),
+                  moves=_moves(pokemon_ids, levels, version_group_id, rng),
+                  stats=stats(pokemon_ids, levels, iv, ev, nature_ids))
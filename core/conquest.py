@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Warriors and links of Pokémon Conquest, from the ``conquest_*.csv``
+files.
+
+``ConquestIndex`` keeps the tables as dense arrays:
+
+- ``max_link[warrior_rank_id, species_id]`` is the max link of a
+  warrior rank with a species, 0 when they cannot link;
+- ``rank_stats[warrior_rank_id, warrior_stat_id]`` are the base stats
+  of a warrior rank;
+- ``pokemon_stats[species_id, conquest_stat_id]`` are the base stats
+  of a species;
+- ``rank_warrior``, ``rank_number`` and ``rank_skill`` describe every
+  warrior rank, and ``specialties[warrior_id]`` is the bit mask of the
+  types a warrior specializes in.
+
+The queries are then plain array operations, for many warriors and
+species at once.
+
+Usage
+-----
+    >>> index = conquest_index()
+    >>> index.max_link[index.ranks('oichi'), 133]
+    array([90, 90], dtype=uint8)
+    >>> rank_ids, links = index.best_warriors([4, 25, 133])
+"""
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+
+class ConquestIndex():
+    """Dense arrays of the Conquest warriors, ranks and links."""
+
+    def __init__(self):
+
+        links = tb.read_table('conquest_max_links')
+        ranks = tb.read_table('conquest_warrior_ranks')
+        rank_stats = tb.read_table('conquest_warrior_rank_stat_map')
+        warriors = tb.read_table('conquest_warriors')
+        names = tb.read_table('conquest_warrior_names')
+        specialties = tb.read_table('conquest_warrior_specialties')
+        pokemon_stats = tb.read_table('conquest_pokemon_stats')
+
+        n_ranks = ranks['id'].max() + 1
+        n_species = max(links['pokemon_species_id'].max(),
+                        pokemon_stats['pokemon_species_id'].max()) + 1
+
+        self.max_link = np.zeros((n_ranks, n_species), dtype='uint8')
+        self.max_link[links['warrior_rank_id'],
+                      links['pokemon_species_id']] = links['max_link']
+
+        self.rank_warrior = np.zeros(n_ranks, dtype='int16')
+        self.rank_warrior[ranks['id']] = ranks['warrior_id']
+        self.rank_number = np.zeros(n_ranks, dtype='int8')
+        self.rank_number[ranks['id']] = ranks['rank']
+        self.rank_skill = np.zeros(n_ranks, dtype='int16')
+        self.rank_skill[ranks['id']] = ranks['skill_id']
+
+        self.rank_stats = np.zeros((n_ranks,
+                                    rank_stats['warrior_stat_id'].max() + 1),
+                                   dtype='int16')
+        self.rank_stats[rank_stats['warrior_rank_id'],
+                        rank_stats['warrior_stat_id']] = \
+            rank_stats['base_stat']
+
+        self.pokemon_stats = np.zeros(
+            (n_species, pokemon_stats['conquest_stat_id'].max() + 1),
+            dtype='int16')
+        self.pokemon_stats[pokemon_stats['pokemon_species_id'],
+                           pokemon_stats['conquest_stat_id']] = \
+            pokemon_stats['base_stat']
+
+        # One bit per type.
+        self.specialties = np.zeros(warriors['id'].max() + 1, dtype='int32')
+        np.bitwise_or.at(self.specialties, specialties['warrior_id'].values,
+                         np.left_shift(1, specialties['type_id'].values))
+
+        names = names[names['local_language_id'] == tb.LANGUAGE_ID]
+        self.warrior_names = dict(zip(names['warrior_id'], names['name']))
+        self.warrior_ids = dict(zip(warriors['identifier'], warriors['id']))
+
+        # Ranks of every warrior, the lowest first.
+        order = np.lexsort((self.rank_number, self.rank_warrior))
+        order = order[self.rank_warrior[order] > 0]
+        self._rank_ids = order.astype('int16')
+        self._rank_ptr = np.searchsorted(self.rank_warrior[order],
+                                         np.arange(len(self.specialties) + 1))
+
+        # Row and column 0 of `max_link` are unused, as are the ids
+        # missing from the tables.
+        self._all_ranks = np.flatnonzero(self.rank_warrior)
+        self._all_species = np.arange(1, n_species)
+
+    def warrior_id(self, warrior):
+        """The id of a warrior, given its id or its identifier."""
+        warrior_id = self.warrior_ids.get(warrior, warrior)
+        if not isinstance(warrior_id, (int, np.integer)) or \
+                not 0 < warrior_id < len(self.specialties):
+            raise KeyError("{} is not a valid warrior.".format(warrior))
+        return int(warrior_id)
+
+    def ranks(self, warrior):
+        """The warrior rank ids of a warrior, from rank 1 up."""
+        w = self.warrior_id(warrior)
+        return self._rank_ids[self._rank_ptr[w]:self._rank_ptr[w + 1]]
+
+    def link(self, rank_ids, species_ids):
+        """The max links of pairs of warrior ranks and species."""
+        return self.max_link[rank_ids, species_ids]
+
+    def specializes(self, warrior_ids, type_ids):
+        """Whether each warrior specializes in the matching type."""
+        bits = self.specialties[warrior_ids] >> np.asarray(type_ids)
+        return bits & 1 == 1
+
+    def best_warriors(self, species_ids=None, rank_ids=None, k=1):
+        """The warrior ranks with the highest max link with each species.
+
+        Parameters
+        ----------
+        species_ids : array_like, optional
+            Defaults to every species.
+
+        rank_ids : array_like, optional
+            The warrior ranks to choose from. Defaults to all of them.
+
+        k : int, default 1
+            Number of warrior ranks per species.
+
+        Returns
+        -------
+        rank_ids, links : numpy.ndarray
+            Of shape ``(len(species_ids), k)`` (or ``(len(species_ids),)``
+            if ``k`` is 1), the best first.
+        """
+        if species_ids is None:
+            species_ids = self._all_species
+        if rank_ids is None:
+            rank_ids = self._all_ranks
+        return self._best(self.max_link.T, species_ids, rank_ids, k)
+
+    def best_species(self, rank_ids=None, species_ids=None, k=1):
+        """The species with the highest max link with each warrior rank.
+
+        Same as ``best_warriors``, the other way around.
+        """
+        if rank_ids is None:
+            rank_ids = self._all_ranks
+        if species_ids is None:
+            species_ids = self._all_species
+        return self._best(self.max_link, rank_ids, species_ids, k)
+
+    @staticmethod
+    def _best(matrix, rows, columns, k):
+        rows, columns = np.asarray(rows), np.asarray(columns)
+        sub = matrix[np.ix_(rows, columns)]
+
+        # Ties are broken by the lowest id.
+        order = np.argsort(-sub.astype('int16'), axis=1, kind='stable')[:, :k]
+        best = columns[order]
+        links = np.take_along_axis(sub, order, axis=1)
+
+        if k == 1:
+            return best[:, 0], links[:, 0]
+        return best, links
+
+
+@tb.once
+def conquest_index():
+    """The ``ConquestIndex`` of every warrior."""
+    return ConquestIndex()
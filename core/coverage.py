@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Type coverage searches, over ``type_efficacy`` and ``pokemon_types``.
+
+Every defender is reduced to its pair of types, and every question to
+boolean matrices: ``hits[a, d]`` tells whether attacking
+type ``a`` is super effective against defender ``d``, and
+``weak[d, a]`` whether defender ``d`` is weak to it. The searches
+pick the best ``k`` rows of such a matrix by branch and bound.
+
+``best_attack_types`` picks the attacking types that hit the most
+defenders super effectively; ``best_team`` picks the team members with
+the fewest weaknesses in common.
+
+Usage
+-----
+    >>> types, score = best_attack_types(k=4)
+    >>> [tb.types.identifier[tb.types.id == t].values[0] for t in types]
+    ['fighting', 'electric', 'ground', 'flying']
+    >>> team, cost = best_team(k=6)
+"""
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+
+def efficacy_matrix(generation_id=None):
+    """Damage factors, ``matrix[attacking type, defending type]``.
+
+    Row and column 0 stand for "no type" and are all ones, so that a
+    single-typed Pokémon is the type pair ``(t, 0)``.
+
+    Parameters
+    ----------
+    generation_id : int, optional
+        Defaults to the types of ``tb.type_efficacy``; the fairy type
+        is left out before generation 6.
+    """
+    if generation_id is None and isinstance(tb.type_efficacy, np.ndarray):
+        factors = tb.type_efficacy
+    else:
+        te = tb.type_efficacy
+        if generation_id is not None:
+            te = tb.read_table('type_efficacy')
+        n = te['damage_type_id'].max()
+        factors = np.ones((n, n))
+        factors[te['damage_type_id'] - 1,
+                te['target_type_id'] - 1] = te['damage_factor'] / 100.
+        if generation_id is not None and generation_id <= 5:
+            # `fairy` type is added from Gen.6 onward.
+            factors = factors[:-1, :-1]
+
+    matrix = np.ones((len(factors) + 1, len(factors) + 1))
+    matrix[1:, 1:] = factors
+    return matrix
+
+
+def attack_types():
+    """The ids of the attacking types of the current generation."""
+    return np.arange(1, len(efficacy_matrix()))
+
+
+def species_types(species_ids=None, generation_id=None):
+    """The type pairs of the default form of some species.
+
+    Parameters
+    ----------
+    species_ids : array_like, optional
+        Defaults to every species up to the generation.
+    generation_id : int, optional
+        Defaults to the types of ``tb.pokemon_types``; Pokémon made
+        fairy in generation 6 keep their older types before it.
+
+    Returns
+    -------
+    types : numpy.ndarray
+        Of shape ``(len(species_ids), 2)``; the second type of a
+        single-typed species is 0.
+    """
+    if species_ids is None:
+        species = tb.pokemon_species
+        species_ids = species['id'][species['generation_id']
+                                    <= (generation_id or tb.REGION_ID)].values
+
+    species_ids = np.asarray(species_ids)
+    pokemon = tb.pokemon[tb.pokemon['is_default'] == 1]
+    pokemon_ids = (pokemon.set_index('species_id')['id']
+                   .reindex(species_ids).values)
+
+    pt = tb.pokemon_types
+    if generation_id is not None:
+        pt = tb.read_table('pokemon_types' if generation_id <= 5
+                           else 'pokemon_types_gen_6')
+    slots = pt.pivot(index='pokemon_id', columns='slot', values='type_id')
+    slots = slots.reindex(pokemon_ids).fillna(0)
+
+    types = np.zeros((len(species_ids), 2), dtype='int32')
+    types[:, 0] = slots[1].values
+    if 2 in slots:
+        types[:, 1] = slots[2].values
+    return types
+
+
+def effectiveness(attacks, defenders):
+    """The damage factors of attacking types against type pairs.
+
+    Returns
+    -------
+    factors : numpy.ndarray
+        Of shape ``(len(attacks), len(defenders))``.
+    """
+    matrix = efficacy_matrix()
+    attacks = np.asarray(attacks)[:, np.newaxis]
+    defenders = np.asarray(defenders)
+    return matrix[attacks, defenders[:, 0]] * matrix[attacks, defenders[:, 1]]
+
+
+def coverage(attacks, defenders=None, weights=None):
+    """The weighted share of ``defenders`` hit super effectively by at
+    least one of ``attacks``.
+    """
+    defenders = species_types() if defenders is None else defenders
+    weights = _weights(weights, len(defenders))
+    hit = (effectiveness(attacks, defenders) > 1).any(axis=0)
+    return float(weights[hit].sum())
+
+
+def _weights(weights, n):
+    if weights is None:
+        return np.full(n, 1. / n)
+    weights = np.asarray(weights, dtype='float64')
+    return weights / weights.sum()
+
+
+def best_attack_types(k=4, defenders=None, weights=None, candidates=None):
+    """The ``k`` attacking types with the best super effective coverage.
+
+    The search adds the candidate types one by one, and drops a branch
+    when even the ``k`` best remaining marginal gains cannot beat the
+    best set found so far (coverage is submodular, so the bound holds).
+
+    Parameters
+    ----------
+    k : int, default 4
+    defenders : array_like, optional
+        Type pairs, as returned by ``species_types``. Defaults to every
+        species up to the current generation.
+    weights : array_like, optional
+        How often each defender is met. Defaults to uniform.
+    candidates : array_like, optional
+        The attacking types to choose from. Defaults to all of them.
+
+    Returns
+    -------
+    types : tuple
+        The type ids.
+    score : float
+        The weighted share of defenders covered.
+    """
+    defenders = species_types() if defenders is None else defenders
+    weights = _weights(weights, len(defenders))
+    candidates = attack_types() if candidates is None else candidates
+    candidates = np.asarray(candidates)
+
+    hits = effectiveness(candidates, defenders) > 1
+
+    # The types covering the most come first: good sets are found
+    # early, and prune the rest.
+    order = np.argsort(-(hits @ weights), kind='stable')
+    candidates, hits = candidates[order], hits[order]
+
+    best = {'types': (), 'score': -1.}
+
+    def search(start, chosen, covered, score):
+        if len(chosen) == k or start == len(candidates):
+            if score > best['score']:
+                best['types'], best['score'] = tuple(chosen), score
+            return
+
+        gains = (hits[start:] & ~covered) @ weights
+        bound = score + np.sort(gains)[::-1][:k - len(chosen)].sum()
+        if bound <= best['score']:
+            return
+
+        for i in range(start, len(candidates)):
+            search(i + 1, chosen + [int(candidates[i])],
+                   covered | hits[i], score + gains[i - start])
+
+    search(0, [], np.zeros(len(defenders), dtype=bool), 0.)
+    return best['types'], float(best['score'])
+
+
+def best_team(k=6, species_ids=None, attacks=None, weights=None):
+    """The ``k`` species with the fewest weaknesses in common.
+
+    The cost of a team is, for every attacking type, the number of
+    members weak to it beyond the first, weighted by how often the type
+    is met. Ties are broken by the weaknesses of all the members. Both
+    only grow as members are added, so a branch is dropped as soon as
+    it cannot beat the best team found so far.
+
+    Species with the same types are interchangeable; only the first
+    ``k`` of them are considered.
+
+    Parameters
+    ----------
+    k : int, default 6
+    species_ids : array_like, optional
+        The species to choose from. Defaults to every species up to
+        the current generation.
+    attacks : array_like, optional
+        Attacking types. Defaults to all of them.
+    weights : array_like, optional
+        How often each attacking type is met. Defaults to uniform.
+
+    Returns
+    -------
+    species_ids : tuple
+    cost : float
+        The cost of the shared weaknesses.
+    """
+    if species_ids is None:
+        species = tb.pokemon_species
+        species_ids = species['id'][species['generation_id']
+                                    <= tb.REGION_ID].values
+
+    species_ids = np.asarray(species_ids)
+    attacks = attack_types() if attacks is None else np.asarray(attacks)
+    weights = _weights(weights, len(attacks))
+
+    types = species_types(species_ids)
+    __, pair = np.unique(np.sort(types, axis=1), axis=0, return_inverse=True)
+    pair = pair.ravel()
+    by_pair = np.argsort(pair, kind='stable')
+    rank = np.empty(len(pair), dtype='int64')
+    rank[by_pair] = (np.arange(len(pair))
+                     - np.searchsorted(pair[by_pair], pair[by_pair]))
+    keep = rank < k
+    species_ids, types = species_ids[keep], types[keep]
+
+    weak = (effectiveness(attacks, types) > 1).T.astype('int8')
+
+    # The members with the fewest weaknesses come first, so the least
+    # total weakness of `r` more members from `i` on is a sum of `r`
+    # consecutive entries of `total`.
+    total = weak @ weights
+    order = np.argsort(total, kind='stable')
+    species_ids, weak, total = species_ids[order], weak[order], total[order]
+    cumulative = np.append(0, np.cumsum(total))
+
+    best = {'team': (), 'cost': (np.inf, np.inf)}
+
+    def search(start, chosen, counts, shared, weakness):
+        r = k - len(chosen)
+        if r == 0:
+            if (shared, weakness) < best['cost']:
+                best['team'], best['cost'] = tuple(chosen), (shared, weakness)
+            return
+
+        for i in range(start, len(species_ids) - r + 1):
+            bound = weakness + cumulative[i + r] - cumulative[i]
+            if (shared, bound) >= best['cost']:
+                # The next members only have more weaknesses.
+                return
+
+            added = counts + weak[i]
+            cost = float(np.maximum(added - 1, 0) @ weights)
+            if cost <= best['cost'][0]:
+                search(i + 1, chosen + [int(species_ids[i])], added, cost,
+                       weakness + total[i])
+
+    search(0, [], np.zeros(len(attacks), dtype='int8'), 0., 0.)
+    return best['team'], best['cost'][0]
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Exact distributions of the damage of a move.
+
+``damage_distribution(f1, move, f2)`` gives the chance of every total
+damage ``f1`` can deal to ``f2`` with ``move``, if the move hits. A hit
+deals the damage of ``algorithms.base_damage``, floored at every step
+as the games do, for each of the 16 random factors of the games (85%
+to 100%), with or without a critical hit. The total of a multi-hit move is the sum of
+its hits: its distribution is the convolution of the distributions of
+the hits, weighted by the chances of each number of hits.
+
+As in ``matchups``, abilities (but Adaptability, Guts and Skill Link),
+items and moves whose damage is not given by the formula (variable
+power, fixed damage, ...) are left out.
+
+Usage
+-----
+    >>> f1, f2 = Pokemon('garchomp'), Pokemon('shuckle')
+    >>> d = damage_distribution(f1, Move('double-slap'), f2)
+    >>> d.mean(), d.ko_chance(f2.stats.hp)
+    >>> damage_distributions(f1, f2)  # Every learnable move.
+    {..., 337: DamageDistribution(move_id=337, chances=array([...]))}
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+from phanpy.core.learnsets import learnset_index
+
+# The random factor of the damage, in percent.
+ROLLS = np.arange(85, 101)
+
+# The damage modifier of a critical hit, and its chance at each
+# critical stage (0 to 4): up to generation 5, in generation 6, and
+# from generation 7.
+CRITICAL_MODIFIERS = {5: 2., 6: 1.5, 7: 1.5}
+CRITICAL_CHANCES = {5: np.array([1/16., 1/8., 1/4., 1/3., 1/2.]),
+                    6: np.array([1/16., 1/8., 1/2., 1., 1.]),
+                    7: np.array([1/24., 1/8., 1/2., 1., 1.])}
+
+# The moves hitting 2 to 5 times, such as double-slap, hit that many
+# times with these chances: up to generation 4, and from generation 5.
+VARIABLE_HITS = np.arange(2, 6)
+HIT_CHANCES = {4: np.array([3., 3., 1., 1.]) / 8.,
+               5: np.array([7., 7., 3., 3.]) / 20.}
+
+# Effect of triple-kick: the power of the n-th hit is n times the power.
+RISING_POWER = 105
+
+ADAPTABILITY, GUTS, SKILL_LINK = 91, 62, 92
+
+
+class DamageDistribution(namedtuple('DamageDistribution',
+                                    ['move_id', 'chances'])):
+    """``chances[d]`` is the chance of dealing ``d`` damage in all."""
+
+    __slots__ = ()
+
+    def mean(self):
+        return float(self.chances @ np.arange(len(self.chances)))
+
+    def ko_chance(self, hp):
+        """The chance of dealing at least ``hp`` damage."""
+        return float(self.chances[max(int(hp), 0):].sum())
+
+
+def hit_chances(min_hits, max_hits, generation_id=None):
+    """The numbers of hits of a move, and their chances.
+
+    Parameters
+    ----------
+    min_hits, max_hits : int or float
+        As in ``Move``; NaN (or None) for the moves hitting once.
+    generation_id : int, optional
+        Defaults to the generation of ``tb.VERSION_GROUP_ID``.
+
+    Returns
+    -------
+    (hits, chances) : (numpy.ndarray, numpy.ndarray)
+    """
+    if generation_id is None:
+        generation_id = tb.which_generation()
+
+    if min_hits is None or np.isnan(min_hits):
+        return np.array([1]), np.array([1.])
+
+    min_hits, max_hits = int(min_hits), int(max_hits)
+    if (min_hits, max_hits) == (VARIABLE_HITS[0], VARIABLE_HITS[-1]):
+        return VARIABLE_HITS, HIT_CHANCES[min(max(generation_id, 4), 5)]
+
+    hits = np.arange(min_hits, max_hits + 1)
+    return hits, np.full(len(hits), 1. / len(hits))
+
+
+def critical_hits(generation_id=None):
+    """The damage modifier of a critical hit, and its chances at the
+    critical stages 0 to 4.
+
+    Parameters
+    ----------
+    generation_id : int, optional
+        Defaults to the generation of ``tb.VERSION_GROUP_ID``.
+
+    Returns
+    -------
+    (modifier, chances) : (float, numpy.ndarray)
+    """
+    if generation_id is None:
+        generation_id = tb.which_generation()
+
+    generation_id = min(max(generation_id, 5), 7)
+    return CRITICAL_MODIFIERS[generation_id], CRITICAL_CHANCES[generation_id]
+
+
+@tb.once
+def move_columns():
+    """Columns of ``tb.moves`` and ``tb.move_meta`` indexed by move
+    id, built once.
+    """
+    moves = tb.moves.merge(tb.move_meta, how='left', left_on='id',
+                           right_on='move_id')
+    size = moves['id'].max() + 1
+
+    def column(name, fill):
+        out = np.full(size, fill, dtype='float64')
+        out[moves['id']] = moves[name]
+        return out
+
+    return {'power': column('power', np.nan),
+            'type': column('type_id', 0).astype('int32'),
+            'damage_class': column('damage_class_id', 1).astype('int32'),
+            'effect': column('effect_id', 0).astype('int32'),
+            'crit_rate': np.nan_to_num(column('crit_rate', 0)),
+            'min_hits': column('min_hits', np.nan),
+            'max_hits': column('max_hits', np.nan)}
+
+
+def _one_hit(base, modifiers, critical_modifier, critical_chance):
+    """``chances[d]`` of dealing ``d`` damage in one hit.
+
+    The damage is floored after the critical hit, after the random
+    factor and after each of ``modifiers``, in this order, as in the
+    games. From generation 5 the games round some of these steps half
+    down instead, which is left out.
+    """
+    critical = np.array([[1.], [critical_modifier]])
+    damage = np.floor(base * critical)
+    damage = damage * ROLLS // 100
+    for modifier in modifiers:
+        damage = np.floor(damage * modifier)
+    if np.prod(modifiers) > 0:
+        damage = np.maximum(damage, 1.)
+
+    weights = np.array([[1. - critical_chance], [critical_chance]])
+    weights = np.broadcast_to(weights / len(ROLLS), damage.shape)
+    return np.bincount(damage.astype(int).ravel(), weights=weights.ravel())
+
+
+def _distribution(f1, a, d, move_id, f2, generation_id):
+    m = move_columns()
+    if not 0 < move_id < len(m['power']):
+        return None
+
+    power = m['power'][move_id]
+    if np.isnan(power) or not power or m['damage_class'][move_id] == 1:
+        return None
+
+    physical = m['damage_class'][move_id] == 2
+    A, D = (a.attack, d.defense) if physical else (a.specialAttack,
+                                                   d.specialDefense)
+
+    # STAB, type and burn, in the order of the games.
+    t = m['type'][move_id]
+    modifiers = [1., tb.efficacy(t, f2.types), 1.]
+    if t in f1.types:
+        modifiers[0] = 2. if f1.ability == ADAPTABILITY else 1.5
+    if physical and 'burn' in f1.status and f1.ability != GUTS:
+        modifiers[2] = 0.5
+
+    critical_modifier, critical_chances = critical_hits(generation_id)
+    stage = np.clip(f1.stage.critical + m['crit_rate'][move_id], 0, 4)
+    critical_chance = critical_chances[int(stage)]
+
+    hits, chances = hit_chances(m['min_hits'][move_id],
+                                m['max_hits'][move_id], generation_id)
+    if f1.ability == SKILL_LINK:
+        hits, chances = hits[-1:], np.array([1.])
+
+    rising = m['effect'][move_id] == RISING_POWER
+
+    def one_hit(n):
+        hit_power = power * n if rising else power
+        base = (2 * f1.level // 5 + 2) * hit_power * A // D // 50 + 2
+        return _one_hit(base, modifiers, critical_modifier,
+                        critical_chance)
+
+    # The totals of 1, 2, ... hits.
+    first = one_hit(1)
+    totals = [first]
+    for n in range(2, hits[-1] + 1):
+        totals.append(np.convolve(totals[-1], one_hit(n) if rising
+                                  else first))
+
+    out = np.zeros(len(totals[-1]))
+    for n, chance in zip(hits, chances):
+        out[:len(totals[n - 1])] += chance * totals[n - 1]
+
+    return DamageDistribution(int(move_id), out)
+
+
+def damage_distribution(f1, move, f2, generation_id=None):
+    """The distribution of the damage ``f1`` deals to ``f2`` with
+    ``move``, if it hits.
+
+    Parameters
+    ----------
+    move : Move or int
+        A move or a move id.
+    generation_id : int, optional
+        Of the chances of the numbers of hits, and of the critical
+        hits. Defaults to the generation of ``tb.VERSION_GROUP_ID``.
+
+    Returns
+    -------
+    distribution : DamageDistribution or None
+        None for the moves not dealing regular damage.
+    """
+    move_id = getattr(move, 'id', move)
+    return _distribution(f1, f1.current, f2.current, move_id, f2,
+                         generation_id)
+
+
+def damage_distributions(f1, f2, move_ids=None, generation_id=None):
+    """The distributions of the damage of many moves of ``f1``.
+
+    Parameters
+    ----------
+    move_ids : array_like, optional
+        Defaults to every move ``f1`` can learn at its level.
+
+    Returns
+    -------
+    distributions : dict
+        ``DamageDistribution``s by move id, for the moves dealing
+        regular damage.
+    """
+    if move_ids is None:
+        move_ids = learnset_index().learnable(f1.id, level=f1.level)
+
+    # `current` is recalculated on every access.
+    a, d = f1.current, f2.current
+
+    out = {}
+    for move_id in move_ids:
+        distribution = _distribution(f1, a, d, int(move_id), f2,
+                                     generation_id)
+        if distribution is not None:
+            out[int(move_id)] = distribution
+    return out
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Wild encounters, from ``encounters.csv`` and its companion tables.
+
+An encounter is a (version, location area, encounter slot) triple with
+a Pokémon and a level range. The slot gives the encounter method and
+its rarity, in percent. Some encounters only apply under certain
+conditions (time of the day, swarms, the Poké Radar, ...), listed in
+``encounter_condition_value_map.csv``.
+
+``EncounterIndex`` loads all of this once, groups the encounters by
+(version, location area, method), and turns each group into an
+``EncounterTable`` of probabilities from which wild Pokémon are drawn
+in batches.
+
+Usage
+-----
+    >>> index = encounter_index()
+    >>> table = index.table(version_id=14, location_area_id=1,
+    ...                     method='walk', conditions=['time-night'])
+    >>> table.pokemon_id, table.probability
+    >>> batch = index.sample(14, 1, 'walk', n=100000)
+    >>> batch.pokemon_id, batch.level
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+from phanpy.core.objects import Pokemon
+
+EncounterTable = namedtuple('EncounterTable', ['pokemon_id', 'min_level',
+                                               'max_level', 'probability',
+                                               'rate'])
+EncounterTable.__doc__ = """The possible wild Pokémon of one place.
+
+``probability`` sums to 1. ``rate`` is the chance (in percent) of an
+encounter per step, or ``nan`` when unknown.
+"""
+
+WildBatch = namedtuple('WildBatch', ['pokemon_id', 'level'])
+
+
+class EncounterIndex():
+    """All wild encounters, indexed by (version, area, method)."""
+
+    def __init__(self):
+
+        encounters = tb.read_table('encounters')
+        slots = tb.read_table('encounter_slots')
+        value_map = tb.read_table('encounter_condition_value_map')
+        values = tb.read_table('encounter_condition_values')
+        methods = tb.read_table('encounter_methods')
+        rates = tb.read_table('location_area_encounter_rates')
+
+        self.method_ids = dict(zip(methods['identifier'], methods['id']))
+
+        # Condition values are bits of an integer mask.
+        self.value_ids = dict(zip(values['identifier'], values['id']))
+        self.value_condition = dict(zip(values['id'],
+                                        values['encounter_condition_id']))
+
+        default = values[values['is_default'] == 1]
+        self.default_values = dict(zip(default['encounter_condition_id'],
+                                       default['id']))
+        # Conditions without a default value (seasons) fall back to the
+        # first of their values.
+        for condition_id, group in values.groupby('encounter_condition_id'):
+            self.default_values.setdefault(condition_id, group['id'].min())
+
+        bits = np.left_shift(1, value_map['encounter_condition_value_id'])
+        masks = bits.groupby(value_map['encounter_id']).sum()
+
+        df = encounters.merge(slots, left_on='encounter_slot_id',
+                              right_on='id', suffixes=('', '_slot'))
+        df['mask'] = df['id'].map(masks).fillna(0).astype('int64')
+        df['rarity'] = df['rarity'].fillna(0)
+        df = df.sort_values(['version_id', 'location_area_id',
+                             'encounter_method_id', 'encounter_slot_id',
+                             'id'])
+
+        self.slot = df['encounter_slot_id'].values
+        self.pokemon_id = df['pokemon_id'].values
+        self.min_level = df['min_level'].values
+        self.max_level = df['max_level'].values
+        self.rarity = df['rarity'].values.astype('float64')
+        self.mask = df['mask'].values
+
+        keys = df[['version_id', 'location_area_id',
+                   'encounter_method_id']].values
+        changes = np.flatnonzero((np.diff(keys, axis=0) != 0).any(axis=1)) + 1
+        starts = np.append(0, changes)
+        stops = np.append(changes, len(df))
+
+        self._slices = {tuple(int(k) for k in keys[i]): (int(i), int(j))
+                        for i, j in zip(starts, stops)}
+
+        self._rates = {(int(v), int(a), int(m)): float(r)
+                       for a, m, v, r in rates[['location_area_id',
+                                                'encounter_method_id',
+                                                'version_id',
+                                                'rate']].values}
+
+        self._tables = {}
+
+    def active_mask(self, conditions=None):
+        """Bit mask of the active condition values.
+
+        Every condition is at its default value unless one of its
+        values is listed in ``conditions`` (ids or identifiers).
+        """
+        active = dict(self.default_values)
+
+        for value in conditions or []:
+            value_id = self.value_ids.get(value, value)
+            if value_id not in self.value_condition:
+                raise KeyError("{} is not a valid encounter condition value."
+                               "".format(value))
+            active[self.value_condition[value_id]] = value_id
+
+        return sum(1 << int(v) for v in active.values())
+
+    def methods(self, version_id=None, location_area_id=None):
+        """Encounter method ids available in a location area."""
+        version_id = tb.VERSION_ID if version_id is None else version_id
+        return sorted(m for (v, a, m) in self._slices
+                      if v == version_id and a == location_area_id)
+
+    def table(self, version_id, location_area_id, method, conditions=None):
+        """The ``EncounterTable`` of one place.
+
+        Parameters
+        ----------
+        version_id : int
+        location_area_id : int
+        method : int or str
+            An id or an identifier of ``encounter_methods.csv``.
+        conditions : list, optional
+            Condition values (ids or identifiers), e.g. ``['swarm-yes',
+            'time-night']``. The others are at their defaults.
+        """
+        method_id = self.method_ids.get(method, method)
+        if isinstance(method_id, str):
+            raise KeyError("{} is not a valid encounter method."
+                           "".format(method))
+        mask = self.active_mask(conditions)
+
+        key = (int(version_id), int(location_area_id), int(method_id), mask)
+        if key in self._tables:
+            return self._tables[key]
+
+        if key[:3] not in self._slices:
+            raise KeyError("No encounters for version {}, location area {} "
+                           "and method {}.".format(*key[:3]))
+
+        start, stop = self._slices[key[:3]]
+        s = slice(start, stop)
+
+        applies = (self.mask[s] & ~mask) == 0
+        slot = self.slot[s][applies]
+        rarity = self.rarity[s][applies]
+
+        # A slot with several applicable encounters splits its rarity.
+        __, inverse, counts = np.unique(slot, return_inverse=True,
+                                        return_counts=True)
+        weight = rarity / counts[inverse]
+
+        table = EncounterTable(pokemon_id=self.pokemon_id[s][applies],
+                               min_level=self.min_level[s][applies],
+                               max_level=self.max_level[s][applies],
+                               probability=weight / weight.sum(),
+                               rate=self._rates.get(key[:3], np.nan))
+
+        self._tables[key] = table
+        return table
+
+    def sample(self, version_id, location_area_id, method, n=1,
+               conditions=None, rng=None):
+        """Draw ``n`` wild Pokémon at once.
+
+        Parameters
+        ----------
+        rng : numpy.random.Generator or int, optional
+            A generator, or a seed for a new one.
+
+        Returns
+        -------
+        batch : WildBatch
+            Arrays ``pokemon_id`` and ``level`` of length ``n``.
+        """
+        rng = np.random.default_rng(rng)
+        table = self.table(version_id, location_area_id, method, conditions)
+
+        which = rng.choice(len(table.probability), size=n,
+                           p=table.probability)
+        level = rng.integers(table.min_level[which],
+                             table.max_level[which] + 1)
+
+        return WildBatch(table.pokemon_id[which], level)
+
+
+@tb.once
+def encounter_index():
+    """The ``EncounterIndex`` of every version."""
+    return EncounterIndex()
+
+
+def wild_pokemon(version_id, location_area_id, method, n=1, conditions=None,
+                 rng=None):
+    """Instantiate ``n`` wild ``Pokemon`` drawn from one place."""
+    batch = encounter_index().sample(version_id, location_area_id, method,
+                                     n, conditions, rng)
+
+    return [Pokemon(int(p), int(lv)) for p, lv in zip(*batch)]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Evolutions, from ``pokemon_evolution.csv`` and the evolution chains of
+``pokemon_species.csv``.
+
+``EvolutionIndex`` turns the tables into arrays indexed by species id
+once, so that the next evolutions and the whole chain of a species are
+found without any join:
+
+- ``parent[s]`` is the species ``s`` evolves from (0 if none), and
+  ``stage[s]`` how many times it has evolved;
+- the evolutions out of ``s`` are the slice ``edge_ptr[s]:edge_ptr[s+1]``
+  of the edge arrays (``target``, ``trigger``, ``minimum_level``, ...);
+- the members of chain ``c`` are the slice
+  ``chain_ptr[c]:chain_ptr[c+1]`` of ``chain_members``.
+
+``evolve(species_ids, levels)`` evolves whole arrays of species to the
+forms they would have at some level.
+
+Usage
+-----
+    >>> index = evolution_index()
+    >>> index.next_evolutions(133)
+    array([134, 135, 136, 196, 197, 470, 471, 700])
+    >>> index.chain(4)
+    array([4, 5, 6])
+    >>> index.evolve([1, 1, 1], [10, 20, 40])
+    array([1, 2, 3])
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+Evolution = namedtuple('Evolution', ['species_id', 'evolved_species_id',
+                                     'trigger', 'minimum_level',
+                                     'trigger_item_id', 'held_item_id',
+                                     'known_move_id', 'minimum_happiness',
+                                     'time_of_day'])
+Evolution.__doc__ = """One way for a species to evolve.
+
+Missing conditions are ``None``.
+"""
+
+
+def _csr(keys, size):
+    """Offsets of the runs of the sorted array ``keys`` in ``0..size``."""
+    return np.searchsorted(keys, np.arange(size + 1)).astype('int32')
+
+
+class EvolutionIndex():
+    """Evolution graph of all the species, in flat arrays.
+
+    Parameters
+    ----------
+    species : pandas.DataFrame, optional
+        Defaults to ``tb.pokemon_species``.
+
+    evolutions : pandas.DataFrame, optional
+        Defaults to ``pokemon_evolution.csv``.
+    """
+
+    def __init__(self, species=None, evolutions=None):
+
+        if species is None:
+            species = tb.pokemon_species
+
+        if evolutions is None:
+            evolutions = tb.read_table('pokemon_evolution')
+
+        triggers = tb.read_table('evolution_triggers')
+
+        self.triggers = dict(zip(triggers['id'], triggers['identifier']))
+        self.trigger_ids = dict(zip(triggers['identifier'], triggers['id']))
+
+        size = int(species['id'].max()) + 1
+        ids = species['id'].values
+
+        self.parent = np.zeros(size, dtype='int32')
+        self.parent[ids] = species['evolves_from_species_id'].fillna(0)
+
+        self.chain_id = np.zeros(size, dtype='int32')
+        self.chain_id[ids] = species['evolution_chain_id']
+
+        self.generation = np.zeros(size, dtype='int8')
+        self.generation[ids] = species['generation_id']
+
+        # One more stage is settled on every pass.
+        self.stage = np.zeros(size, dtype='int8')
+        has_parent = self.parent > 0
+        while True:
+            stage = np.where(has_parent, self.stage[self.parent] + 1, 0)
+            if (stage == self.stage).all():
+                break
+            self.stage = stage.astype('int8')
+
+        # Edges, sorted by the species they start from.
+        edges = evolutions.assign(
+            species_id=self.parent[evolutions['evolved_species_id']])
+        edges = edges[edges['species_id'] > 0]
+        edges = edges.sort_values(['species_id', 'evolved_species_id', 'id'])
+
+        def column(name):
+            return edges[name].fillna(0).values.astype('int32')
+
+        self.source = column('species_id')
+        self.target = column('evolved_species_id')
+        self.trigger = column('evolution_trigger_id').astype('int8')
+        self.minimum_level = column('minimum_level').astype('int16')
+        self.trigger_item_id = column('trigger_item_id')
+        self.held_item_id = column('held_item_id')
+        self.known_move_id = column('known_move_id')
+        self.minimum_happiness = column('minimum_happiness').astype('int16')
+        self.time_of_day = edges['time_of_day'].values
+        self.edge_ptr = _csr(self.source, size)
+
+        # Chain members, from the base form to the last evolutions.
+        members = species.sort_values(['evolution_chain_id', 'order'])
+        self.chain_members = members['id'].values.astype('int32')
+        self.chain_ptr = _csr(members['evolution_chain_id'].values,
+                              int(species['evolution_chain_id'].max()) + 1)
+
+        # Distinct next evolutions, for `next_evolutions`.
+        first = np.ones(len(self.target), dtype=bool)
+        first[1:] = ((self.source[1:] != self.source[:-1]) |
+                     (self.target[1:] != self.target[:-1]))
+        self._next = self.target[first]
+        self._next_ptr = _csr(self.source[first], size)
+
+        self._size = size
+
+    def _check(self, species_id):
+        if not 0 < species_id < self._size or not self.chain_id[species_id]:
+            raise KeyError("{} is not a valid species id.".format(species_id))
+
+    def next_evolutions(self, species_id):
+        """The species ``species_id`` directly evolves into."""
+        self._check(species_id)
+        return self._next[self._next_ptr[species_id]:
+                          self._next_ptr[species_id + 1]]
+
+    def chain(self, species_id):
+        """All the species of the chain of ``species_id``, base form
+        first.
+        """
+        self._check(species_id)
+        c = self.chain_id[species_id]
+        return self.chain_members[self.chain_ptr[c]:self.chain_ptr[c + 1]]
+
+    def base_form(self, species_id):
+        """The first species of the chain of ``species_id``."""
+        self._check(species_id)
+        while self.parent[species_id]:
+            species_id = self.parent[species_id]
+        return int(species_id)
+
+    def evolutions(self, species_id):
+        """How ``species_id`` evolves, as a list of ``Evolution``."""
+        self._check(species_id)
+
+        def value(x):
+            return int(x) if x else None
+
+        return [Evolution(species_id=int(species_id),
+                          evolved_species_id=int(self.target[i]),
+                          trigger=self.triggers[self.trigger[i]],
+                          minimum_level=value(self.minimum_level[i]),
+                          trigger_item_id=value(self.trigger_item_id[i]),
+                          held_item_id=value(self.held_item_id[i]),
+                          known_move_id=value(self.known_move_id[i]),
+                          minimum_happiness=value(self.minimum_happiness[i]),
+                          time_of_day=(None if isinstance(self.time_of_day[i],
+                                                          float)
+                                       else self.time_of_day[i]))
+                for i in range(self.edge_ptr[species_id],
+                               self.edge_ptr[species_id + 1])]
+
+    def evolve(self, species_ids, levels, other_level=None, rng=None,
+               version_group_id=None):
+        """Evolve every species to its form at the matching level.
+
+        Only level-up evolutions with a minimum level are followed; the
+        other conditions of these evolutions (gender, time of the day,
+        ...) are ignored. When there are several ways to evolve (e.g.
+        wurmple), one is drawn at random. Species of a later generation
+        than the version group's are never evolved into.
+
+        Parameters
+        ----------
+        species_ids, levels : array_like
+            Of the same length.
+
+        other_level : int, optional
+            Also follow the evolutions without a minimum level (stones,
+            trades, happiness, ...) from this level on.
+
+        rng : numpy.random.Generator or int, optional
+            A generator, or a seed for a new one.
+
+        version_group_id : int, optional
+            Defaults to ``tb.VERSION_GROUP_ID``.
+
+        Returns
+        -------
+        species_ids : numpy.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        generation_id = tb.which_generation(version_group_id)
+        species = np.array(species_ids, dtype='int32')
+        levels = np.broadcast_to(levels, species.shape)
+
+        level = self.minimum_level.astype('float64')
+        if other_level is None:
+            level[level == 0] = np.inf
+        else:
+            level[level == 0] = other_level
+        level[self.generation[self.target] > generation_id] = np.inf
+
+        degree = np.diff(self.edge_ptr).max()
+
+        # Each round moves every species at most one stage further.
+        for __ in range(self.stage.max()):
+            start = self.edge_ptr[species]
+            count = self.edge_ptr[species + 1] - start
+
+            # Draw one of the possible evolutions, by reservoir sampling.
+            pick = np.full(species.shape, -1)
+            seen = np.zeros(species.shape)
+            for k in range(degree):
+                edge = np.where(k < count, start + k, 0)
+                possible = (k < count) & (level[edge] <= levels)
+                seen += possible
+                keep = possible & (rng.random(species.shape) * seen < 1)
+                pick = np.where(keep, edge, pick)
+
+            evolves = pick >= 0
+            if not evolves.any():
+                break
+            species = np.where(evolves, self.target[pick], species)
+
+        return species
+
+    def __contains__(self, species_id):
+        return 0 < species_id < self._size and bool(self.chain_id[species_id])
+
+
+@tb.once
+def evolution_index():
+    """The ``EvolutionIndex`` of every species."""
+    return EvolutionIndex()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Experience curves, from ``experience.csv``.
+
+``curves()`` is a 2-d array of the total experience needed to reach a
+level: ``curves()[growth_rate_id, level]``. The functions here take
+arrays of growth rates and levels (or experience points), so that the
+leveling of many Pokémon is computed at once.
+
+Usage
+-----
+    >>> exp_for_level([1, 2], [50, 50])
+    array([156250, 125000])
+    >>> level_for_exp([1, 2], [156249, 125000])
+    array([49, 50])
+    >>> exp_yield(base_experience=64, level=10)
+    91
+"""
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+MAX_LEVEL = 100
+
+# Version groups of generations 5 and 7, whose experience yield depends
+# on the level of the winner.
+SCALED_VERSION_GROUPS = (11, 14, 17)
+
+@tb.once
+def curves():
+    """Total experience at every level, by growth rate.
+
+    Returns
+    -------
+    curves : numpy.ndarray
+        Of shape ``(number of growth rates + 1, MAX_LEVEL + 1)``; row 0
+        and column 0 are unused.
+    """
+    exp = tb.experience
+    curves = np.zeros((exp['growth_rate_id'].max() + 1, MAX_LEVEL + 1),
+                      dtype='int64')
+    curves[exp['growth_rate_id'], exp['level']] = exp['experience']
+    curves.setflags(write=False)
+    return curves
+
+
+@tb.once
+def _growth_rates():
+    species = tb.pokemon_species
+    growth_rates = np.zeros(species['id'].max() + 1, dtype='int8')
+    growth_rates[species['id']] = species['growth_rate_id']
+    growth_rates.setflags(write=False)
+    return growth_rates
+
+
+def growth_rate(species_ids):
+    """The growth rate ids of ``species_ids``."""
+    return _growth_rates()[species_ids]
+
+
+def exp_for_level(growth_rate_ids, levels):
+    """The total experience needed to reach ``levels``."""
+    return curves()[growth_rate_ids, levels]
+
+
+def level_for_exp(growth_rate_ids, exps):
+    """The levels reached with ``exps`` experience points.
+
+    Parameters
+    ----------
+    growth_rate_ids, exps : array_like
+        Broadcast against each other.
+
+    Returns
+    -------
+    levels : numpy.ndarray or int
+    """
+    c = curves()[:, 1:]
+    growth_rate_ids, exps = np.broadcast_arrays(growth_rate_ids, exps)
+
+    # All the curves are searched at once: each row is shifted above the
+    # previous one, so that the rows end to end are still sorted.
+    shift = c[:, -1].max() + 1
+    rows = np.arange(len(c))[:, np.newaxis]
+    flat = (c + rows * shift).ravel()
+
+    exps = np.clip(exps, 0, c[growth_rate_ids, -1])
+    found = np.searchsorted(flat, exps + growth_rate_ids * shift,
+                            side='right')
+    levels = found - growth_rate_ids * c.shape[1]
+
+    return levels if levels.ndim else int(levels)
+
+
+def exp_yield(base_experience, level, winner_level=None, participants=1,
+              trainer=False, traded=False, lucky_egg=False, scaled=None):
+    """The experience gained by defeating a Pokémon.
+
+    Parameters
+    ----------
+    base_experience, level : array_like
+        Base experience yield (from ``pokemon.csv``) and level of the
+        defeated Pokémon.
+
+    winner_level : array_like, optional
+        Level of the Pokémon gaining the experience. Only used by the
+        scaled formula.
+
+    participants : int, default 1
+        Number of Pokémon sharing the experience.
+
+    trainer, traded, lucky_egg : bool or array_like, default False
+        Bonuses of 1.5 each: the defeated Pokémon belongs to a trainer,
+        the winner is traded, the winner holds a lucky egg.
+
+    scaled : bool, optional
+        Use the formula of generations 5 and 7. Defaults to whether
+        ``tb.VERSION_GROUP_ID`` is in ``SCALED_VERSION_GROUPS``.
+
+    Returns
+    -------
+    exp : numpy.ndarray or int
+    """
+    if scaled is None:
+        scaled = tb.VERSION_GROUP_ID in SCALED_VERSION_GROUPS
+
+    b = np.asarray(base_experience, dtype='float64')
+    level = np.asarray(level, dtype='float64')
+
+    a = np.where(trainer, 1.5, 1.)
+    t = np.where(traded, 1.5, 1.)
+    e = np.where(lucky_egg, 1.5, 1.)
+
+    if scaled:
+        winner_level = (level if winner_level is None
+                        else np.asarray(winner_level, dtype='float64'))
+        ratio = ((2 * level + 10) / (level + winner_level + 10)) ** 2.5
+        exp = np.floor(np.floor(a * b * level / (5 * participants)) * ratio
+                       + 1)
+        exp = np.floor(np.floor(exp * t) * e)
+    else:
+        exp = np.floor(np.floor(np.floor(a * b * level / 7 / participants)
+                                * t) * e)
+
+    exp = exp.astype('int64')
+    return exp if exp.ndim else int(exp)
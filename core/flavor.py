@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Flavor texts, read lazily from the ``*_flavor_text.csv`` files.
+
+The flavor text files are large, and only ever needed one row at a
+time. ``FlavorText`` maps a file in memory and indexes the offsets of
+its rows once; a query is then a binary search and the decoding of a
+single field, instead of a parse of the whole file.
+
+Usage
+-----
+    >>> flavor_text('move', 1, version_group_id=9)
+    'Pounds with forelegs or tail.'
+    >>> FlavorText('item_flavor_text').versions(1)
+    array([ 5,  6,  7,  8,  9, 10, ...])
+"""
+
+import mmap
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+FILES = {'move': 'move_flavor_text',
+         'item': 'item_flavor_text',
+         'ability': 'ability_flavor_text'}
+
+# Readers already indexed, keyed by kind.
+_readers = {}
+
+NEWLINE, QUOTE, COMMA, ZERO = ord('\n'), ord('"'), ord(','), ord('0')
+
+
+def _integers(data, starts, stops):
+    """Parse the unsigned integers written in ``data[starts:stops]``,
+    one digit position at a time.
+    """
+    values = np.zeros(len(starts), dtype='int64')
+    for k in range(int((stops - starts).max(initial=0))):
+        digit = starts + k < stops
+        positions = np.minimum(starts + k, len(data) - 1)
+        values = np.where(digit,
+                          values * 10 + data[positions].astype('int64')
+                          - ZERO, values)
+    return values
+
+
+def _key(id_, version_group_id, language_id):
+    return (np.int64(id_) << 32) | (np.int64(version_group_id) << 16) \
+           | np.int64(language_id)
+
+
+class FlavorText():
+    """Random access to a flavor text file.
+
+    The file has three integer columns, an id, a version group id and
+    a language id, followed by the text.
+
+    Parameters
+    ----------
+    name : str
+        Name of the file in ``tb.DATA_PATH``, without ``.csv``.
+    """
+
+    def __init__(self, name):
+
+        with open(tb.DATA_PATH + name + '.csv', 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = np.frombuffer(self._map, dtype='uint8')
+
+        # A newline ends a row unless it is inside quotes, i.e. after
+        # an odd number of quotes.
+        quotes = np.flatnonzero(data == QUOTE)
+        newlines = np.flatnonzero(data == NEWLINE)
+        ends = newlines[np.searchsorted(quotes, newlines) % 2 == 0]
+
+        starts = np.append(0, ends[:-1] + 1)
+        # Skip the header and any empty last row.
+        starts, ends = starts[1:], ends[1:]
+        keep = ends > starts
+        starts, ends = starts[keep], ends[keep]
+
+        # The first three commas of a row end its integer columns.
+        commas = np.flatnonzero(data == COMMA)
+        first = np.searchsorted(commas, starts)
+        c1, c2, c3 = commas[first], commas[first + 1], commas[first + 2]
+
+        keys = _key(_integers(data, starts, c1),
+                    _integers(data, c1 + 1, c2),
+                    _integers(data, c2 + 1, c3))
+        text_starts = c3 + 1
+
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.starts = text_starts[order]
+        self.stops = ends[order]
+
+    def get(self, id_, version_group_id=None, language_id=tb.LANGUAGE_ID):
+        """The flavor text of ``id_`` in a version group and a language.
+
+        Line breaks of the games are replaced by spaces.
+        """
+        if version_group_id is None:
+            version_group_id = tb.VERSION_GROUP_ID
+
+        key = _key(id_, version_group_id, language_id)
+        i = np.searchsorted(self.keys, key)
+
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError("No flavor text for {} in version group {} and "
+                           "language {}.".format(id_, version_group_id,
+                                                 language_id))
+
+        text = self._map[self.starts[i]:self.stops[i]].decode('utf-8')
+        text = text.rstrip('\r')
+        if text.startswith('"'):
+            text = text[1:-1].replace('""', '"')
+
+        # Soft hyphens are only there to split words across lines.
+        text = text.replace('\u00ad\n', '').replace('\u00ad', '')
+        return ' '.join(text.split())
+
+    def versions(self, id_, language_id=tb.LANGUAGE_ID):
+        """The version groups with a flavor text of ``id_``."""
+        lo = np.searchsorted(self.keys, _key(id_, 0, 0))
+        hi = np.searchsorted(self.keys, _key(id_ + 1, 0, 0))
+        keys = self.keys[lo:hi]
+        keys = keys[(keys & 0xffff) == language_id]
+        return ((keys >> 16) & 0xffff).astype('int32')
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def reader(kind):
+    """Return the ``FlavorText`` of ``kind``, indexing it on the first
+    call.
+    """
+    if kind not in FILES:
+        raise KeyError("`kind` should be one of {}.".format(tuple(FILES)))
+
+    if kind not in _readers:
+        _readers[kind] = FlavorText(FILES[kind])
+
+    return _readers[kind]
+
+
+def flavor_text(kind, id_, version_group_id=None, language_id=tb.LANGUAGE_ID):
+    """The flavor text of a move, an item or an ability.
+
+    Parameters
+    ----------
+    kind : str
+        One of ``'move'``, ``'item'`` and ``'ability'``.
+
+    id_ : int
+
+    version_group_id : int, optional
+        Defaults to ``tb.VERSION_GROUP_ID``.
+
+    language_id : int, default 9 (English)
+    """
+    return reader(kind).get(id_, version_group_id, language_id)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Non-interactive calculation jobs.
+
+A job is a ``dict`` (usually parsed from JSON) with a ``kind`` and the
+arguments of that kind. ``run(job)`` returns a JSON-serializable
+``dict``; ``run_all(jobs)`` does the same lazily for an iterable of
+jobs, so that thousands of calculations share one import of the
+tables.
+
+Usage
+-----
+    >>> run({'kind': 'damage', 'attacker': 'garchomp',
+    ...      'defender': 'shuckle', 'move': 'earthquake', 'n': 50})
+    {'id': None, 'kind': 'damage', 'result': {...}}
+
+Kinds
+-----
+simulate
+    p1, p2 : pokemon spec
+    n : int, default 1
+        Number of battles.
+    max_turns : int, default 100
+
+damage
+    attacker, defender : pokemon spec
+    move : int or str
+    n : int, default 100
+        Number of samples of the (random) damage.
+
+learnset
+    pokemon : int or str
+    level : int, optional
+        Only list the moves learnt by leveling up to this level.
+    version_group_id : int, optional
+
+lookup
+    table : str
+        One of ``LOOKUP_TABLES``.
+    key : int or str
+        An id or an identifier.
+
+A pokemon spec is either an id, a name, or a ``dict`` with the key
+``pokemon`` and the optional keys ``level``, ``nature``, ``iv``,
+``ev``, ``item`` and ``moves``.
+
+Every job may carry an ``id``, which is copied to its result, and a
+``seed`` for the random number generator.
+"""
+
+import json
+
+import numpy as np
+from pandas import isnull
+
+import phanpy.core.algorithms as al
+import phanpy.core.objects as ob
+import phanpy.core.tables as tb
+from phanpy.core.learnsets import learnset_index
+from phanpy.core.names import did_you_mean
+
+LOOKUP_TABLES = ('abilities', 'items', 'moves', 'natures', 'pokemon',
+                 'types')
+
+# Kinds of `core.names` of the lookup tables, for the suggestions.
+LOOKUP_KINDS = {'abilities': 'ability', 'items': 'item', 'moves': 'move',
+                'natures': 'nature', 'pokemon': 'pokemon'}
+
+
+def _key(value):
+    """Turn numeric strings into ``int``'s, leave the names alone."""
+    if isinstance(value, str) and value.isnumeric():
+        return int(value)
+    return value
+
+
+def _builtin(value):
+    """Convert numpy objects and missing values for ``json``."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and isnull(value):
+        return None
+    return value
+
+
+def make_pokemon(spec):
+    """Instantiate a ``Pokemon`` from a pokemon spec."""
+    if not isinstance(spec, dict):
+        return ob.Pokemon(_key(spec))
+
+    pokemon = ob.Pokemon(_key(spec['pokemon']), spec.get('level', 50))
+
+    if 'nature' in spec:
+        pokemon.set_nature(_key(spec['nature']))
+
+    if 'iv' in spec:
+        pokemon.set_iv(spec['iv'])
+
+    if 'ev' in spec:
+        pokemon.set_ev(spec['ev'])
+
+    if 'item' in spec:
+        pokemon.item = ob.Item(_key(spec['item']))
+
+    if 'moves' in spec:
+        pokemon.moves = [ob.Move(_key(x)) for x in spec['moves']]
+
+    return pokemon
+
+
+def simulate(p1, p2, n=1, max_turns=100):
+    """Let ``p1`` and ``p2`` battle ``n`` times."""
+    wins = [0, 0]
+    draws = 0
+    turns = 0
+
+    for __ in range(n):
+        f1, f2 = make_pokemon(p1), make_pokemon(p2)
+        winner, turn = al.battle(f1, f2, max_turns)
+        turns += turn
+
+        if winner is f1:
+            wins[0] += 1
+        elif winner is f2:
+            wins[1] += 1
+        else:
+            draws += 1
+
+    return {'p1_wins': wins[0], 'p2_wins': wins[1], 'draws': draws,
+            'mean_turns': turns / n}
+
+
+def damage(attacker, defender, move, n=100):
+    """Sample the damage ``attacker`` deals to ``defender`` ``n`` times."""
+    f1, f2 = make_pokemon(attacker), make_pokemon(defender)
+    m1, m2 = ob.Move(_key(move)), f2.moves[0]
+
+    samples = np.empty(n)
+    for i in range(n):
+        # Critical stages and hp's should not carry over.
+        f1.reset_current()
+        f2.reset_current()
+        samples[i] = np.floor(al.calculate_damage(f1, m1, f2, m2))
+
+    return {'attacker': f1.name, 'defender': f2.name, 'move': m1.name,
+            'min': samples.min(), 'max': samples.max(),
+            'mean': samples.mean(),
+            'defender_hp': f2.stats.hp}
+
+
+def learnset(pokemon, level=None, version_group_id=None):
+    """List the moves ``pokemon`` learns, by learn method."""
+    p = ob.Pokemon(_key(pokemon))
+    index = learnset_index()
+    learnt = index.learnset(p.id, version_group_id)
+
+    names = tb.moves.set_index('id')['identifier']
+
+    def describe(move_ids):
+        return [{'id': m, 'name': names.get(m)} for m in move_ids]
+
+    level_up = index.level_up(p.id, version_group_id,
+                              100 if level is None else level)
+
+    return {'level_up': [{'id': m, 'name': names.get(m), 'level': lv}
+                         for m, lv in zip(level_up, learnt.levels)],
+            'machine': [{'id': m, 'name': names.get(m), 'item_id': i}
+                        for m, i in zip(learnt.machine, learnt.machine_items)],
+            'egg': describe(learnt.egg),
+            'tutor': describe(learnt.tutor)}
+
+
+def lookup(table, key):
+    """Return the row of ``table`` whose id or identifier is ``key``."""
+    if table not in LOOKUP_TABLES:
+        raise KeyError("`table` should be one of {}.".format(LOOKUP_TABLES))
+
+    key = _key(key)
+    df = getattr(tb, table)
+    column = 'id' if isinstance(key, int) else 'identifier'
+    subset = df[df[column] == key]
+
+    if subset.empty:
+        hint = (did_you_mean(key, LOOKUP_KINDS[table])
+                if table in LOOKUP_KINDS else '')
+        raise KeyError("{} is not in `{}`.{}".format(key, table, hint))
+
+    return {k: _builtin(v) for k, v in subset.iloc[0].items()}
+
+
+JOBS = {'simulate': simulate,
+        'damage': damage,
+        'learnset': learnset,
+        'lookup': lookup}
+
+
+def not_a_job(job):
+    """The error of a JSON value that is not an object, or None."""
+    if isinstance(job, dict):
+        return None
+    return "A job should be a JSON object, not {}.".format(json.dumps(job))
+
+
+def run(job):
+    """Run a single job. Errors are reported in the result."""
+    if not isinstance(job, dict):
+        return {'id': None, 'kind': None, 'error': not_a_job(job)}
+
+    out = {'id': job.get('id'), 'kind': job.get('kind')}
+
+    arguments = {k: v for k, v in job.items()
+                 if k not in ('id', 'kind', 'seed')}
+
+    try:
+        if job.get('seed') is not None:
+            np.random.seed(job['seed'])
+        out['result'] = JOBS[job['kind']](**arguments)
+
+    except KeyError as e:
+        if job.get('kind') not in JOBS:
+            out['error'] = "Unknown job kind {!r}.".format(job.get('kind'))
+        else:
+            out['error'] = "KeyError: {}".format(e)
+
+    except Exception as e:
+        out['error'] = "{}: {}".format(type(e).__name__, e)
+
+    return out
+
+
+def run_all(jobs):
+    """Lazily run every job in ``jobs``."""
+    for job in jobs:
+        yield run(job)
+
+
+def read_jobs(stream):
+    """Read jobs from a JSON list or from JSON lines.
+
+    JSON lines are read lazily; blank lines are skipped.
+    """
+    first = stream.readline()
+    while first and not first.strip():
+        first = stream.readline()
+
+    if first.lstrip().startswith('['):
+        yield from json.loads(first + stream.read())
+        return
+
+    if first.strip():
+        yield json.loads(first)
+
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def dumps(result):
+    """Serialize a result to one line of JSON."""
+    return json.dumps(result, default=_builtin, ensure_ascii=False)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Learnsets of Pokémon, for every version group.
+
+``tb.pokemon_moves`` only holds the version group chosen at import.
+The functions here read ``pokemon_moves.csv`` once in full.
+
+``learnset_view(...)`` joins it with ``moves.csv`` and
+``move_effect_prose.csv`` once per version group, so that listing the
+moves a Pokémon can learn is a single filter on a ready-made table.
+
+``learnset_index()`` keeps the learnsets as sorted arrays, so that the
+moves learnable at some level are found by a binary search.
+
+Usage
+-----
+    >>> learnable_moves(231, level=20)
+         pokemon_id  move_id  level  identifier  power  pp  short_effect
+    ...
+    >>> print(render(learnable_moves(231, level=20)))
+    >>> learnset_index().level_up(231, 8, level=20)
+    array([...], dtype=int32)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+# Ids of ``pokemon_move_methods.csv``.
+LEVEL_UP, EGG, TUTOR, MACHINE = 1, 2, 3, 4
+
+# Views already joined, keyed by version group id.
+_views = {}
+
+Learnset = namedtuple('Learnset', ['level_up', 'levels', 'egg', 'tutor',
+                                   'machine', 'machine_items'])
+
+
+@tb.once
+def all_pokemon_moves():
+    """Return ``pokemon_moves.csv`` for every version group.
+
+    The file is read the first time this function is called.
+    """
+    return tb.read_table('pokemon_moves')
+
+
+def learnset_view(version_group_id=None):
+    """All (pokemon, move) pairs of a version group, with move details.
+
+    Every move appears once per Pokémon, at the lowest level it can be
+    learnt; moves learnt other than by leveling up have level 0.
+
+    Parameters
+    ----------
+    version_group_id : int, optional
+        Defaults to ``tb.VERSION_GROUP_ID``.
+
+    Returns
+    -------
+    view : pandas.DataFrame
+        Columns are ``pokemon_id``, ``move_id``, ``level``,
+        ``identifier``, ``power``, ``pp`` and ``short_effect``, sorted
+        by ``pokemon_id`` and ``move_id``.
+    """
+    if version_group_id is None:
+        version_group_id = tb.VERSION_GROUP_ID
+
+    if version_group_id in _views:
+        return _views[version_group_id]
+
+    pm = all_pokemon_moves()
+    pm = pm[pm['version_group_id'] == version_group_id]
+    pm = (pm[['pokemon_id', 'move_id', 'level']]
+          .sort_values(['pokemon_id', 'move_id', 'level'])
+          .drop_duplicates(['pokemon_id', 'move_id']))
+
+    moves = tb.moves[['id', 'identifier', 'power', 'pp', 'effect_id']]
+
+    mep = tb.move_effect_prose
+    mep = mep[mep['local_language_id'] == tb.LANGUAGE_ID]
+    mep = mep[['move_effect_id', 'short_effect']]
+
+    view = (pm.merge(moves, left_on='move_id', right_on='id')
+              .merge(mep, how='left', left_on='effect_id',
+                     right_on='move_effect_id'))
+
+    view = (view[['pokemon_id', 'move_id', 'level', 'identifier', 'power',
+                  'pp', 'short_effect']]
+            .sort_values(['pokemon_id', 'move_id'])
+            .reset_index(drop=True))
+
+    _views[version_group_id] = view
+    return view
+
+
+def learnable_moves(pokemon_id, level=100, version_group_id=None):
+    """Return the rows of ``learnset_view`` learnable by ``pokemon_id``
+    at ``level``.
+    """
+    view = learnset_view(version_group_id)
+    condition = (view['pokemon_id'] == pokemon_id) & (view['level'] <= level)
+    return view[condition]
+
+
+def render(moves, width=40):
+    """Format the rows of ``learnset_view`` as a table for the console."""
+    template = "{:^5}|{:^15}|{:^6}|{:^6}|{:<" + str(width) + "}"
+
+    power = moves['power'].fillna(-1).astype(int).astype(str)
+    pp = moves['pp'].fillna(-1).astype(int).astype(str)
+    effect = moves['short_effect'].fillna('').str.slice(0, width)
+
+    rows = zip(moves['move_id'], moves['identifier'],
+               power.replace('-1', '-'), pp.replace('-1', '-'), effect)
+
+    return '\n'.join(template.format(*row) for row in rows)
+
+
+class LearnsetIndex():
+    """Learnsets keyed by ``(pokemon_id, version_group_id)``.
+
+    All rows of ``pokemon_moves.csv`` are kept in three flat arrays
+    (``move_id``, ``level`` and ``method``), sorted by Pokémon, version
+    group, level and move. Every key maps to a slice of these arrays,
+    so a query is a dict lookup and a ``searchsorted``. Moves learnt
+    other than by leveling up have level 0.
+
+    Parameters
+    ----------
+    pokemon_moves : pandas.DataFrame, optional
+        Defaults to ``pokemon_moves.csv`` with all version groups.
+
+    machines : pandas.DataFrame, optional
+        Defaults to ``machines.csv``. Used to find the TM/HM items.
+    """
+
+    def __init__(self, pokemon_moves=None, machines=None):
+
+        if pokemon_moves is None:
+            pokemon_moves = all_pokemon_moves()
+
+        if machines is None:
+            machines = tb.read_table('machines')
+
+        pm = pokemon_moves.sort_values(['pokemon_id', 'version_group_id',
+                                        'level', 'move_id'])
+
+        self.move_id = pm['move_id'].values.astype('int32')
+        self.level = pm['level'].values.astype('int16')
+        self.method = pm['pokemon_move_method_id'].values.astype('int8')
+
+        pokemon_id = pm['pokemon_id'].values
+        version_group_id = pm['version_group_id'].values
+
+        # Where each (pokemon, version group) block starts and stops.
+        changes = np.flatnonzero((np.diff(pokemon_id) != 0) |
+                                 (np.diff(version_group_id) != 0)) + 1
+        starts = np.append(0, changes)
+        stops = np.append(changes, len(pm))
+
+        self._slices = {(int(pokemon_id[i]), int(version_group_id[i])):
+                        (int(i), int(j)) for i, j in zip(starts, stops)}
+
+        # Machine item of a move, keyed by (version group, move).
+        self._machine_items = {
+            (int(vg), int(move)): int(item)
+            for vg, move, item in zip(machines['version_group_id'],
+                                      machines['move_id'],
+                                      machines['item_id'])
+        }
+
+        self._learnsets = {}
+
+    def _slice(self, pokemon_id, version_group_id):
+        if version_group_id is None:
+            version_group_id = tb.VERSION_GROUP_ID
+
+        key = (int(pokemon_id), int(version_group_id))
+        if key not in self._slices:
+            raise KeyError("No learnset for Pokémon {} in version group {}."
+                           "".format(*key))
+        return self._slices[key]
+
+    def learnable(self, pokemon_id, version_group_id=None, level=100):
+        """All the moves learnable at ``level``, by any method.
+
+        Returns
+        -------
+        move_ids : numpy.ndarray
+            Sorted, without duplicates.
+        """
+        start, stop = self._slice(pokemon_id, version_group_id)
+        stop = start + np.searchsorted(self.level[start:stop], level,
+                                       side='right')
+        return np.unique(self.move_id[start:stop])
+
+    def level_up(self, pokemon_id, version_group_id=None, level=100):
+        """The moves learnt by leveling up to ``level``, in the order
+        they are learnt.
+        """
+        learnset = self.learnset(pokemon_id, version_group_id)
+        stop = np.searchsorted(learnset.levels, level, side='right')
+        return learnset.level_up[:stop]
+
+    def default_moves(self, pokemon_id, version_group_id=None, level=100):
+        """The last (at most) four moves learnt by leveling up, i.e. the
+        moves of a wild Pokémon at ``level``.
+        """
+        moves = self.level_up(pokemon_id, version_group_id, level)[::-1]
+        __, first = np.unique(moves, return_index=True)
+        return moves[np.sort(first)][:4][::-1]
+
+    def learnset(self, pokemon_id, version_group_id=None):
+        """The whole ``Learnset`` of a Pokémon, split by method."""
+        start, stop = self._slice(pokemon_id, version_group_id)
+
+        if (start, stop) in self._learnsets:
+            return self._learnsets[(start, stop)]
+
+        move_id = self.move_id[start:stop]
+        level = self.level[start:stop]
+        method = self.method[start:stop]
+
+        version_group_id = (tb.VERSION_GROUP_ID if version_group_id is None
+                            else version_group_id)
+
+        level_up = method == LEVEL_UP
+        machine = np.unique(move_id[method == MACHINE])
+        items = np.array([self._machine_items.get((version_group_id, m), 0)
+                          for m in machine], dtype='int32')
+
+        learnset = Learnset(level_up=move_id[level_up],
+                            levels=level[level_up],
+                            egg=np.unique(move_id[method == EGG]),
+                            tutor=np.unique(move_id[method == TUTOR]),
+                            machine=machine,
+                            machine_items=items)
+
+        self._learnsets[(start, stop)] = learnset
+        return learnset
+
+    def __contains__(self, key):
+        return key in self._slices
+
+
+@tb.once
+def learnset_index():
+    """The ``LearnsetIndex`` of ``all_pokemon_moves()``."""
+    return LearnsetIndex()
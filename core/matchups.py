@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Species-by-species matchup matrices, cached on disk.
+
+``matchups(level)`` pits every species against every other, both at
+``level`` with their default moves (the last four learnt by leveling
+up), and returns
+
+- ``damage[i, j]``, the expected damage per turn of the best move of
+  species ``i`` against species ``j``;
+- ``turns[i, j]``, the number of turns ``i`` needs to knock ``j`` out
+  with that move (``inf`` if it cannot).
+
+The damage is the formula of ``algorithms.base_damage`` in
+expectation: critical hits, the random factor, the accuracy and the
+number of hits are replaced by their means. Abilities, items and
+moves whose damage is not given by the formula (variable power, fixed
+damage, ...) are left out.
+
+The rows are computed in a process pool, and the matrices saved in
+``tb.CACHE_PATH``, under a key made of the data files, the parameters
+and ``FORMAT_VERSION``. Later calls map the saved matrices in memory.
+
+Usage
+-----
+    >>> m = matchups(level=50)
+    >>> i, j = m.index(445), m.index(213)
+    >>> m.damage[i, j], m.turns[i, j]
+"""
+
+import hashlib
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import phanpy.core.tables as tb
+from phanpy.core.coverage import efficacy_matrix, species_types
+from phanpy.core.damage import RISING_POWER, critical_hits, hit_chances
+from phanpy.core.learnsets import learnset_index
+
+# Bump when the computation changes, to invalidate the caches.
+FORMAT_VERSION = 4
+
+# Files the matrices depend on.
+DATA_FILES = ('pokemon.csv', 'pokemon_moves.csv', 'pokemon_stats.csv',
+              'pokemon_types.csv', 'pokemon_types_gen_6.csv',
+              'pokemon_species.csv', 'moves.csv', 'move_meta.csv',
+              'type_efficacy.csv', 'version_groups.csv')
+
+# Mean of the random factor of the damage, uniform over [0.85, 1].
+RANDOM_MEAN = 0.925
+
+
+class Matchups(namedtuple('Matchups', ['species_id', 'damage', 'turns'])):
+    """Matchup matrices; rows attack, columns defend."""
+
+    __slots__ = ()
+
+    def index(self, species_id):
+        """The row (and column) of a species."""
+        return int(np.searchsorted(self.species_id, species_id))
+
+
+# Arrays of the worker processes, see `_init`.
+_arrays = None
+
+
+def _stats(pokemon_ids, level, iv):
+    """Stats (hp, attack, ..., speed) with a neutral nature and no EV."""
+    ps = tb.pokemon_stats
+    base = (ps.pivot(index='pokemon_id', columns='stat_id',
+                     values='base_stat')
+            .reindex(pokemon_ids).fillna(0).values)
+
+    inner = (2. * base + iv) * level // 100.
+    stats = np.floor(inner + 5.)
+    stats[:, 0] = inner[:, 0] + level + 10.
+    return stats
+
+
+def _moves(pokemon_ids, level, version_group_id):
+    """The default damaging moves of each Pokémon, as rows of 4 move
+    ids padded with 0.
+    """
+    index = learnset_index()
+    power = tb.moves.set_index('id')['power']
+    damage_class = tb.moves.set_index('id')['damage_class_id']
+
+    moves = np.zeros((len(pokemon_ids), 4), dtype='int32')
+    for i, pokemon_id in enumerate(pokemon_ids):
+        if (pokemon_id, version_group_id) not in index:
+            continue
+        default = [m for m in index.default_moves(pokemon_id,
+                                                  version_group_id, level)
+                   if m in power.index and power[m] > 0
+                   and damage_class[m] != 1]
+        moves[i, :len(default)] = default
+    return moves
+
+
+def _move_table(generation_id):
+    """Move columns indexed by move id; row 0 is "no move"."""
+    moves = tb.moves.merge(tb.move_meta, how='left', left_on='id',
+                           right_on='move_id')
+    size = moves['id'].max() + 1
+
+    def column(name, fill):
+        out = np.full(size, fill, dtype='float64')
+        out[moves['id']] = moves[name].fillna(fill)
+        return out
+
+    # The mean number of hits, counting the n-th hit of triple-kick
+    # n times as its power rises.
+    hits = np.ones(size)
+    min_hits, max_hits = column('min_hits', np.nan), column('max_hits', np.nan)
+    effect = column('effect_id', 0)
+    for move_id in np.flatnonzero(~np.isnan(min_hits)):
+        n, chances = hit_chances(min_hits[move_id], max_hits[move_id],
+                                 generation_id)
+        if effect[move_id] == RISING_POWER:
+            n = n * (n + 1) / 2.
+        hits[move_id] = n @ chances
+
+    modifier, chances = critical_hits(generation_id)
+    stage = np.clip(column('crit_rate', 0), 0, 4).astype(int)
+
+    return {'power': column('power', 0),
+            'type': column('type_id', 0).astype('int32'),
+            'damage_class': column('damage_class_id', 1).astype('int32'),
+            'accuracy': column('accuracy', 100) / 100.,
+            'critical': 1 + (modifier - 1) * chances[stage],
+            'hits': hits}
+
+
+def _init(arrays):
+    global _arrays
+    _arrays = arrays
+
+
+def _rows(rows):
+    """Expected damage of the attackers ``rows`` against everyone."""
+    a = _arrays
+    moves, stats, types, level = (a['moves'], a['stats'], a['types'],
+                                  a['level'])
+    efficacy = a['efficacy']
+    m = a['move_table']
+
+    damage = np.zeros((len(rows), len(stats)))
+
+    for r, i in enumerate(rows):
+        for move in moves[i]:
+            if not move:
+                continue
+
+            t = m['type'][move]
+            if m['damage_class'][move] == 2:
+                A, D = stats[i, 1], stats[:, 2]
+            else:
+                A, D = stats[i, 3], stats[:, 4]
+
+            base = 2 + (2 * (level / 5 + 1) * m['power'][move] * A / D) // 50
+            stab = 1.5 if t in types[i] else 1.
+            factor = efficacy[t, types[:, 0]] * efficacy[t, types[:, 1]]
+
+            expected = (base * factor * stab * RANDOM_MEAN
+                        * m['critical'][move] * m['hits'][move]
+                        * m['accuracy'][move])
+            damage[r] = np.maximum(damage[r], expected)
+
+    return damage
+
+
+# Hashes of the data files, keyed by their paths, sizes and
+# modification times.
+_data_digests = {}
+
+
+def _data_digest():
+    """The hash of ``DATA_FILES``, read again only when one changes."""
+    stamp = []
+    for name in DATA_FILES:
+        info = os.stat(tb.DATA_PATH + name)
+        stamp.append((tb.DATA_PATH + name, info.st_size, info.st_mtime_ns))
+    stamp = tuple(stamp)
+
+    if stamp not in _data_digests:
+        digest = hashlib.sha1()
+        for path, __, __ in stamp:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        _data_digests[stamp] = digest.digest()
+    return _data_digests[stamp]
+
+
+def _key(species_ids, level, version_group_id, iv):
+    digest = hashlib.sha1(_data_digest())
+    digest.update(np.asarray(species_ids, dtype='int64').tobytes())
+    digest.update(repr((FORMAT_VERSION, level, version_group_id,
+                        iv)).encode())
+    return digest.hexdigest()[:16]
+
+
+def compute(species_ids, level=50, version_group_id=None, iv=15,
+            workers=None):
+    """Compute the matchup matrices, without any cache.
+
+    Parameters
+    ----------
+    species_ids : array_like
+        Sorted species ids.
+
+    workers : int, optional
+        Size of the process pool. Defaults to the number of CPUs; with
+        0 workers everything runs in this process.
+    """
+    if version_group_id is None:
+        version_group_id = tb.VERSION_GROUP_ID
+
+    species_ids = np.asarray(species_ids)
+    pokemon = tb.pokemon[tb.pokemon['is_default'] == 1]
+    pokemon_ids = (pokemon.set_index('species_id')['id']
+                   .reindex(species_ids).values)
+
+    generation_id = tb.which_generation(version_group_id)
+    stats = _stats(pokemon_ids, level, iv)
+    arrays = {'moves': _moves(pokemon_ids, level, version_group_id),
+              'stats': stats,
+              'types': species_types(species_ids, generation_id),
+              'level': level,
+              'efficacy': efficacy_matrix(generation_id),
+              'move_table': _move_table(generation_id)}
+
+    chunks = np.array_split(np.arange(len(species_ids)),
+                            max(1, min(len(species_ids), 64)))
+
+    if workers == 0:
+        _init(arrays)
+        damage = np.vstack([_rows(chunk) for chunk in chunks])
+    else:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(workers, context, _init,
+                                 (arrays,)) as pool:
+            damage = np.vstack(list(pool.map(_rows, chunks)))
+
+    with np.errstate(divide='ignore'):
+        turns = np.where(damage > 0, np.ceil(stats[:, 0] / damage), np.inf)
+
+    return Matchups(species_ids, damage, turns)
+
+
+def matchups(level=50, version_group_id=None, species_ids=None, iv=15,
+             workers=None, cache=True):
+    """The matchup matrices, loaded from the cache when possible.
+
+    Parameters
+    ----------
+    level : int, default 50
+    version_group_id : int, optional
+        Defaults to ``tb.VERSION_GROUP_ID``.
+    species_ids : array_like, optional
+        Defaults to every species up to the generation of the version
+        group.
+    iv : int, default 15
+        Individual value of every stat.
+    workers : int, optional
+        See ``compute``.
+    cache : bool, default True
+
+    Returns
+    -------
+    matchups : Matchups
+        With read-only memory-mapped arrays when cached.
+    """
+    if version_group_id is None:
+        version_group_id = tb.VERSION_GROUP_ID
+
+    if species_ids is None:
+        species = tb.pokemon_species
+        generation_id = tb.which_generation(version_group_id)
+        species_ids = species['id'][species['generation_id']
+                                    <= generation_id].values
+    species_ids = np.sort(species_ids)
+
+    if not cache:
+        return compute(species_ids, level, version_group_id, iv, workers)
+
+    prefix = (tb.CACHE_PATH + 'matchups-' +
+              _key(species_ids, level, version_group_id, iv))
+    names = [prefix + '-' + field + '.npy' for field in Matchups._fields]
+
+    if not all(os.path.exists(name) for name in names):
+        computed = compute(species_ids, level, version_group_id, iv,
+                           workers)
+        os.makedirs(tb.CACHE_PATH, exist_ok=True)
+        for name, array in zip(names, computed):
+            with tb.write_atomically(name) as f:
+                np.save(f, array)
+
+    return Matchups(*(np.load(name, mmap_mode='r') for name in names))
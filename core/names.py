@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Names of Pokémon, moves, items, abilities and natures, in every
+language.
+
+``NameIndex`` gathers the identifiers, the ``*_names.csv`` files and
+the names of the ``translations/*.csv`` files into one sorted list of normalized names, each pointing to a
+``(kind, id)``. An exact lookup is a ``dict`` lookup, and a prefix
+search is a binary search in the sorted list. The index is cached in
+``CACHE_PATH`` and rebuilt when the csv files change.
+
+Names are normalized by ``normalize``: case, spaces, punctuation and
+the accents of latin letters are ignored, so that ``'Quick Claw'``,
+``'quick-claw'`` and ``'QUICKCLAW'`` are the same name. The gender
+signs are spelt out, as in the identifiers: ``'Nidoran♀'`` is
+``'nidoran-f'``.
+
+``FuzzyIndex`` suggests identifiers close to a misspelt name, by the
+trigrams they have in common.
+
+Usage
+-----
+    >>> index = name_index()
+    >>> index.resolve('Pottrott', 'pokemon')
+    213
+    >>> index.lookup('Psychokinese')
+    [Name(kind='move', id=94, language_id=6, name='Psychokinese')]
+    >>> index.prefix('garch', kind='pokemon')
+    [Name(kind='pokemon', id=445, language_id=0, name='garchomp'), ...]
+    >>> suggest('garchmop')
+    [Suggestion(kind='pokemon', id=445, name='garchomp', score=0.33), ...]
+"""
+
+import os
+import unicodedata
+import zipfile
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.tables as tb
+
+CACHE_PATH = tb.CACHE_PATH
+
+# kind: (table of identifiers, file of names, id column of the file,
+#        table of the translations).
+KINDS = {'pokemon': ('pokemon', 'pokemon_species_names',
+                     'pokemon_species_id', 'PokemonSpecies'),
+         'move': ('moves', 'move_names', 'move_id', 'Move'),
+         'item': ('items', 'item_names', 'item_id', 'Item'),
+         'ability': ('abilities', 'ability_names', 'ability_id', 'Ability'),
+         'nature': ('natures', 'nature_names', 'nature_id', 'Nature')}
+
+# The translations of the names into more languages, one file per
+# language, with their rows keyed by table, id and column.
+TRANSLATIONS = 'translations/'
+
+# Signs spelt out before normalizing, as in 'nidoran-f'.
+SIGNS = str.maketrans({'♀': 'f', '♂': 'm'})
+
+KIND_NAMES = tuple(KINDS)
+
+# The language id of the identifiers, e.g. 'quick-claw'.
+IDENTIFIER = 0
+
+Name = namedtuple('Name', ['kind', 'id', 'language_id', 'name'])
+Suggestion = namedtuple('Suggestion', ['kind', 'id', 'name', 'score'])
+
+
+def normalize(name):
+    """Fold case, drop spaces, punctuation and accents on latin letters.
+
+    Usage
+    -----
+        >>> normalize("Farfetch'd"), normalize('Flabébé')
+        ('farfetchd', 'flabebe')
+        >>> normalize('Nidoran♀')
+        'nidoranf'
+    """
+    name = str(name).translate(SIGNS)
+    decomposed = unicodedata.normalize('NFKD', name.casefold())
+
+    chars = []
+    for c in decomposed:
+        if unicodedata.combining(c):
+            if chars and chars[-1].isascii():
+                continue
+        elif not (c.isalnum() or unicodedata.category(c) == 'Mn'):
+            continue
+        chars.append(c)
+
+    return unicodedata.normalize('NFKC', ''.join(chars))
+
+
+def _translations():
+    """The translation files, e.g. ``translations/cs``."""
+    directory = tb.DATA_PATH + TRANSLATIONS
+    if not os.path.isdir(directory):
+        return []
+    return sorted(TRANSLATIONS + name[:-len('.csv')]
+                  for name in os.listdir(directory) if name.endswith('.csv'))
+
+
+def _sources():
+    """The csv files of the index, with their sizes and times."""
+    files = ['pokemon', 'moves', 'items', 'abilities', 'natures']
+    files += [KINDS[kind][1] for kind in KINDS]
+    files += _translations()
+
+    signature = []
+    for name in files:
+        stat = os.stat(tb.DATA_PATH + name + '.csv')
+        signature += [stat.st_size, int(stat.st_mtime)]
+
+    return np.array(signature, dtype='int64')
+
+
+def _entries():
+    """All (name, kind, id, language) of the csv files."""
+    pokemon = tb.read_table('pokemon')
+    default = pokemon[pokemon['is_default'] == 1]
+    default_form = dict(zip(default['species_id'], default['id']))
+
+    translations = [tb.read_table(name) for name in _translations()]
+    translations = [t[t['column'] == 'name'].dropna(subset=['string'])
+                    for t in translations]
+
+    for code, (kind, (table, names, id_column,
+                      translated)) in enumerate(KINDS.items()):
+        identifiers = tb.read_table(table)
+        for id_, name in zip(identifiers['id'], identifiers['identifier']):
+            yield name, code, id_, IDENTIFIER
+
+        names = tb.read_table(names).dropna(subset=['name'])
+        ids = names[id_column]
+        if kind == 'pokemon':
+            ids = ids.map(default_form)
+
+        for id_, language_id, name in zip(ids, names['local_language_id'],
+                                          names['name']):
+            yield name, code, id_, language_id
+
+        for rows in translations:
+            rows = rows[rows['table'] == translated]
+            ids = rows['id']
+            if kind == 'pokemon':
+                ids = ids.map(default_form)
+
+            for id_, language_id, name in zip(ids, rows['language_id'],
+                                              rows['string']):
+                yield name, code, id_, language_id
+
+
+def _load(cache_file, signature):
+    """The arrays of an up-to-date cache, or None.
+
+    A cache that cannot be read is a miss; it is written again.
+    """
+    try:
+        with np.load(cache_file) as npz:
+            if np.array_equal(npz['signature'], signature):
+                return {k: npz[k] for k in npz.files}
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+def _save(cache_file, arrays):
+    """Write the cache, if the data directory can be written."""
+    try:
+        directory = os.path.dirname(cache_file)
+        os.makedirs(directory, exist_ok=True)
+        with tb.write_atomically(cache_file) as f:
+            np.savez(f, **arrays)
+    except OSError:
+        # The index works without its cache.
+        pass
+
+
+class NameIndex():
+    """Every name of every kind, sorted by normalized name.
+
+    The entries are kept in parallel arrays (``kind``, ``id``,
+    ``language_id``) sorted by their normalized ``keys``; all the
+    entries of a key are the slice ``_slices[key]``.
+
+    Parameters
+    ----------
+    cache : bool, default True
+        Load the index from ``CACHE_PATH`` if it is up to date, and
+        save it there otherwise.
+    """
+
+    def __init__(self, cache=True):
+
+        cache_file = CACHE_PATH + 'names.npz'
+        signature = _sources()
+
+        arrays = _load(cache_file, signature) if cache else None
+
+        if arrays is None:
+            arrays = self._build()
+            arrays['signature'] = signature
+            if cache:
+                _save(cache_file, arrays)
+
+        self.kind = arrays['kind']
+        self.id = arrays['id']
+        self.language_id = arrays['language_id']
+        self.names = bytes(arrays['names']).decode('utf-8').split('\n')
+        self.keys = bytes(arrays['keys']).decode('utf-8').split('\n')
+
+        # Entries are sorted by key, so every key is one slice.
+        self._slices = {}
+        start = 0
+        for i in range(1, len(self.keys) + 1):
+            if i == len(self.keys) or self.keys[i] != self.keys[start]:
+                self._slices[self.keys[start]] = (start, i)
+                start = i
+        self.unique_keys = list(self._slices)
+
+    @staticmethod
+    def _build():
+        entries = sorted({(normalize(name), kind, int(id_), int(language),
+                           name)
+                          for name, kind, id_, language in _entries()
+                          if normalize(name)})
+
+        keys, kind, id_, language_id, names = zip(*entries)
+
+        def blob(strings):
+            return np.frombuffer('\n'.join(strings).encode('utf-8'),
+                                 dtype='uint8')
+
+        return {'kind': np.array(kind, dtype='int8'),
+                'id': np.array(id_, dtype='int32'),
+                'language_id': np.array(language_id, dtype='int16'),
+                'keys': blob(keys),
+                'names': blob(names)}
+
+    def _entries(self, start, stop, kind=None):
+        code = None if kind is None else KIND_NAMES.index(kind)
+        return [Name(KIND_NAMES[self.kind[i]], int(self.id[i]),
+                     int(self.language_id[i]), self.names[i])
+                for i in range(start, stop)
+                if code is None or self.kind[i] == code]
+
+    def lookup(self, name, kind=None):
+        """All the entries named ``name``, in any language.
+
+        Parameters
+        ----------
+        name : str
+        kind : str, optional
+            One of ``KIND_NAMES``.
+
+        Returns
+        -------
+        names : list of Name
+        """
+        if kind is not None and kind not in KINDS:
+            raise KeyError("`kind` should be one of {}.".format(KIND_NAMES))
+
+        key = normalize(name)
+        if key not in self._slices:
+            return []
+        return self._entries(*self._slices[key], kind=kind)
+
+    def resolve(self, name, kind):
+        """The id of the ``kind`` named ``name``.
+
+        Raises a ``KeyError`` when there is no such name, or when it
+        means several different things.
+        """
+        ids = {entry.id for entry in self.lookup(name, kind)}
+
+        if not ids:
+            raise KeyError("{} is not a valid {} name.{}"
+                           "".format(name, kind, did_you_mean(name, kind)))
+        if len(ids) > 1:
+            raise KeyError("{} is an ambiguous {} name: it could be any of "
+                           "the ids {}.".format(name, kind, sorted(ids)))
+
+        return ids.pop()
+
+    def prefix(self, prefix, kind=None, limit=10):
+        """Entries whose name starts with ``prefix``, in name order.
+
+        Every ``(kind, id)`` is listed once, under its first name.
+        """
+        key = normalize(prefix)
+        found = []
+        seen = set()
+
+        i = bisect_left(self.unique_keys, key)
+        while i < len(self.unique_keys) and len(found) < limit:
+            name = self.unique_keys[i]
+            if not name.startswith(key):
+                break
+            for entry in self._entries(*self._slices[name], kind=kind):
+                if (entry.kind, entry.id) not in seen:
+                    seen.add((entry.kind, entry.id))
+                    found.append(entry)
+            i += 1
+
+        return found[:limit]
+
+    def __contains__(self, name):
+        return normalize(name) in self._slices
+
+
+@tb.once
+def name_index():
+    """The ``NameIndex``, loaded from its cache when possible."""
+    return NameIndex()
+
+
+def trigrams(name):
+    """The trigrams of a normalized name, padded at both ends."""
+    padded = '  ' + normalize(name) + ' '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex():
+    """Trigram index of the identifiers of every kind.
+
+    Every trigram maps to the slice ``gram_ptr[g]:gram_ptr[g+1]`` of
+    ``gram_entries``, the identifiers it appears in. A query counts the
+    trigrams it shares with each identifier in a single ``bincount``
+    over its slices, and ranks them by Jaccard similarity.
+
+    Parameters
+    ----------
+    names : NameIndex, optional
+        Defaults to ``name_index()``.
+    """
+
+    def __init__(self, names=None):
+
+        if names is None:
+            names = name_index()
+
+        identifiers = names.language_id == IDENTIFIER
+        self.kind = names.kind[identifiers]
+        self.id = names.id[identifiers]
+        self.names = [name for name, keep in zip(names.names, identifiers)
+                      if keep]
+
+        postings = {}
+        self.size = np.empty(len(self.names), dtype='int32')
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.size[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+
+        self._grams = {gram: g for g, gram in enumerate(postings)}
+        self.gram_ptr = np.cumsum([0] + [len(x) for x in postings.values()])
+        self.gram_entries = np.concatenate([np.array(x, dtype='int32')
+                                            for x in postings.values()])
+
+    def search(self, name, kind=None, limit=5, min_score=0.2):
+        """Identifiers close to ``name``, the closest first.
+
+        Parameters
+        ----------
+        name : str
+        kind : str, optional
+            One of ``KIND_NAMES``.
+        limit : int, default 5
+        min_score : float, default 0.2
+            Jaccard similarity of the trigrams, between 0 and 1.
+
+        Returns
+        -------
+        suggestions : list of Suggestion
+        """
+        grams = [self._grams[gram] for gram in trigrams(name)
+                 if gram in self._grams]
+        if not grams:
+            return []
+
+        entries = np.concatenate([self.gram_entries[self.gram_ptr[g]:
+                                                    self.gram_ptr[g + 1]]
+                                  for g in grams])
+        shared = np.bincount(entries, minlength=len(self.names))
+        score = shared / (self.size + len(trigrams(name)) - shared)
+
+        if kind is not None:
+            score[self.kind != KIND_NAMES.index(kind)] = 0
+
+        best = np.flatnonzero(score >= min_score)
+        best = best[np.lexsort((best, -score[best]))][:limit]
+
+        return [Suggestion(KIND_NAMES[self.kind[i]], int(self.id[i]),
+                           self.names[i], round(float(score[i]), 2))
+                for i in best]
+
+
+@tb.once
+def fuzzy_index():
+    """The ``FuzzyIndex`` of the identifiers."""
+    return FuzzyIndex()
+
+
+def suggest(name, kind=None, limit=5):
+    """Identifiers close to ``name``; see ``FuzzyIndex.search``."""
+    return fuzzy_index().search(name, kind, limit)
+
+
+def did_you_mean(name, kind=None, limit=3):
+    """A hint for error messages, or ``''`` if nothing is close."""
+    names = [s.name for s in suggest(name, kind, limit)]
+
+    if not names:
+        return ''
+    if len(names) == 1:
+        return " Did you mean {!r}?".format(names[0])
+    return " Did you mean {} or {!r}?".format(
+        ', '.join(repr(x) for x in names[:-1]), names[-1])
@@ -4,13 +4,43 @@
 from os import sys, path
 sys.path.append(path.abspath('.'))
 
-from collections import deque, defaultdict
+from collections import deque, defaultdict, namedtuple
+from contextlib import contextmanager
 from copy import deepcopy
 from functools import reduce
 
 import numpy as np
-from pandas import Series, DataFrame
+from pandas import Series, DataFrame, Index
 import phanpy.core.tables as tb
+from phanpy.core.learnsets import learnset_index
+from phanpy.core.names import name_index, did_you_mean
+
+
+# The attribute names of the slots of each class, as `_copy` reads them.
+_slot_names = {}
+
+
+def _copy(obj):
+    """A shallow copy of an instance of a class with ``__slots__``.
+
+    The same as ``copy(obj)``, several times faster: ``copy`` goes
+    through ``__reduce_ex__``, which builds a dict of the slots.
+    """
+    cls = type(obj)
+    if cls not in _slot_names:
+        # Private names are mangled, e.g. Status.__current.
+        _slot_names[cls] = [('_' + cls.__name__ + name
+                             if name.startswith('__') else name)
+                            for name in cls.__slots__]
+
+    new = cls.__new__(cls)
+    for name in _slot_names[cls]:
+        try:
+            setattr(new, name, getattr(obj, name))
+        except AttributeError:
+            # An empty slot.
+            pass
+    return new
 
 
 class Status():
@@ -120,6 +150,8 @@ class Status():
         https://bulbapedia.bulbagarden.net/wiki/Status_condition
     """
 
+    __slots__ = ('id', 'name', 'volatile', 'duration', '__current')
+
     def __init__(self, status=None, duration=float('inf')):
 
         if status in list(tb.ailments.id.values):
@@ -189,6 +221,7 @@ class Status():
             ...     # do something
 
         """
+        self.__current = 0
         return self
 
     def __next__(self):
@@ -293,6 +326,31 @@ class Status():
             self.duration = np.array([float('inf')])
             self.volatile = np.array([False])
 
+    def clear(self):
+        """Remove every status, in place: back to ``Status(0)``.
+
+        The arrays are cut down to their first entry, which is then
+        overwritten, so nothing is allocated.
+        """
+        self.id = self.id[:1]
+        self.name = self.name[:1]
+        self.duration = self.duration[:1]
+        self.volatile = self.volatile[:1]
+
+        self.id[0] = 0
+        self.name[0] = 'none'
+        self.duration[0] = float('inf')
+        self.volatile[0] = False
+        self.__current = 0
+
+    def clone(self):
+        """A copy of the statuses, which can be changed on its own."""
+        new = _copy(self)
+        new.id = self.id.copy()
+        new.name = self.name.copy()
+        new.volatile = self.volatile.copy()
+        new.duration = self.duration.copy()
+        return new
 
     def reduce(self):
         """Subtract 1 from all durations."""
@@ -305,9 +363,84 @@ class Status():
             self.duration = self.duration[mask]
 
 
+# An immutable entry of the item registry. ``flag_bits`` has the bit
+# ``1 << item_flag_id`` set for every flag of the item.
+ItemRecord = namedtuple('ItemRecord', ['id', 'name', 'category_id', 'fling',
+                                       'flag_bits'])
+
+Fling = namedtuple('Fling', ['effect_id', 'effect_name', 'power'])
+
+NO_ITEM = ItemRecord(0, 'no-item', 23, Fling(0, 'no-effect', 0), 0)
+
+# Rows of the move tables, shared by all the moves with the same id.
+_move_flags = {}
+_move_stat_changes = {}
+
+
+class ItemRegistry():
+    """Every item of ``tb.items`` as an ``ItemRecord``, by id and by
+    name, with the item flags as bit sets.
+    """
+
+    def __init__(self):
+
+        items = tb.items
+        fling_ids = items['fling_effect_id'].fillna(0).astype(int).values
+        fling_powers = items['fling_power'].fillna(0).astype(int).values
+        fling_names = dict(zip(tb.item_fling_effects['id'],
+                               tb.item_fling_effects['identifier']))
+
+        size = max(items['id'].max(), tb.item_flag_map['item_id'].max()) + 1
+        bits = np.zeros(size, dtype='int64')
+        np.bitwise_or.at(bits, tb.item_flag_map['item_id'].values,
+                         np.left_shift(1, tb.item_flag_map['item_flag_id']
+                                       .values))
+
+        self.flag_ids = dict(zip(tb.item_flags['identifier'],
+                                 tb.item_flags['id']))
+        self.flag_names = {v: k for k, v in self.flag_ids.items()}
+
+        self.by_id = {0: NO_ITEM}
+        for id_, name, category_id, fling_id, power in zip(
+                items['id'], items['identifier'], items['category_id'],
+                fling_ids, fling_powers):
+            fling = Fling(int(fling_id),
+                          fling_names.get(fling_id, 'no-effect'), int(power))
+            self.by_id[int(id_)] = ItemRecord(int(id_), name,
+                                              int(category_id), fling,
+                                              int(bits[id_]))
+
+        self.by_name = {record.name: record
+                        for record in self.by_id.values()}
+
+    def get(self, which_item):
+        """The record of an item id, or a name; ``None`` if there is no
+        such item.
+        """
+        if isinstance(which_item, str):
+            return self.by_name.get(which_item)
+        return self.by_id.get(which_item)
+
+    def flag_mask(self, *flags):
+        """The bit set of some item flag names."""
+        mask = 0
+        for flag in flags:
+            mask |= 1 << self.flag_ids[flag]
+        return mask
+
+
+@tb.once
+def item_registry():
+    """The ``ItemRegistry`` of ``tb.items``."""
+    return ItemRegistry()
+
+
 class Item():
     """A class for items.
 
+    Items are looked up in ``item_registry()``; all the items with the
+    same id share the same ``ItemRecord``.
+
     Parameters
     ----------
     which_item : int or str
@@ -322,72 +455,52 @@ class Item():
         not holding any item, this will be 0.
     name : str
         The name of the item.
+    category_id : int
+    fling : Fling
+        ``effect_id``, ``effect_name`` and ``power`` of the move
+        ``fling`` with this item.
+    flag_bits : int
+        The bit set of the item flags; see ``has_flag``.
     """
 
-    def __init__(self, which_item):
+    __slots__ = ('record', 'id', 'name', 'category_id', 'fling', 'flag_bits')
 
-        if which_item == 0:
-            id_ = 0
-            name = 'no-item'
-            # Define a subset regardless. It is needed for other
-            # attributes.
-            subset = tb.items[tb.items["id"] == which_item]
-
-        elif which_item in list(tb.items.id.values):
-            # If which_item is a valid item id, get its name from the
-            # table.
-            subset = tb.items[tb.items["id"] == which_item]
-            name = subset["identifier"].values[0]
-            id_ = which_item
-
-        elif which_item in tb.items.identifier.values:
-            # If which_item is a valid item namem, get the item id
-            # from the table.
-            subset = tb.items[tb.items["identifier"] == which_item]
-            id_ = subset["id"].values[0]
-            name = which_item
-
-        else:
-            raise KeyError("{} is not a valid item.".format(which_item))
-
-        self.id = id_
-        self.name = name
-
-        category_id = subset["category_id"].values
-        if list(category_id) == []:
-            category_id = [23]
-        self.category_id = category_id[0]
-
-        fling_power = subset["fling_power"].values
-        if list(fling_power) == []:
-            fling_power = [0]
-        elif np.isnan(fling_power[0]):
-            fling_power = [0]
-
-        fling_effect_id = subset["fling_effect_id"].values  # Can be empty
-        if list(fling_effect_id) == []:
-            fling_effect_id = [0]
-        elif np.isnan(fling_effect_id[0]):
-            fling_effect_id = [0]
-
-        fling_power = fling_power[0]
-        fling_effect_id = fling_effect_id[0]
-
-        condition = tb.item_fling_effects["id"] == fling_effect_id
-        subset = tb.item_fling_effects[condition]
-        fling_effect_name = subset["identifier"].values
-        if list(fling_effect_name) == []:
-            fling_effect_name = 'no-effect'
-
-        self.fling = Series(index=["effect_id", "effect_name", "power"],
-                            data=[fling_effect_id, fling_effect_name,
-                                  fling_power])
+    def __init__(self, which_item):
 
-        subset = tb.item_flag_map[tb.item_flag_map["item_id"] == self.id]
-        flag_id = DataFrame({"id": subset.item_flag_id})
-        self.flags = tb.item_flags.merge(flag_id, how="inner", on="id")
-        self.flags.columns = ["id", "name"]
+        record = item_registry().get(which_item)
+
+        if record is None and isinstance(which_item, str) \
+                and which_item in name_index():
+            # A name in another language, or spelled differently.
+            record = item_registry().get(name_index().resolve(which_item,
+                                                              'item'))
+
+        if record is None:
+            raise KeyError("{} is not a valid item.{}"
+                           "".format(which_item,
+                                     did_you_mean(which_item, 'item')))
+
+        self.record = record
+        self.id = record.id
+        self.name = record.name
+        self.category_id = record.category_id
+        self.fling = record.fling
+        self.flag_bits = record.flag_bits
+
+    def has_flag(self, *flags):
+        """Whether the item has all of the item flags ``flags``, e.g.
+        ``'holdable'``.
+        """
+        mask = item_registry().flag_mask(*flags)
+        return self.flag_bits & mask == mask
 
+    @property
+    def flags(self):
+        """The flags of the item, as a ``DataFrame`` of ids and names."""
+        names = item_registry().flag_names
+        ids = [i for i in sorted(names) if self.flag_bits >> i & 1]
+        return DataFrame({'id': ids, 'name': [names[i] for i in ids]},
+                         columns=['id', 'name'])
 
     def __str__(self):
         return self.name
@@ -468,10 +581,23 @@ class Move():
             critical stage.
     """
 
+    __slots__ = ('id', 'identifier', 'generation_id', 'type', 'power', 'pp',
+                 'max_pp', 'accuracy', 'priority', 'target_id',
+                 'damage_class_id', 'effect_id', 'effect_chance',
+                 'meta_category_id', 'meta_ailment_id', 'min_hits',
+                 'max_hits', 'min_turns', 'max_turns', 'drain', 'healing',
+                 'crit_rate', 'ailment_chance', 'flinch_chance',
+                 'stat_chance', 'name')
+
     def __init__(self, which_move):
 
         try:
-            if type(which_move) is str:
+            if (type(which_move) is str
+                    and which_move not in tb.moves.identifier.values):
+                # A name in another language, or spelled differently.
+                move_id = name_index().resolve(which_move, 'move')
+
+            elif type(which_move) is str:
                 move_id = int(tb.moves[tb.moves["identifier"] == which_move].id)
 
             elif str(which_move).isnumeric():
@@ -492,6 +618,7 @@ class Move():
         self.type = moves_subset["type_id"].values[0]
         self.power = moves_subset["power"].values[0]
         self.pp = moves_subset["pp"].values[0]
+        self.max_pp = self.pp
         self.accuracy = moves_subset["accuracy"].values[0]
         self.priority = moves_subset["priority"].values[0]
         self.target_id = moves_subset["target_id"].values[0]
@@ -512,17 +639,33 @@ class Move():
         self.flinch_chance = moves_meta_subset["flinch_chance"].values[0]
         self.stat_chance = moves_meta_subset["stat_chance"].values[0]
 
-        condition = tb.move_flag_map["move_id"] == self.id
-        self.flag = tb.move_flag_map[condition]
-
-        if move_id in tb.move_meta_stat_changes.move_id.values:
+        self.name = self.identifier
 
-            condition = tb.move_meta_stat_changes["move_id"] == self.id
-            self.stat_change = tb.move_meta_stat_changes[condition]
-        else:
-            self.stat_change = 0
+    @property
+    def flag(self):
+        """The rows of ``move_flag_map`` of the move."""
+        if self.id not in _move_flags:
+            condition = tb.move_flag_map["move_id"] == self.id
+            _move_flags[self.id] = tb.move_flag_map[condition]
+        return _move_flags[self.id]
 
-        self.name = self.identifier
+    @property
+    def stat_change(self):
+        """The rows of ``move_meta_stat_changes`` of the move, or 0 if
+        it changes no stat.
+        """
+        if self.id not in _move_stat_changes:
+            table = tb.move_meta_stat_changes
+            condition = table["move_id"] == self.id
+            _move_stat_changes[self.id] = (table[condition]
+                                           if condition.any() else 0)
+        return _move_stat_changes[self.id]
+
+    def clone(self):
+        """A copy of the move with its own PP; the data of the move is
+        shared.
+        """
+        return _copy(self)
 
     def __str__(self):
         return self.name
@@ -581,6 +724,21 @@ class Pokemon():
                           'specialDefense', 'speed', 'accuracy', 'evasion',
                           'critical']
 
+    # Shared by the Series of all the pokemon.
+    _STAT_INDEX = Index(STAT_NAMES)
+    _CURRENT_INDEX = Index(CURRENT_STAT_NAMES)
+    _HISTORY_INDEX = Index(["damage", "stage"])
+
+    # The stats, stages and history are kept in plain arrays; `base`,
+    # `iv`, `ev`, `stage`, `history` and `current` are Series over
+    # them, built on access. Changing the Series changes the arrays.
+    __slots__ = ('id', 'identifier', 'weight', 'species_id', 'generation_id',
+                 'gender_rate', 'base_happiness', 'gender_differences',
+                 'forms_switchable', 'name', 'gender', 'happiness', 'types',
+                 'level', '_base', '_iv', '_ev', 'nature_id', 'ability',
+                 '_stage', '_current', 'status', '_history', '_all_moves',
+                 'moves', 'flags', '_item', 'trainer', 'order', 'unique_id')
+
     def __init__(self, which_pokemon, level=50):
 
         if which_pokemon in list(tb.pokemon.id.values):
@@ -591,9 +749,16 @@ class Pokemon():
             # Else if `which_pokemon` is a valid Pokémon name
             condition = tb.pokemon['identifier'] == which_pokemon
 
+        elif (isinstance(which_pokemon, str)
+              and which_pokemon in name_index()):
+            # A name in another language, or spelled differently.
+            which_pokemon = name_index().resolve(which_pokemon, 'pokemon')
+            condition = tb.pokemon['id'] == which_pokemon
+
         else:
             raise KeyError("`pokemon` has to be an integer"
-                           " or a pokemon's name.")
+                           " or a pokemon's name.{}"
+                           "".format(did_you_mean(which_pokemon, 'pokemon')))
 
         # Get a subset of ``pokemon`` based on the condition.
         # Get the pokemon id from the subset.
@@ -648,16 +813,11 @@ class Pokemon():
 
         # Set the Pokémon's base stats.
         condition = tb.pokemon_stats["pokemon_id"] == self.id
-        pokemon_base_stat = tb.pokemon_stats[condition]["base_stat"].values
-        self.base = Series(data=pokemon_base_stat,
-                           index=self.STAT_NAMES)
+        self._base = tb.pokemon_stats[condition]["base_stat"].values
 
         # Pokémon's individual values are randomly generated.
         # Each value is uniformly distributed between 1 and 31.
-        self.iv = Series(
-                    data=[np.random.randint(1, 32) for i in range(6)],
-                    index=self.STAT_NAMES
-                        )
+        self._iv = np.array([np.random.randint(1, 32) for i in range(6)])
 
         # Set the actual EV the Pokémon has.
         # Needed for stats calculation.
@@ -673,36 +833,12 @@ class Pokemon():
         # Calculate the difference between consecutive elements
         __ev = np.ediff1d(cumulative_ev)
 
-        self.ev = Series(data=__ev, index=self.STAT_NAMES)
+        self._ev = __ev
 
         # ------------------ NATURE Initialization ------------------- #
 
         # Randomly assign a nature to the Pokémon.
-        id_ = np.random.randint(1, 25)
-        nature_subset = tb.natures[tb.natures['id'] == id_]
-
-        # Set the relevant info with respect to the Pokémon's nature.
-        self.nature = Series(index=["id", "name"],
-                             data=[id_,
-                                   nature_subset["identifier"].values[0]])
-
-        # The nature affects one's stats. The nature usually raises one
-        # stat by 1.1 and lowers another by 0.9.
-        decreased_stat = np.array([0. for x in range(6)])
-        increased_stat = np.array([0. for x in range(6)])
-
-
-        for x in range(1, 7):
-
-            if x == nature_subset["decreased_stat_id"].values[0]:
-                decreased_stat[x-1] -= 0.1
-
-            if x == nature_subset["increased_stat_id"].values[0]:
-                increased_stat[x-1] += 0.1
-
-        nature_modifier = (increased_stat + decreased_stat) + 1.
-        self.nature_modifier = Series(data=nature_modifier,
-                                      index=self.STAT_NAMES)
+        self.set_nature(np.random.randint(1, 25))
 
         # ------------------ ABILITY Initialization ------------------ #
 
@@ -720,8 +856,10 @@ class Pokemon():
         # Each stat has a stage and a value. We can calculate the values
         # based on the stages every round.
 
-        self.stage = Series(index=self.CURRENT_STAT_NAMES,
-                            data=np.zeros(len(self.CURRENT_STAT_NAMES)))
+        self._stage = np.zeros(len(self.CURRENT_STAT_NAMES))
+
+        # The in-battle stats. Built on the first access of `current`.
+        self._current = None
 
         # Set the Pokémon's status. Detaults to None.
         self.status = Status(0)
@@ -729,19 +867,19 @@ class Pokemon():
         # Records the received damages. Has a memory of 5 turns.
         # If its length is over 5, delete the oldest damage.
         # Always use `appendleft()` to append a new damage.
-        received_damage = deque([], maxlen=5)
-
-        self.history = Series(data=np.array([received_damage, 0]),
-                              index=["damage", "stage"])
+        self._history = np.empty(2, dtype=object)
+        self._history[:] = [deque([], maxlen=5), 0]
 
         # ------------------ Moves Initialization -------------------- #
 
         # A Pokemon defaults to learn the last 4 learnable moves at its
-        # current level.
-        condition = ((tb.pokemon_moves["pokemon_id"] == self.id) &
-                     (tb.pokemon_moves.level < self.level + 1))
-
-        self._all_moves = tb.pokemon_moves[condition]["move_id"].values
+        # current level, and none if it has no learnset in the version
+        # group.
+        try:
+            self._all_moves = learnset_index().learnable(
+                self.id, tb.VERSION_GROUP_ID, self.level)
+        except KeyError:
+            self._all_moves = np.array([], dtype='int64')
 
         num_of_moves = np.clip(a=4,
                                a_max=len(self._all_moves),
@@ -781,39 +919,95 @@ class Pokemon():
     def __repr__(self):
         return self.name
 
+    def clone(self):
+        """A copy of the pokemon, e.g. to play the same battle again.
+
+        The data of the species and of the moves, the IVs, EVs and the
+        nature are shared with ``self``. The battle state (hp, stages,
+        status, PP, flags and history) is copied, so that the clone
+        battles on its own. The clone has the same ``unique_id``, and
+        no trainer.
+        """
+        new = _copy(self)
+        new._stage = self._stage.copy()
+        if self._current is not None:
+            new._current = self._current.copy()
+        new.status = self.status.clone()
+        new._history = self._history.copy()
+        new._history[0] = deque(self._history[0], maxlen=5)
+        new.moves = [m.clone() for m in self.moves]
+        new.flags = self.flags.copy()
+        new.trainer = None
+        return new
+
     def __eq__(self, other):
         """Assert equal between two pokemons.
         If they have the same individual values and they have the
         same name, then they are considered to be the same pokemon.
         """
-        if ((self.iv.values == other.iv.values).all()
+        if ((self._iv == other._iv).all()
             and (self.unique_id == other.unique_id)):
             return True
         else:
             return False
 
     @property
-    def stats(self):
-        """Stats determination.
+    def base(self):
+        """The base stats of the species."""
+        return Series(self._base, index=self._STAT_INDEX)
 
-        `inner` is common for both HP and other stats calculations.
+    @property
+    def iv(self):
+        """The individual values; see ``set_iv``."""
+        return Series(self._iv, index=self._STAT_INDEX)
+
+    @property
+    def ev(self):
+        """The effort values; see ``set_ev``."""
+        return Series(self._ev, index=self._STAT_INDEX)
+
+    @property
+    def stage(self):
+        """The stages of the in-battle stats, from -6 to +6 (0 to 4 for
+        ``critical``).
+        """
+        return Series(self._stage, index=self._CURRENT_INDEX)
+
+    @stage.setter
+    def stage(self, stage):
+        self._stage = np.array(stage, dtype='float64')
+
+    @property
+    def history(self):
+        """The damage received in the last 5 turns (the latest first),
+        and a stage.
         """
+        return Series(self._history, index=self._HISTORY_INDEX)
 
-        inner = (2. * self.base + self.iv + self.ev//4.) * self.level//100.
+    def _stat_values(self):
+        """Stats determination, as an array.
+
+        `inner` is common for both HP and other stats calculations.
+        """
+        inner = (2. * self._base + self._iv + self._ev//4.) * self.level//100.
 
         # For all the stats other than HP:
-        calculated_stats = np.floor(inner + 5.) * self.nature_modifier//1.
+        calculated_stats = (np.floor(inner + 5.)
+                            * tb.nature_modifiers[self.nature_id - 1] // 1.)
 
         # For HP:
-        calculated_stats.hp = np.floor(inner.hp) + self.level + 10.
+        calculated_stats[0] = np.floor(inner[0]) + self.level + 10.
 
         # Shedinja always has at most 1 HP.
         if self.name == 'shedinja':
-            calculated_stats.hp = 1.
+            calculated_stats[0] = 1.
 
-        # Reindex the stats dataframe to conform with the indices on
-        # the table.
-        return calculated_stats.reindex(self.STAT_NAMES)
+        return calculated_stats
+
+    @property
+    def stats(self):
+        """The stats, from the base stats, IVs, EVs, level and nature."""
+        return Series(self._stat_values(), index=self._STAT_INDEX)
 
     @property
     def stage_factor(self):
@@ -824,34 +1018,37 @@ class Pokemon():
                                * self.stage_facotr.values)
         except for 'hp', as hp's damage is a dummy var.
         """
-        stage_to_factor = {
-                       -6: 2./8., 6: 8./2.,
-                       -5: 2./7., 5: 7./2.,
-                       -4: 2./6., 4: 6./2.,
-                       -3: 2./5., 3: 5./2.,
-                       -2: 2./4., 2: 4./2.,
-                       -1: 2./3., 1: 3./2.,
-                       0: 1.
-                           }
-
-        factors = np.ones(len(self.CURRENT_STAT_NAMES))
-        for i, stage in enumerate(self.stage):
-            factors[i] *= stage_to_factor[stage]
-
-        return Series(index=self.CURRENT_STAT_NAMES, data=factors)
+        return Series(index=self._CURRENT_INDEX,
+                      data=self._stage_factors())
+
+    def _stage_factors(self):
+        # (2 + stage) / 2 for the positive stages, 2 / (2 - stage) for
+        # the negative ones; stages are capped at +6 and -6.
+        stage = np.clip(self._stage.astype(int), -6, 6)
+        return (2. + np.maximum(stage, 0)) / (2. - np.minimum(stage, 0))
 
     @property
     def current(self):
         """Calcuate the in-battle stats based on the pokemon's
         calcualted stats and its stage factors.
+
+        The same ``Series`` is returned every time, and its ``hp`` is
+        left untouched by the recalculation, so that the damage taken
+        through ``current.hp -= damage`` persists.
         """
         # Set the baseline
-        current = deque(self.stats.values)
-        current.extend([100., 100., 100.])
-        current = np.array(current)
-        current *= self.stage_factor.values
-        return Series(index=self.CURRENT_STAT_NAMES,
-                      data=np.floor(current))
+        current = np.full(len(self.CURRENT_STAT_NAMES), 100.)
+        current[:len(self.STAT_NAMES)] = self._stat_values()
+        current = np.floor(current * self._stage_factors())
+
+        if self._current is None:
+            self._current = current
+        else:
+            hp = self._current[0]
+            self._current[:] = current
+            self._current[0] = hp
+
+        return Series(self._current, index=self._CURRENT_INDEX)
 
     @property
     def item(self):
@@ -873,46 +1070,69 @@ class Pokemon():
         after changes made by leveling-up.
         """
         # Reset the stage should automatically reset the current stats.
-        self.stage = Series(index=self.CURRENT_STAT_NAMES,
-                            data=np.zeros(len(self.CURRENT_STAT_NAMES)))
+        self._stage = np.zeros(len(self.CURRENT_STAT_NAMES))
+        # Restore the hp as well.
+        self._current = None
+
+    def reset_for_battle(self):
+        """Restore the pokemon as it was before any battle, in place:
+        full hp, no stages, no status, full PP, no flags and no history.
+        """
+        self._stage[:] = 0.
+        # Some items raise the critical stage.
+        self.item = self._item
+
+        if self._current is not None:
+            self._current[0] = self._stat_values()[0]
+
+        self.status.clear()
+        for m in self.moves:
+            m.pp = m.max_pp
+
+        self.flags.clear()
+        self._history[0].clear()
+        self._history[1] = 0
+        self.order = 0
+
+        return self
 
     def set_nature(self, which_nature):
         """Set the nature given its id or name."""
-        if which_nature in list(tb.natures.identifier.values):
+        if which_nature in tb.nature_ids:
             # If given the nature's name
-            name = which_nature
-            id_ = tb.natures[tb.natures['identifier'] == name]['id'].values[0]
+            id_ = tb.nature_ids[which_nature]
 
-        elif which_nature in list(tb.natures.id.values):
+        elif which_nature in tb.nature_names:
             # If given the nature's id
             id_ = which_nature
-            name = tb.natures[tb.natures['id'] == id_]['identifier'].values[0]
-
-        else:
-            raise KeyError("{} is not a valid nature reference."
-                           "".format(which_nature))
 
-        nature_subset = tb.natures[tb.natures['id'] == id_]
+        elif (isinstance(which_nature, str)
+              and which_nature in name_index()):
+            id_ = name_index().resolve(which_nature, 'nature')
 
-        self.nature = Series(index=["id", "name"],
-                             data=[id_, name])
-
-        # The nature affects one's stats. The nature usually raises one
-        # stat by 1.1 and lowers another by 0.9.
-        decreased_stat = np.array([0. for x in range(6)])
-        increased_stat = np.array([0. for x in range(6)])
+        else:
+            raise KeyError("{} is not a valid nature reference.{}"
+                           "".format(which_nature,
+                                     did_you_mean(which_nature, 'nature')))
 
-        for x in range(1, 7):
+        self.nature_id = int(id_)
 
-            if x == nature_subset["decreased_stat_id"].values[0]:
-                decreased_stat[x-1] -= 0.1
+    @property
+    def nature(self):
+        """The id and the name of the nature."""
+        return Series(index=["id", "name"],
+                      data=[self.nature_id, tb.nature_names[self.nature_id]])
 
-            if x == nature_subset["increased_stat_id"].values[0]:
-                increased_stat[x-1] += 0.1
+    @property
+    def nature_modifier(self):
+        """The factors of the stats; the nature usually raises one stat
+        by 1.1 and lowers another by 0.9.
 
-        nature_modifier = (increased_stat + decreased_stat) + 1.
-        self.nature_modifier = Series(data=nature_modifier,
-                                      index=self.STAT_NAMES)
+        A copy of the row of ``tb.nature_modifiers``: changing it
+        changes neither the table nor the stats; use ``set_nature``.
+        """
+        return Series(data=tb.nature_modifiers[self.nature_id - 1].copy(),
+                      index=self._STAT_INDEX)
 
     def set_ev(self, iterable):
         """Assign ev's from the iterable.
@@ -922,8 +1142,8 @@ class Pokemon():
         if len(iterable) != 6:
             raise ValueError("The iterable must have a length of 6.")
 
-        for i in range(6):
-            self.ev[i] = iterable[i]
+        # A new array, as clones share the old one.
+        self._ev = np.array([iterable[i] for i in range(6)])
 
         return self.ev
 
@@ -935,17 +1155,29 @@ class Pokemon():
         if len(iterable) != 6:
             raise ValueError("The iterable must have a length of 6.")
 
-        for i in range(6):
-            self.iv[i] = iterable[i]
+        # A new array, as clones share the old one.
+        self._iv = np.array([iterable[i] for i in range(6)])
 
         return self.iv
 
 
 class Trainer():
     """Some awesome introductions.
+
+    Parameters
+    ----------
+    name : str, optional
+
+    num_of_pokemon : int, default 3
+        Size of the random party.
+
+    party : list of Pokemon, optional
+        The party, instead of a random one.
     """
 
-    def __init__(self, name=None, num_of_pokemon=3):
+    __slots__ = ('id', 'name', '_party', '__counter')
+
+    def __init__(self, name=None, num_of_pokemon=3, party=None):
 
         self.id = np.random.randint(0, 65535)
 
@@ -954,8 +1186,12 @@ class Trainer():
         else:
             self.name = str(self.id)
 
-        party = [Pokemon(x) for x in np.random.choice(a=np.arange(1, 494),
-                                                      size=num_of_pokemon)]
+        if party is None:
+            party = [Pokemon(x) for x in
+                     np.random.choice(a=np.arange(1, 494),
+                                      size=num_of_pokemon)]
+        else:
+            party = list(party)
 
         for pokemon in party:
             pokemon.trainer = self
@@ -990,6 +1226,25 @@ class Trainer():
     def __repr__(self):
         return self.name
 
+    def clone(self):
+        """A copy of the trainer, with a clone of every pokemon of the
+        party (see ``Pokemon.clone``).
+        """
+        new = _copy(self)
+        new._party = [p.clone() for p in self._party]
+        for pokemon in new._party:
+            pokemon.trainer = new
+        new._Trainer__counter = 0
+        return new
+
+    def reset_for_battle(self):
+        """Reset every pokemon of the party, in place."""
+        for pokemon in self._party:
+            pokemon.reset_for_battle()
+        self.__counter = 0
+
+        return self
+
     def party(self, slot=None):
         """
         Get the Pokemone names in the party if no slot is selected.
@@ -1007,3 +1262,50 @@ class Trainer():
         self._party[slot-1].trainer = self
 
         print("{} is added to slot {}.".format(pokemon.name, slot))
+
+
+class Pool():
+    """Instances of a prototype, ready for battle and reused.
+
+    ``acquire`` hands out an instance reset by ``reset_for_battle``;
+    ``release`` gives it back. New instances are clones of the
+    prototype, made only when all the others are in use, so a loop of
+    battles allocates its combatants once.
+
+    Parameters
+    ----------
+    prototype : Pokemon or Trainer
+
+    Usage
+    -----
+        >>> garchomps, shuckles = Pool(Pokemon(445)), Pool(Pokemon(213))
+        >>> for __ in range(10**6):
+        ...     with garchomps.borrow() as p1, shuckles.borrow() as p2:
+        ...         battle(p1, p2)
+    """
+
+    def __init__(self, prototype):
+
+        self.prototype = prototype
+        self._free = []
+        self.size = 0
+
+    def acquire(self):
+        """A reset instance."""
+        if self._free:
+            return self._free.pop().reset_for_battle()
+
+        self.size += 1
+        return self.prototype.clone().reset_for_battle()
+
+    def release(self, instance):
+        self._free.append(instance)
+
+    @contextmanager
+    def borrow(self):
+        """``acquire`` an instance, and ``release`` it afterwards."""
+        instance = self.acquire()
+        try:
+            yield instance
+        finally:
+            self.release(instance)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Binary replay logs of 1-on-1 battles.
+
+A log is a file of fixed-size ``RECORD``s, after the ``MAGIC`` bytes.
+``ReplayWriter`` buffers the records in memory and writes them a
+buffer at a time; ``Replay`` maps a log in memory, and re-executes any
+of its battles with ``algorithms.battle``, checking every record on
+the way.
+
+A battle is replayed from its random seed: the Pokémon are built again
+from the same seed, and then given the recorded nature, IVs, EVs, item
+and moves. This requires ``record`` (or the same steps: seed, build,
+battle) to have played the battle.
+
+Records
+-------
+Every record has a ``kind`` and an ``actor`` (the side, 0 or 1). The
+other fields depend on the kind:
+
+BATTLE
+    ``rng`` is the seed, ``turn`` is ``max_turns``.
+POKEMON
+    One per side, of the ``POKEMON_RECORD`` layout: the pokemon id, the
+    level, the nature id, the item id, the IVs and the EVs.
+MOVE
+    One per known move of a side, in order, in ``move_id``.
+ACTION
+    One per pokemon per turn. ``actor`` used ``move_id``; ``flags`` is
+    a combination of ``MOBILE``, ``HIT``, ``CRITICAL`` and
+    ``FAINTED`` (the target fainted). ``damage`` is the hp the target
+    lost (negative if it was healed), ``hp`` and ``user_hp`` the hp
+    left of the target and of the user, ``status`` and
+    ``user_status`` their non-volatile status ids, and ``rng`` the
+    number of 32-bit random words drawn since the battle began.
+END
+    ``actor`` is the winning side (2 for none), ``turn`` the number of
+    turns, ``hp`` and ``user_hp`` the hp left of sides 0 and 1, and
+    ``rng`` as in ACTION.
+
+Usage
+-----
+    >>> with ReplayWriter('/tmp/battles.replay') as log:
+    ...     for seed in range(1000):
+    ...         record(log, 'garchomp', {'pokemon': 'shuckle'}, seed)
+    >>> replay = Replay('/tmp/battles.replay')
+    >>> replay.actions(0)[['turn', 'actor', 'move_id', 'damage']]
+    >>> replay.replay(0)
+    Replayed(p1=..., p2=..., winner=0, turns=3)
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+import phanpy.core.algorithms as al
+import phanpy.core.objects as ob
+from phanpy.core.jobs import make_pokemon
+
+# Bump when the records change.
+FORMAT_VERSION = 2
+
+MAGIC = b'PHNPYRP' + bytes([FORMAT_VERSION])
+
+RECORD = np.dtype([('kind', 'u1'), ('actor', 'u1'), ('turn', 'u2'),
+                   ('move_id', 'u2'), ('flags', 'u1'), ('status', 'u1'),
+                   ('user_status', 'u1'), ('damage', 'i4'), ('hp', 'i4'),
+                   ('user_hp', 'i4'), ('rng', 'u4')])
+
+# The layout of the POKEMON records, of the same size as `RECORD`.
+POKEMON_RECORD = np.dtype({'names': ['kind', 'actor', 'level', 'pokemon_id',
+                                     'nature_id', 'item_id', 'iv', 'ev'],
+                           'formats': ['u1', 'u1', 'u2', 'u2', 'u1', 'u2',
+                                       ('u1', 6), ('u1', 6)],
+                           'offsets': [0, 1, 2, 4, 6, 7, 9, 15],
+                           'itemsize': RECORD.itemsize})
+
+# Kinds of records.
+BATTLE, POKEMON, MOVE, ACTION, END = range(5)
+
+# Flags of the ACTION records.
+MOBILE, HIT, CRITICAL, FAINTED = 1, 2, 4, 8
+
+# The `actor` of the END record of a draw.
+NO_WINNER = 2
+
+Replayed = namedtuple('Replayed', ['p1', 'p2', 'winner', 'turns'])
+
+
+def _row(record, dtype=RECORD):
+    """A ``RECORD`` of the values of ``record`` laid out as ``dtype``.
+    """
+    row = np.zeros(1, dtype=dtype)
+    row[0] = record
+    return row.view(RECORD)[0]
+
+
+def _ailment(f):
+    """The id of the non-volatile status of ``f``."""
+    ids = f.status.id[~f.status.volatile]
+    return int(ids[0]) if len(ids) else 0
+
+
+def _hp(p):
+    """The hp left of ``p``, without recalculating its ``current``
+    stats.
+    """
+    return p.current.hp if p._current is None else p._current[0]
+
+
+# MT19937, as `np.random` draws from it.
+N, M = 624, 397
+MATRIX_A, UPPER_MASK, LOWER_MASK = 0x9908b0df, 0x80000000, 0x7fffffff
+
+# The most twists of the random state looked for between two records.
+MAX_TWISTS = 1 << 10
+
+
+def _twist(key):
+    """The MT19937 key after its next ``N`` draws."""
+    mt = np.array(key, dtype='uint32')
+    # Each chunk only reads words all twisted or all not yet.
+    for lo, hi in ((0, N - M), (N - M, 2 * (N - M)), (2 * (N - M), N - 1),
+                   (N - 1, N)):
+        i = np.arange(lo, hi)
+        y = (mt[i] & UPPER_MASK) | (mt[(i + 1) % N] & LOWER_MASK)
+        mt[i] = (mt[(i + M) % N] ^ (y >> 1)
+                 ^ (y & 1) * np.uint32(MATRIX_A))
+    return mt
+
+
+class _Draws():
+    """Count the 32-bit words drawn from ``np.random`` since it was
+    created.
+    """
+
+    def __init__(self):
+        state = np.random.get_state(legacy=False)['state']
+        self._key, self._pos = state['key'], state['pos']
+        self.count = 0
+
+    def __call__(self):
+        """The count, up to now."""
+        state = np.random.get_state(legacy=False)['state']
+
+        # The key is twisted every `N` draws.
+        for __ in range(MAX_TWISTS):
+            if np.array_equal(self._key, state['key']):
+                break
+            self._key = _twist(self._key)
+            self.count += N - self._pos
+            self._pos = 0
+        else:
+            raise ValueError("The random state was seeded again during "
+                             "the battle.")
+
+        self.count += state['pos'] - self._pos
+        self._pos = state['pos']
+        return self.count
+
+
+class ReplayWriter():
+    """Append battles to a replay log.
+
+    ``begin`` starts a battle, ``battle(..., log=writer)`` records its
+    actions, and ``end`` closes it; ``record`` does all three.
+
+    Parameters
+    ----------
+    path : str
+        The log; created if it does not exist, appended to otherwise.
+
+    buffer_size : int, default 65536
+        Number of records kept in memory between two writes.
+    """
+
+    def __init__(self, path, buffer_size=1 << 16):
+
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            _check_magic(path)
+
+        self._buffer = np.zeros(buffer_size, dtype=RECORD)
+        self._n = 0
+        self._sides = None
+        self._draws = None
+
+    def _append(self, record, dtype=RECORD):
+        self._buffer[self._n] = _row(record, dtype)
+        self._n += 1
+        if self._n == len(self._buffer):
+            self.flush()
+
+    def begin(self, seed, p1, p2, max_turns=100):
+        """Record the start of a battle between ``p1`` and ``p2``."""
+        self._sides = (p1, p2)
+        self._draws = _Draws()
+        self._append((BATTLE, 0, max_turns, 0, 0, 0, 0, 0, 0, 0, seed))
+
+        for side, p in enumerate(self._sides):
+            for values in (p.iv.values, p.ev.values):
+                if ((values < 0) | (values > 255)).any():
+                    raise ValueError("{} do not fit in a byte."
+                                     "".format(list(values)))
+            self._append((POKEMON, side, p.level, p.id,
+                          int(p.nature['id']), int(p.item.id),
+                          p.iv.values, p.ev.values), POKEMON_RECORD)
+            for m in p.moves:
+                self._append((MOVE, side, 0, m.id, 0, 0, 0, 0, 0, 0, 0))
+
+    def action(self, turn, f, m, g, mobile, hit, hp, critical=False):
+        """Record that ``f`` used ``m`` against ``g``, whose hp was
+        ``hp`` before, landing a critical hit if ``critical``.
+        """
+        flags = (MOBILE * bool(mobile) | HIT * bool(hit)
+                 | CRITICAL * bool(critical) | FAINTED * (_hp(g) <= 0))
+
+        self._append((ACTION, int(f is self._sides[1]), turn, m.id, flags,
+                      _ailment(g), _ailment(f), hp - _hp(g), _hp(g),
+                      _hp(f), self._draws()))
+
+    def end(self, winner, turns):
+        """Record the outcome of the battle."""
+        p1, p2 = self._sides
+        side = (0 if winner is p1 else 1 if winner is p2 else NO_WINNER)
+        self._append((END, side, turns, 0, 0, 0, 0, 0, _hp(p1), _hp(p2),
+                      self._draws()))
+        self._sides = None
+        self._draws = None
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        self._buffer[:self._n].tofile(self._file)
+        self._file.flush()
+        self._n = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def record(log, p1, p2, seed, max_turns=100):
+    """Play a battle between two pokemon specs, and record it in
+    ``log``.
+
+    Returns
+    -------
+    (winner, turns) : (Pokemon or None, int)
+        As ``algorithms.battle``.
+    """
+    np.random.seed(seed)
+    f1, f2 = make_pokemon(p1), make_pokemon(p2)
+
+    log.begin(seed, f1, f2, max_turns)
+    winner, turns = al.battle(f1, f2, max_turns, log=log)
+    log.end(winner, turns)
+
+    return winner, turns
+
+
+def _check_magic(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("{} is not a replay log of version {}."
+                             "".format(path, FORMAT_VERSION))
+
+
+class _Checker(ReplayWriter):
+    """A writer comparing its records with those of a log."""
+
+    def __init__(self, records):
+        self._records = records
+        self._n = 0
+        self._sides = None
+        self._draws = None
+
+    def _append(self, record, dtype=RECORD):
+        expected = self._records[self._n] if self._n < len(self._records) \
+            else None
+        got = _row(record, dtype)
+
+        if expected is None or expected.tobytes() != got.tobytes():
+            raise ValueError("The replay diverges at record {}: expected "
+                             "{}, got {}.".format(self._n, expected, got))
+        self._n += 1
+
+
+class Replay():
+    """A replay log, mapped in memory.
+
+    Attributes
+    ----------
+    records : numpy.memmap
+        All the records, of dtype ``RECORD``.
+    """
+
+    def __init__(self, path):
+
+        _check_magic(path)
+
+        if os.path.getsize(path) > len(MAGIC):
+            self.records = np.memmap(path, dtype=RECORD, mode='r',
+                                     offset=len(MAGIC))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+
+        starts = np.flatnonzero(self.records['kind'] == BATTLE)
+        self._ptr = np.append(starts, len(self.records))
+
+    def __len__(self):
+        return len(self._ptr) - 1
+
+    def battle(self, i):
+        """The records of the ``i``-th battle."""
+        if not -len(self) <= i < len(self):
+            raise IndexError("There are {} battles in the log."
+                             "".format(len(self)))
+        i %= len(self)
+        return self.records[self._ptr[i]:self._ptr[i + 1]]
+
+    def actions(self, i):
+        """The ACTION records of the ``i``-th battle."""
+        records = self.battle(i)
+        return records[records['kind'] == ACTION]
+
+    def outcome(self, i):
+        """The winning side (0, 1, or ``None``) and the number of turns
+        of the ``i``-th battle.
+        """
+        records = self.battle(i)
+        end = records[records['kind'] == END]
+        if not len(end):
+            raise ValueError("Battle {} was not finished.".format(i))
+
+        side = int(end['actor'][0])
+        return (None if side == NO_WINNER else side), int(end['turn'][0])
+
+    def replay(self, i):
+        """Play the ``i``-th battle again.
+
+        Raises a ``ValueError`` as soon as the battle differs from the
+        log.
+
+        Returns
+        -------
+        replayed : Replayed
+            The pokemon as they are at the end, the winning side (0, 1,
+            or ``None``) and the number of turns.
+        """
+        records = np.array(self.battle(i))
+        seed = int(records['rng'][0])
+        max_turns = int(records['turn'][0])
+
+        np.random.seed(seed)
+        sides = []
+        for r in records[records['kind'] == POKEMON].view(POKEMON_RECORD):
+            p = ob.Pokemon(int(r['pokemon_id']), int(r['level']))
+            p.set_nature(int(r['nature_id']))
+            p.set_iv([int(x) for x in r['iv']])
+            p.set_ev([int(x) for x in r['ev']])
+            p.item = ob.Item(int(r['item_id']))
+            p.moves = [ob.Move(int(m['move_id'])) for m in records
+                       if m['kind'] == MOVE and m['actor'] == r['actor']]
+            sides.append(p)
+        p1, p2 = sides
+
+        checker = _Checker(records)
+        checker.begin(seed, p1, p2, max_turns)
+        winner, turns = al.battle(p1, p2, max_turns, log=checker)
+        checker.end(winner, turns)
+
+        side = 0 if winner is p1 else 1 if winner is p2 else None
+        return Replayed(p1, p2, side, turns)
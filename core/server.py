@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""A long-running local server for the jobs in ``core.jobs``.
+
+The server imports the tables once and keeps them warm. It speaks
+JSON lines over a Unix socket (or a localhost TCP port): every line
+sent by a client is a job, and every line sent back is the result of
+the job on the same position, so that clients can pipeline as many
+jobs as they like. Jobs of the kinds in ``POOLED`` (battle
+simulations and damage samples) are run in a process pool, whose
+workers are reseeded; the cheap ones run in the event loop itself.
+
+Usage
+-----
+    $ python interface.py serve --socket /tmp/phanpy.sock
+
+    >>> client = Client('/tmp/phanpy.sock')
+    >>> client.request({'kind': 'lookup', 'table': 'moves',
+    ...                 'key': 'snatch'})
+    {'id': None, 'kind': 'lookup', 'result': {...}}
+
+``LocalClient`` has the same interface but runs the jobs in the
+calling process, without any socket.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import phanpy.core.jobs as jobs
+import phanpy.core.shared as shared
+
+# Job kinds that are sent to the process pool.
+POOLED = ('simulate', 'damage')
+
+
+def _init_worker(handle=None):
+    """Reseed the global random state of a worker, and attach it to the
+    shared tables.
+
+    Forked workers start with the random state of the server, and would
+    all draw the same numbers.
+    """
+    seed = np.random.SeedSequence(None, spawn_key=(os.getpid(),))
+    np.random.seed(seed.generate_state(1))
+
+    if handle is not None:
+        shared.attach(handle)
+
+
+class Server():
+    """Serve ``core.jobs`` over a Unix socket or a localhost port.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the Unix socket to listen on.
+
+    host, port : str and int, optional
+        Listen on TCP instead when ``path`` is not given.
+
+    workers : int, optional
+        Size of the process pool. Defaults to the number of CPUs. With
+        0 workers every job runs in the event loop.
+
+    share_tables : bool, default True
+        Publish the tables with ``core.shared`` so that the workers
+        attach to a single copy.
+    """
+
+    def __init__(self, path=None, host='127.0.0.1', port=None,
+                 workers=None, share_tables=True):
+
+        if path is None and port is None:
+            raise ValueError("Either `path` or `port` has to be given.")
+
+        self.path = path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.share_tables = share_tables
+
+        self.pool = None
+        self._handle = None
+        self._server = None
+        self._clients = set()
+
+    async def start(self):
+        """Start the process pool and listen for connections."""
+
+        if self.workers != 0:
+            if self.share_tables:
+                self._handle = shared.publish()
+
+            # Forked workers inherit the already imported tables.
+            context = multiprocessing.get_context('fork')
+            self.pool = ProcessPoolExecutor(self.workers, context,
+                                            _init_worker, (self._handle,))
+
+        if self.path:
+            listen = asyncio.start_unix_server(self._handle_client,
+                                               self.path)
+        else:
+            listen = asyncio.start_server(self._handle_client,
+                                          self.host, self.port)
+
+        self._server = await listen
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening, and shut the process pool down."""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        for task in self._clients:
+            task.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+        if self.pool is not None:
+            self.pool.shutdown()
+
+        if self._handle is not None:
+            shared.release(self._handle)
+
+    async def submit(self, job):
+        """Run a job, in the process pool if it is expensive."""
+
+        if job.get('kind') == 'ping':
+            return {'id': job.get('id'), 'kind': 'ping', 'result': 'pong'}
+
+        if self.pool is not None and job.get('kind') in POOLED:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, jobs.run, job)
+
+        return jobs.run(job)
+
+    async def _handle_client(self, reader, writer):
+        """Read jobs line by line; answer them in the same order."""
+
+        self._clients.add(asyncio.current_task())
+        pending = asyncio.Queue()
+
+        async def respond():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                line = jobs.dumps(await task) + '\n'
+                writer.write(line.encode('utf-8'))
+                await writer.drain()
+
+        responder = asyncio.ensure_future(respond())
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    job = json.loads(line)
+                except ValueError as e:
+                    job = {'kind': None,
+                           'error': "Invalid JSON: {}".format(e)}
+                else:
+                    if not isinstance(job, dict):
+                        job = {'kind': None, 'error': jobs.not_a_job(job)}
+
+                if 'error' in job:
+                    task = asyncio.get_running_loop().create_future()
+                    task.set_result(job)
+                else:
+                    task = asyncio.ensure_future(self.submit(job))
+
+                await pending.put(task)
+
+            await pending.put(None)
+            await responder
+
+        finally:
+            responder.cancel()
+            writer.close()
+            self._clients.discard(asyncio.current_task())
+
+
+class Client():
+    """A blocking client for ``Server``.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the server's Unix socket.
+
+    host, port : str and int, optional
+        Address of the server when it listens on TCP.
+    """
+
+    def __init__(self, path=None, host='127.0.0.1', port=None):
+
+        if path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(path)
+        else:
+            self._socket = socket.create_connection((host, port))
+
+        self._file = self._socket.makefile('rw', encoding='utf-8')
+
+    def request(self, job):
+        """Send one job and wait for its result."""
+        return self.requests([job])[0]
+
+    def requests(self, batch):
+        """Send all jobs in ``batch`` at once, then collect the results
+        in order.
+        """
+        batch = list(batch)
+        for job in batch:
+            self._file.write(json.dumps(job) + '\n')
+        self._file.flush()
+        return [json.loads(self._file.readline()) for __ in batch]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalClient():
+    """A stand-in for ``Client`` that runs the jobs in this process."""
+
+    def request(self, job):
+        return self.requests([job])[0]
+
+    def requests(self, batch):
+        # A round trip through JSON, exactly like the real client.
+        return [json.loads(jobs.dumps(jobs.run(job))) for job in batch]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+async def _serve(server):
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def serve(path=None, host='127.0.0.1', port=None, workers=None):
+    """Run a ``Server`` until interrupted."""
+    try:
+        asyncio.run(_serve(Server(path, host, port, workers)))
+    except KeyboardInterrupt:
+        pass
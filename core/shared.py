@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Share the numeric columns of ``core.tables`` between processes.
+
+Forked workers start out sharing the parent's tables, but pandas and
+the garbage collector touch every page sooner or later, after which
+each worker holds its own copy. This module copies the numeric columns
+of the heavy tables into a single ``multiprocessing.shared_memory``
+segment (or a memory-mapped file) once, and lets every worker rebind
+``core.tables`` to read-only views of that segment.
+
+Usage
+-----
+    >>> import phanpy.core.shared as shared
+    >>> handle = shared.publish()
+    >>> with multiprocessing.Pool(32, initializer=shared.attach,
+    ...                           initargs=(handle,)) as pool:
+    ...     pool.map(simulate, jobs)
+    >>> shared.release(handle)
+
+Only numeric columns (and the row index) live in the shared segment.
+Text columns such as ``identifier`` are taken from the worker's own
+copy of the table, so the worker must have loaded the same version of
+``core.tables`` as the parent, which is always the case after a fork.
+"""
+
+import os
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+from pandas import DataFrame, Index
+
+import phanpy.core.tables as tb
+
+# The tables read on the hot paths of ``core.objects`` and
+# ``core.algorithms``.
+SHARED_TABLES = ('moves', 'move_meta', 'move_meta_stat_changes',
+                 'move_flag_map', 'pokemon', 'pokemon_abilities',
+                 'pokemon_moves', 'pokemon_species', 'pokemon_stats',
+                 'pokemon_types', 'type_efficacy', 'natures')
+
+# Every block starts on a 64-byte boundary.
+ALIGNMENT = 64
+
+Block = namedtuple('Block', ['table', 'columns', 'dtype', 'shape', 'offset'])
+SharedTables = namedtuple('SharedTables', ['name', 'path', 'size', 'layout'])
+
+# Segments created by this process. They have to stay referenced for
+# as long as the workers use them.
+_segments = {}
+
+
+def _blocks(table_name, table):
+    """Yield ``(columns, array)`` pairs to be copied for one table.
+
+    ``columns`` is ``None`` for a bare ``numpy.ndarray`` table, and
+    ``'__index__'`` for the row index of a ``DataFrame``.
+    """
+    if isinstance(table, np.ndarray):
+        yield None, np.ascontiguousarray(table)
+        return
+
+    yield '__index__', np.asarray(table.index, dtype='int64')
+
+    numeric = table.select_dtypes(include='number')
+    for dtype in sorted(set(numeric.dtypes), key=str):
+        columns = [c for c in numeric.columns if numeric[c].dtype == dtype]
+        # Columns are stored as rows so that each column is contiguous.
+        yield tuple(columns), np.ascontiguousarray(numeric[columns].values.T)
+
+
+def publish(tables=SHARED_TABLES, path=None):
+    """Copy the numeric columns of ``tables`` into shared memory.
+
+    Parameters
+    ----------
+    tables : iterable of str
+        Names of the tables in ``core.tables`` to be shared.
+
+    path : str, optional
+        If given, the data is written to a memory-mapped file at
+        ``path`` instead of a ``shared_memory`` segment. Useful when
+        the workers are not children of this process.
+
+    Returns
+    -------
+    handle : SharedTables
+        A picklable handle to be passed to ``attach(...)``.
+    """
+    pending = []
+    size = 0
+    for table_name in tables:
+        for columns, array in _blocks(table_name, getattr(tb, table_name)):
+            size += -size % ALIGNMENT
+            pending.append((Block(table_name, columns, array.dtype.str,
+                                  array.shape, size), array))
+            size += array.nbytes
+
+    size = max(size, 1)
+
+    if path:
+        buf = np.memmap(path, dtype='uint8', mode='w+', shape=(size,))
+        name = None
+    else:
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        _segments[segment.name] = segment
+        buf = segment.buf
+        name = segment.name
+
+    for block, array in pending:
+        view = np.ndarray(block.shape, dtype=block.dtype, buffer=buf,
+                          offset=block.offset)
+        view[...] = array
+
+    if path:
+        buf.flush()
+        del buf
+
+    return SharedTables(name, path, size, tuple(b for b, __ in pending))
+
+
+def attach(handle, target=tb):
+    """Rebind the tables in ``target`` to read-only shared views.
+
+    Parameters
+    ----------
+    handle : SharedTables
+        The handle returned by ``publish(...)``.
+
+    target : module or object, default ``core.tables``
+        Anything holding the tables as attributes. Text columns are
+        taken from the tables it currently holds.
+    """
+    if handle.path:
+        buf = np.memmap(handle.path, dtype='uint8', mode='r',
+                        shape=(handle.size,))
+    else:
+        segment = _segments.get(handle.name)
+        if segment is None:
+            segment = shared_memory.SharedMemory(name=handle.name)
+            _segments[handle.name] = segment
+        buf = segment.buf
+
+    tables = {}
+    for block in handle.layout:
+        view = np.ndarray(block.shape, dtype=block.dtype, buffer=buf,
+                          offset=block.offset)
+        view.flags.writeable = False
+        tables.setdefault(block.table, []).append((block.columns, view))
+
+    for table_name, blocks in tables.items():
+
+        if blocks[0][0] is None:
+            setattr(target, table_name, blocks[0][1])
+            continue
+
+        index = Index(blocks[0][1], copy=False)
+
+        local = getattr(target, table_name)
+        if len(local) != len(index):
+            raise ValueError("`{}` has {} rows locally but {} rows in the "
+                             "shared segment.".format(table_name, len(local),
+                                                      len(index)))
+
+        # Every column is a row of a shared view, and the text columns
+        # are those of the local table. A dict of arrays with copy=False
+        # keeps them as they are, in the column order of the original.
+        shared = {}
+        for columns, view in blocks[1:]:
+            shared.update(zip(columns, view))
+
+        data = {c: shared[c] if c in shared else local[c].values
+                for c in local.columns}
+        frame = DataFrame(data, index=index, columns=local.columns,
+                          copy=False)
+
+        for i, c in enumerate(local.columns):
+            if c in shared and not np.shares_memory(frame.iloc[:, i].values,
+                                                    shared[c]):
+                raise RuntimeError("pandas copied the shared column "
+                                   "{!r} of `{}`.".format(c, table_name))
+
+        setattr(target, table_name, frame)
+
+
+def release(handle):
+    """Free the shared segment (or file) behind ``handle``.
+
+    Should be called once by the publishing process, after all the
+    workers are done.
+    """
+    if handle.path:
+        if os.path.exists(handle.path):
+            os.remove(handle.path)
+        return
+
+    segment = _segments.pop(handle.name, None)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=handle.name)
+
+    try:
+        segment.close()
+    except BufferError:
+        # Views attached in this very process are still alive; the
+        # mapping goes away with them.
+        pass
+
+    segment.unlink()
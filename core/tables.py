@@ -7,17 +7,76 @@ Created on Sat Nov  4 17:20:44 2017
 """
 
 import os
+import tempfile
 from collections import namedtuple
-from functools import reduce
+from contextlib import contextmanager
+from functools import reduce, wraps
+
+import numpy as np
 from pandas import read_csv
 
 FILE_PATH = os.path.dirname(os.path.abspath(__file__))
 ROOT_PATH = FILE_PATH.replace('/core', '')
 CORE_PATH = ROOT_PATH + '/core'
 DATA_PATH = ROOT_PATH + '/data/csv/'
+# Indexes and matrices computed from the tables.
+CACHE_PATH = ROOT_PATH + '/data/cache/'
 
 path = DATA_PATH
 
+# English, the language of the names and texts by default.
+LANGUAGE_ID = 9
+
+
+def read_table(name):
+    """Read ``DATA_PATH + name + '.csv'``."""
+    with open(DATA_PATH + name + '.csv') as csv_file:
+        return read_csv(csv_file)
+
+
+def once(build):
+    """Decorate a function without arguments, so that it is only run on
+    the first call and returns the same object ever after.
+
+    Usage
+    -----
+    >>> @once
+    ... def move_index():
+    ...     return MoveIndex()
+
+    """
+    built = []
+
+    @wraps(build)
+    def get():
+        if not built:
+            built.append(build())
+        return built[0]
+
+    return get
+
+
+@contextmanager
+def write_atomically(file_name, mode='wb'):
+    """Open a file aside ``file_name`` and rename it into place when the
+    block ends, so that readers (and other writers) never see half a file.
+
+    Usage
+    -----
+    >>> with write_atomically(CACHE_PATH + 'x.npy') as f:
+    ...     np.save(f, np.arange(3))
+
+    """
+    directory = os.path.dirname(file_name) or '.'
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp, file_name)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
 # ---------------------- Version Related Files ----------------------- #
 def which_version(identifier=None,
                   VERSION_GROUP_ID=None,
@@ -133,6 +192,34 @@ def which_version(identifier=None,
 
 VERSION_GROUP_ID, REGION_ID, VERSION_ID = which_version('platinum')
 
+with open(path + 'version_groups.csv') as csv_file:
+    version_groups = read_csv(csv_file, index_col='id')
+
+_generations = dict(zip(version_groups.index,
+                        version_groups['generation_id']))
+
+
+def which_generation(version_group_id=None):
+    """Returns the generation of a version group, ``VERSION_GROUP_ID``
+    by default.
+
+    It is not always ``REGION_ID``: the remakes are set in the region
+    of the games they remake.
+
+    Usage
+    -----
+    >>> which_generation(16)  # omega-ruby-alpha-sapphire, in Hoenn.
+    6
+    """
+    if version_group_id is None:
+        version_group_id = VERSION_GROUP_ID
+
+    try:
+        return int(_generations[int(version_group_id)])
+    except KeyError:
+        raise KeyError("Incorrect version group id: {}."
+                       "".format(version_group_id))
+
 
 # ------------------------- All Other Files -------------------------- #
 
@@ -163,9 +250,6 @@ with open(path + 'moves.csv') as csv_file:
 with open(path + 'move_effect_prose.csv') as csv_file:
     move_effect_prose = read_csv(csv_file)
 
-with open(path + 'move_flavor_text.csv') as csv_file:
-    move_flavor_text = read_csv(csv_file)
-
 with open(path + 'move_meta.csv') as csv_file:
     move_meta = read_csv(csv_file)
 
@@ -218,6 +302,21 @@ with open(custom_path + 'move_natural_gift.csv') as csv_file:
     move_natural_gift = read_csv(csv_file)
 
 
+# Large tables that are only read when first used. Single rows are
+# better read with `core.flavor`.
+LAZY_TABLES = ('move_flavor_text',)
+
+
+def __getattr__(name):
+    if name in LAZY_TABLES:
+        table = read_table(name)
+        globals()[name] = table
+        return table
+
+    raise AttributeError("module {!r} has no attribute {!r}"
+                         "".format(__name__, name))
+
+
 # ------------------------- Table Conversion ------------------------- #
 
 def which_ability(query):
@@ -279,3 +378,24 @@ def efficacy(atk_type, tar_types):
     __efficacies = map(lambda x: type_efficacy[atk_type-1, x-1], tar_types)
 
     return reduce(lambda x, y: x * y, __efficacies)
+
+
+# Stat modifiers of the natures: ``nature_modifiers[nature_id - 1]``
+# are the factors of hp, attack, defense, special-attack,
+# special-defense and speed. A nature raises one stat by 10% and
+# lowers another by 10%, or leaves them all alone.
+def _nature_modifiers(natures):
+    rows = natures['id'].values - 1
+    increased = np.zeros((len(natures), 6))
+    decreased = np.zeros((len(natures), 6))
+    increased[rows, natures['increased_stat_id'].values - 1] = 0.1
+    decreased[rows, natures['decreased_stat_id'].values - 1] = -0.1
+
+    modifiers = (increased + decreased) + 1.
+    modifiers.flags.writeable = False
+    return modifiers
+
+
+nature_modifiers = _nature_modifiers(natures)
+nature_ids = dict(zip(natures['identifier'], natures['id']))
+nature_names = dict(zip(natures['id'], natures['identifier']))
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tournaments of trainers, played with ``algorithms.trainer_battle``.
+
+An entry is a name and a party of pokemon specs (see ``core.jobs``).
+``Tournament`` pairs the entries round after round, either all against
+all (``'round-robin'``) or by score (``'swiss'``), plays the battles of
+a round in a process pool, a batch of battles per task, and keeps an
+Elo rating and a ranking of the entries.
+
+Every battle has its own seed, derived from the tournament's seed, so
+the results do not depend on the number of workers. After every batch
+the results are saved to the ``checkpoint`` file, if any; a tournament
+started again with the same file skips the battles already played.
+
+Usage
+-----
+    >>> entries = [Entry('sand', ['garchomp', 'hippowdon']),
+    ...            Entry('rain', [{'pokemon': 'ludicolo', 'level': 60}]),
+    ...            Entry('sun', ['ninetales', 'venusaur'])]
+    >>> t = Tournament(entries, games=5, seed=0,
+    ...                checkpoint='/tmp/tournament.json')
+    >>> for row in t.run():
+    ...     print(row)
+    {'rank': 1, 'name': 'sand', 'points': 7.0, 'wins': 7, ...}
+"""
+
+import json
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import phanpy.core.algorithms as al
+import phanpy.core.objects as ob
+import phanpy.core.tables as tb
+from phanpy.core.jobs import make_pokemon
+
+FORMATS = ('round-robin', 'swiss')
+
+# Elo.
+INITIAL_RATING = 1500.
+K_FACTOR = 32.
+
+Entry = namedtuple('Entry', ['name', 'party'])
+
+# The outcome is 1 if `a` won, -1 if `b` won and 0 for a draw.
+Result = namedtuple('Result', ['round', 'a', 'b', 'game', 'outcome',
+                               'turns'])
+
+# Entries of the worker processes, see `_init`.
+_entries = None
+
+
+def round_robin(n):
+    """The rounds of a round robin between ``n`` entries.
+
+    Uses the circle method: every entry meets every other exactly once,
+    over ``n - 1`` rounds (``n`` if ``n`` is odd; one entry rests in
+    each round).
+
+    Returns
+    -------
+    rounds : list of list of (int, int)
+    """
+    players = list(range(n)) + ([None] if n % 2 else [])
+    half = len(players) // 2
+
+    rounds = []
+    for __ in range(len(players) - 1):
+        pairs = zip(players[:half], reversed(players[half:]))
+        rounds.append([(a, b) for a, b in pairs
+                       if a is not None and b is not None])
+        players = [players[0], players[-1]] + players[1:-1]
+
+    return rounds
+
+
+def swiss_pairings(points, played):
+    """Pair the entries with the closest points, avoiding rematches.
+
+    Parameters
+    ----------
+    points : array_like
+        Points of every entry.
+    played : set of (int, int)
+        Pairs that already met, with ``a < b``.
+
+    Returns
+    -------
+    pairs : list of (int, int)
+        The lowest ranked entry rests if their number is odd.
+    """
+    order = list(np.argsort(-np.asarray(points), kind='stable'))
+    pairs = []
+
+    while len(order) > 1:
+        a = order.pop(0)
+        # The next best entry not met yet, or the next best one.
+        b = next((b for b in order if (min(a, b), max(a, b)) not in played),
+                 order[0])
+        order.remove(b)
+        pairs.append((int(a), int(b)))
+
+    return pairs
+
+
+def make_trainer(entry):
+    """Instantiate the ``Trainer`` of an entry."""
+    party = [make_pokemon(spec) for spec in entry.party]
+    return ob.Trainer(entry.name, party=party)
+
+
+def _seed(seed, round_, a, b, game):
+    sequence = np.random.SeedSequence([seed, round_, a, b, game])
+    return int(sequence.generate_state(1)[0])
+
+
+def _init(entries):
+    global _entries
+    _entries = entries
+
+
+def _play(batch):
+    """Play a batch of (round, a, b, game, seed) battles."""
+    results = []
+
+    for round_, a, b, game, seed in batch:
+        np.random.seed(seed)
+        t1, t2 = make_trainer(_entries[a]), make_trainer(_entries[b])
+        winner, turns = al.trainer_battle(t1, t2)
+
+        outcome = 1 if winner is t1 else -1 if winner is t2 else 0
+        results.append(Result(round_, a, b, game, outcome, turns))
+
+    return results
+
+
+class Tournament():
+    """A tournament between ``entries``.
+
+    Parameters
+    ----------
+    entries : list of Entry
+
+    format : str, default 'round-robin'
+        One of ``FORMATS``.
+
+    rounds : int, optional
+        Number of rounds. Defaults to a full round robin, or to
+        ``ceil(log2(len(entries)))`` Swiss rounds.
+
+    games : int, default 1
+        Battles per pairing.
+
+    workers : int, optional
+        Size of the process pool. Defaults to the number of CPUs; with
+        0 workers the battles are played in this process.
+
+    batch_size : int, optional
+        Battles sent to a worker at once. Defaults to a quarter of a
+        round's battles per worker.
+
+    checkpoint : str, optional
+        Path of a JSON file to save the results to and resume from.
+
+    seed : int, default 0
+    """
+
+    def __init__(self, entries, format='round-robin', rounds=None, games=1,
+                 workers=None, batch_size=None, checkpoint=None, seed=0):
+
+        if format not in FORMATS:
+            raise ValueError("`format` should be one of {}.".format(FORMATS))
+
+        self.entries = [Entry(*entry) for entry in entries]
+        self.format = format
+        self.games = games
+        self.workers = workers
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.seed = seed
+
+        n = len(self.entries)
+        if rounds is None:
+            rounds = (len(round_robin(n)) if format == 'round-robin'
+                      else max(1, int(np.ceil(np.log2(n)))))
+        self.rounds = rounds
+
+        self.results = []
+        if checkpoint and os.path.exists(checkpoint):
+            self._load()
+
+    def _load(self):
+        with open(self.checkpoint) as f:
+            saved = json.load(f)
+
+        if (saved['entries'] != [e.name for e in self.entries]
+                or saved['format'] != self.format
+                or saved['seed'] != self.seed):
+            raise ValueError("{} is the checkpoint of another tournament."
+                             "".format(self.checkpoint))
+
+        self.results = [Result(*r) for r in saved['results']]
+
+    def _save(self):
+        saved = {'entries': [e.name for e in self.entries],
+                 'format': self.format,
+                 'seed': self.seed,
+                 'results': [list(r) for r in self.results]}
+
+        with tb.write_atomically(self.checkpoint, 'w') as f:
+            json.dump(saved, f)
+
+    def pairings(self, round_):
+        """The pairs of entries of round ``round_`` (from 0)."""
+        if self.format == 'round-robin':
+            schedule = round_robin(len(self.entries))
+            return schedule[round_ % len(schedule)]
+
+        played = {(min(r.a, r.b), max(r.a, r.b)) for r in self.results
+                  if r.round < round_}
+        points = self.points([r for r in self.results if r.round < round_])
+        return swiss_pairings(points, played)
+
+    def run(self):
+        """Play the rounds not played yet, and return the standings."""
+        pool = None
+        if self.workers != 0:
+            context = multiprocessing.get_context('fork')
+            pool = ProcessPoolExecutor(self.workers, context, _init,
+                                       (self.entries,))
+
+        try:
+            for round_ in range(self.rounds):
+                self._play_round(round_, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return self.standings()
+
+    def _play_round(self, round_, pool):
+        done = {(r.round, r.a, r.b, r.game) for r in self.results}
+
+        battles = [(round_, a, b, game, _seed(self.seed, round_, a, b, game))
+                   for a, b in self.pairings(round_)
+                   for game in range(self.games)
+                   if (round_, a, b, game) not in done]
+
+        if not battles:
+            return
+
+        workers = self.workers or os.cpu_count()
+        size = self.batch_size or max(1, len(battles) // (4 * workers))
+        batches = [battles[i:i + size] for i in range(0, len(battles), size)]
+
+        if pool is None:
+            _init(self.entries)
+            played = map(_play, batches)
+        else:
+            played = pool.map(_play, batches)
+
+        for results in played:
+            self.results.extend(results)
+            if self.checkpoint:
+                self._save()
+
+    def _sorted_results(self):
+        return sorted(self.results, key=lambda r: (r.round, r.a, r.b,
+                                                   r.game))
+
+    def points(self, results=None):
+        """Points of every entry: 1 per win, 0.5 per draw."""
+        results = self.results if results is None else results
+        points = np.zeros(len(self.entries))
+
+        for r in results:
+            points[r.a] += (1 + r.outcome) / 2.
+            points[r.b] += (1 - r.outcome) / 2.
+
+        return points
+
+    def ratings(self):
+        """Elo ratings, updated battle after battle in a fixed order."""
+        ratings = np.full(len(self.entries), INITIAL_RATING)
+
+        for r in self._sorted_results():
+            expected = 1. / (1 + 10 ** ((ratings[r.b] - ratings[r.a]) / 400))
+            change = K_FACTOR * ((1 + r.outcome) / 2. - expected)
+            ratings[r.a] += change
+            ratings[r.b] -= change
+
+        return ratings
+
+    def standings(self):
+        """The ranking of the entries, by points and then by rating.
+
+        Returns
+        -------
+        standings : list of dict
+        """
+        points = self.points()
+        ratings = self.ratings()
+
+        wins = np.zeros(len(self.entries), dtype=int)
+        losses = np.zeros(len(self.entries), dtype=int)
+        for r in self.results:
+            if r.outcome:
+                winner, loser = (r.a, r.b) if r.outcome > 0 else (r.b, r.a)
+                wins[winner] += 1
+                losses[loser] += 1
+
+        played = np.zeros(len(self.entries), dtype=int)
+        for r in self.results:
+            played[[r.a, r.b]] += 1
+
+        order = np.lexsort((-ratings, -points))
+
+        return [{'rank': rank, 'name': self.entries[i].name,
+                 'points': float(points[i]), 'wins': int(wins[i]),
+                 'losses': int(losses[i]),
+                 'draws': int(played[i] - wins[i] - losses[i]),
+                 'elo': round(float(ratings[i]), 1)}
+                for rank, i in enumerate(order, 1)]
@@ -4,8 +4,22 @@
 
 Currently only support 1-on-1 battle, and the Pokémons are limited
 to Generation 3 & 4.
+
+Run without arguments for the interactive mode. The subcommands run
+calculations non-interactively and print one JSON object per line:
+
+    $ python interface.py simulate garchomp shuckle -n 100
+    $ python interface.py damage garchomp shuckle earthquake
+    $ python interface.py learnset phanpy --level 30
+    $ python interface.py lookup moves snatch
+    $ python interface.py run jobs.jsonl
+    $ python interface.py serve --socket /tmp/phanpy.sock
+
+See ``core/jobs.py`` for the format of a job file, and ``core/server.py``
+for the server.
 """
 
+import argparse
 from os import sys, path
 file_path = path.dirname(path.abspath(__file__))
 root_path = file_path.replace('/phanpy', '')
@@ -16,6 +30,9 @@ import numpy as np
 import phanpy.core.objects as ob
 import phanpy.core.tables as tb
 import phanpy.core.algorithms as al
+import phanpy.core.jobs as jobs
+import phanpy.core.learnsets as ls
+from phanpy.core.names import did_you_mean
 
 
 def safe_input(msg, options=['y', 'n'], default=None):
@@ -130,10 +147,11 @@ def config():
                     continue
 
             except KeyError:
-                which_pokemon = input("Oops! '{}' is not a valid Pokémon.\n"
+                hint = did_you_mean(which_pokemon, 'pokemon')
+                which_pokemon = input("Oops! '{}' is not a valid Pokémon.{}\n"
                                       "Choose again (remember, you can enter"
                                       " either the id or the name, but it "
-                                      "has to be valid.\n>>> ".format(which_pokemon))
+                                      "has to be valid.\n>>> ".format(which_pokemon, hint))
                 continue
 
             break  # If a Pokémon is successfully instantiated, break out of the loop.
@@ -153,18 +171,9 @@ def config():
         print(template.format("ID", "Move Name", "Power", "PP", "Effect"))
         print("{0:-^5}|{0:-^15}|{0:-^6}|{0:-^6}|{0:-^40}".format(""))
 
-        mep = tb.move_effect_prose
-        for i in set(sorted(user._all_moves)):
-            # Print all learnable moves.
-
-            m = ob.Move(i)
-
-            condition = mep["move_effect_id"] == m.effect_id
-            effect_prose = mep[condition]["short_effect"].values[0]
-            effect_prose = effect_prose[:40]
-
-            print("{0.id:^5}|{0.name:^15}|{0.power:^6}|{0.pp:^6}|"
-                  "{1:<40}".format(m, effect_prose))
+        # Print all learnable moves.
+        learnable = ls.learnable_moves(user.id, user.level)
+        print(ls.render(learnable))
 
         # ordinal(n) converts a number to its ordinal form.
         # i.e. ordinal(1) == '1st', ordinal(2) == '2nd', etc.
@@ -174,7 +183,7 @@ def config():
 
         for i in range(1, 5):
             # Set moves.
-            options = list(map(str, user._all_moves))
+            options = list(map(str, learnable['move_id']))
             move_id = safe_input("Set the {0} move: "
                                  "".format(ordinal(i)), options)
 
@@ -191,7 +200,89 @@ def config():
         for i in range(4):
             user.moves[i] = ob.Move(move_list[i])
 
-config()
+
+def parse_args(argv=None):
+    """Parse the command line arguments of the non-interactive mode."""
+
+    parser = argparse.ArgumentParser(
+                description="Pokémon battle calculations. Run without a "
+                            "command for the interactive mode.")
+    commands = parser.add_subparsers(dest='command')
+
+    simulate = commands.add_parser('simulate', help="simulate battles")
+    simulate.add_argument('p1', help="id or name of the first Pokémon")
+    simulate.add_argument('p2', help="id or name of the second Pokémon")
+    simulate.add_argument('-n', type=int, default=1,
+                          help="number of battles")
+    simulate.add_argument('--max-turns', type=int, default=100)
+
+    damage = commands.add_parser('damage', help="sample a move's damage")
+    damage.add_argument('attacker')
+    damage.add_argument('defender')
+    damage.add_argument('move', help="id or name of the attacker's move")
+    damage.add_argument('-n', type=int, default=100,
+                        help="number of samples")
+
+    learnset = commands.add_parser('learnset',
+                                   help="list the learnable moves")
+    learnset.add_argument('pokemon')
+    learnset.add_argument('--level', type=int, default=None)
+    learnset.add_argument('--version-group', dest='version_group_id',
+                          type=int, default=None)
+
+    lookup = commands.add_parser('lookup', help="look up a table row")
+    lookup.add_argument('table', choices=jobs.LOOKUP_TABLES)
+    lookup.add_argument('key', help="an id or an identifier")
+
+    run = commands.add_parser('run', help="run the jobs in a JSON or "
+                                          "JSON lines file")
+    run.add_argument('file', help="path to the job file; '-' for stdin")
+
+    serve = commands.add_parser('serve', help="keep the tables warm and "
+                                              "serve jobs on a local socket")
+    address = serve.add_mutually_exclusive_group(required=True)
+    address.add_argument('--socket', help="path of the Unix socket")
+    address.add_argument('--port', type=int,
+                         help="listen on this localhost port instead")
+    serve.add_argument('--workers', type=int, default=None,
+                       help="size of the simulation process pool")
+
+    for command in [simulate, damage, learnset, lookup]:
+        command.add_argument('--seed', type=int, default=None)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point of both the interactive and the batch mode."""
+
+    args = parse_args(argv)
+
+    if args.command is None:
+        config()
+        return
+
+    if args.command == 'serve':
+        from phanpy.core.server import serve
+        serve(path=args.socket, port=args.port, workers=args.workers)
+        return
+
+    if args.command == 'run':
+        if args.file == '-':
+            stream = sys.stdin
+        else:
+            stream = open(args.file)
+
+        with stream:
+            for result in jobs.run_all(jobs.read_jobs(stream)):
+                print(jobs.dumps(result), flush=True)
+        return
+
+    job = {k: v for k, v in vars(args).items()
+           if v is not None and k != 'command'}
+    job['kind'] = args.command
+
+    print(jobs.dumps(jobs.run(job)), flush=True)
 
 
 # This is a script I copied from the original 'main.py'
@@ -269,3 +360,7 @@ def test(n, d=True):
 
 
 # test(10, False)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@
 
 import pytest
 import os, sys
+import numpy as np
 
 file_path = os.path.dirname(os.path.abspath(__file__))
 root_path = file_path.replace('/phanpy/tests', '')
@@ -10,7 +11,11 @@ sys.path.append(root_path) if root_path not in sys.path else None
 
 from phanpy.core.objects import Item, Move, Pokemon, Status
 from phanpy.core.tables import which_ability
-from phanpy.core.algorithms import attacking_order
+import phanpy.core.tables as tb
+from phanpy.core.algorithms import (attacking_order, is_mobile,
+                                    calculate_damage, ailment_inflictor,
+                                    status_damage, effect, battle,
+                                    battle_events, metronome, metronome_pool)
 
 
 class TestAttackingOrder():
@@ -143,3 +148,171 @@ class TestAttackingOrder():
 
         assert p1 == f1
         assert p2 == f2
+
+
+@pytest.fixture(scope='function')
+def setUpPokemon():
+    np.random.seed(0)
+    yield Pokemon('garchomp'), Pokemon('rhydon')
+
+
+class TestIsMobile():
+
+    def test_confused_pokemon_can_hurt_itself(self, setUpPokemon):
+        f, __ = setUpPokemon
+        f.status += Status('confusion', 5)
+        hp = f.current.hp
+        results = [is_mobile(f, Move('tackle')) for __ in range(20)]
+        assert not all(results)
+        assert f.current.hp < hp
+
+
+class TestCalculateDamage():
+
+    def test_regular_damage(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        assert calculate_damage(f1, Move('tackle'), f2, Move('tackle')) > 0
+
+    def test_beat_up_without_a_trainer(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        assert calculate_damage(f1, Move('beat-up'), f2,
+                                Move('tackle')) > 0
+        f1.status += Status('burn')
+        assert calculate_damage(f1, Move('beat-up'), f2,
+                                Move('tackle')) == 0
+
+    def test_counter_without_received_damage(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        f1.order = 2
+        for move in ['counter', 'mirror-coat', 'metal-burst']:
+            assert calculate_damage(f1, Move(move), f2,
+                                    Move('tackle')) == 0
+
+    def test_critical_outcome_is_returned(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        assert calculate_damage(f1, Move('dragon-rage'), f2, Move('tackle'),
+                                return_critical=True) == (40., False)
+        damage, critical_hit = calculate_damage(f1, Move('tackle'), f2,
+                                                Move('tackle'),
+                                                return_critical=True)
+        assert damage > 0 and critical_hit in (True, False)
+        assert 'critical' not in f1.flags
+
+    def test_sure_critical_hit_is_returned(self, setUpPokemon, monkeypatch):
+        f1, f2 = setUpPokemon
+        # From the third stage on, every hit of generation 6 is critical.
+        monkeypatch.setattr(tb, 'VERSION_GROUP_ID', 15)
+        f1.stage.critical = 3
+        assert calculate_damage(f1, Move('tackle'), f2, Move('tackle'),
+                                return_critical=True)[1]
+
+    def test_bide_is_a_status(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        assert calculate_damage(f1, Move('bide'), f2, Move('tackle')) == 0
+        assert 'bide' in f1.status
+
+
+class TestAilments():
+
+    def test_inflict_the_target(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        ailment_inflictor(f1, Move('zap-cannon'), f2, Move('tackle'))
+        assert 'paralysis' in f2.status
+        assert f2.status.duration[-1] == float('inf')
+
+    def test_status_moves_always_inflict(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        ailment_inflictor(f1, Move('thunder-wave'), f2, Move('tackle'))
+        assert 'paralysis' in f2.status
+
+    def test_rest(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        ailment_inflictor(f1, Move('rest'), f2, Move('tackle'))
+        assert f1.flags['rest']
+
+    def test_trap_damage_without_an_opponent(self, setUpPokemon):
+        f1, __ = setUpPokemon
+        f1.status += Status('trap', 3)
+        status_damage(f1)
+        assert f1.current.hp == f1.stats.hp - f1.stats.hp // 16
+
+
+class TestEffects():
+
+    def test_spite_lowers_the_pp_of_the_last_move(self, setUpPokemon):
+        f1, f2 = setUpPokemon
+        f2.moves[0] = Move('tackle')
+        pp = f2.moves[0].pp
+        f2.flags['last-successfully-used-move'] = f2.moves[0].id
+        effect(f1, Move('spite'), f2, f2.moves[0])
+        assert f2.moves[0].pp == pp - 4
+
+
+class TestBattleEvents():
+
+    def play(self, seed, events):
+        np.random.seed(seed)
+        p1, p2 = Pokemon('pikachu', 30), Pokemon('magikarp', 30)
+        if not events:
+            return p1, p2, battle(p1, p2), []
+
+        stream = battle_events(p1, p2)
+        seen = []
+        while True:
+            try:
+                seen.append(next(stream))
+            except StopIteration as stop:
+                return p1, p2, stop.value, seen
+
+    def test_same_battle_as_battle(self):
+        __, __, (winner, turns), __ = self.play(0, events=False)
+        p1, p2, (winner_, turns_), events = self.play(0, events=True)
+
+        assert turns == turns_
+        assert getattr(winner, 'name', None) == getattr(winner_, 'name',
+                                                        None)
+        assert events[-1].kind == 'end'
+        assert events[-1].pokemon is winner_
+        assert events[-1].value == turns_
+
+    def test_events_add_up(self):
+        p1, p2, (winner, turns), events = self.play(1, events=True)
+
+        kinds = {e.kind for e in events}
+        assert kinds <= {'move', 'miss', 'immobile', 'damage', 'status',
+                         'faint', 'end'}
+        assert all(0 < e.turn <= turns for e in events)
+
+        for p in (p1, p2):
+            lost = sum(e.value for e in events
+                       if e.kind == 'damage' and e.pokemon is p)
+            assert p.stats.hp - lost == p.current.hp
+
+        fainted = [e.pokemon for e in events if e.kind == 'faint']
+        assert all(p.current.hp <= 0 for p in fainted)
+        if winner is not None:
+            assert fainted == [p2 if winner is p1 else p1]
+
+
+class TestMetronome():
+
+    def test_pool_of_the_generation(self):
+        pool = metronome_pool()
+        assert (np.diff(pool) > 0).all()
+        assert Move('tackle').id in pool
+        assert Move('metronome').id not in pool
+        assert Move('protect').id not in pool
+        # 468, hone-claws, is from generation 5.
+        assert 468 not in pool and 468 in metronome_pool(11)
+        # red-blue
+        assert len(metronome_pool(1)) < len(pool)
+        assert metronome_pool() is pool
+
+    def test_known_moves_are_not_selected(self):
+        np.random.seed(0)
+        p = Pokemon('pikachu')
+        known = {m.id for m in p.moves}
+        pool = metronome_pool()
+        for __ in range(200):
+            move_id = metronome(p)
+            assert move_id in pool and move_id not in known
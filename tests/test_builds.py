@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import phanpy.core.tables as tb
+from phanpy.core.builds import (generate_random_pokemon, GENDERLESS,
+                                SHEDINJA)
+from phanpy.core.learnsets import learnset_index
+
+
+@pytest.fixture(scope='module')
+def setUpBuilds():
+    return generate_random_pokemon([445, 292, 81], level=[50, 30, 5],
+                                   n=2000, rng=0)
+
+
+def test_columns_have_one_row_per_pokemon(setUpBuilds):
+    b = setUpBuilds
+    assert len(b) == 6000
+    assert b.iv.shape == b.ev.shape == b.stats.shape == (6000, 6)
+    assert b.moves.shape == (6000, 4)
+    assert list(np.unique(b.pokemon_id)) == [81, 292, 445]
+    assert (b.level[:2000] == 50).all() and (b.level[-2000:] == 5).all()
+
+
+def test_same_distributions_as_pokemon(setUpBuilds):
+    b = setUpBuilds
+    assert b.iv.min() == 1 and b.iv.max() == 31
+    assert (b.ev.sum(axis=1) == 510).all() and b.ev.min() >= 0
+    assert set(np.unique(b.nature_id)) == set(range(1, 25))
+    # magnemite is genderless.
+    assert (b.gender[-2000:] == GENDERLESS).all()
+    assert set(b.gender[:2000]) == {1, 2}
+
+    pa = tb.pokemon_abilities
+    for pokemon_id in (81, 292, 445):
+        rows = b.pokemon_id == pokemon_id
+        allowed = pa[(pa.pokemon_id == pokemon_id) & (pa.is_hidden == 0)]
+        assert set(b.ability_id[rows]) == set(allowed.ability_id)
+
+
+def test_moves_are_distinct_and_learnable(setUpBuilds):
+    b = setUpBuilds
+    index = learnset_index()
+    for i in range(0, len(b), 97):
+        moves = b.moves[i][b.moves[i] > 0]
+        learnable = index.learnable(b.pokemon_id[i], level=b.level[i])
+        assert len(moves) == min(4, len(learnable))
+        assert len(set(moves)) == len(moves)
+        assert set(moves) <= set(learnable)
+
+
+def test_no_learnset_in_the_version_group():
+    # garchomp is not in red and blue (version group 1).
+    b = generate_random_pokemon([445], level=50, n=10, rng=0,
+                                version_group_id=1)
+    assert (b.moves == 0).all()
+
+
+def test_stats_match_pokemon(setUpBuilds):
+    b = setUpBuilds
+    assert (b.stats[b.pokemon_id == SHEDINJA, 0] == 1).all()
+    for i in (0, 2500, 5999):
+        p = b.pokemon(i)
+        assert list(p.stats.values) == list(b.stats[i])
+        assert [m.id for m in p.moves] == [m for m in b.moves[i] if m]
+
+
+def test_seeded_draws_repeat():
+    a = generate_random_pokemon(445, n=10, rng=1)
+    b = generate_random_pokemon(445, n=10, rng=np.random.default_rng(1))
+    for x, y in zip(a, b):
+        assert np.array_equal(x, y)
+
+
+def test_invalid_arguments():
+    with pytest.raises(KeyError):
+        generate_random_pokemon(99999)
+    with pytest.raises(ValueError):
+        generate_random_pokemon(445, level=101)
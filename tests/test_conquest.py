@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+from pandas import read_csv
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.conquest import conquest_index
+import phanpy.core.tables as tb
+
+
+@pytest.fixture(scope='module')
+def setUpIndex():
+    return conquest_index()
+
+
+def test_max_link_matches_the_table(setUpIndex):
+    links = read_csv(tb.DATA_PATH + 'conquest_max_links.csv')
+    found = setUpIndex.link(links['warrior_rank_id'],
+                            links['pokemon_species_id'])
+    assert (found == links['max_link'].values).all()
+    assert setUpIndex.max_link.sum() == links['max_link'].sum()
+
+
+def test_ranks_of_a_warrior(setUpIndex):
+    ranks = setUpIndex.ranks('oichi')
+    assert list(setUpIndex.rank_number[ranks]) == [1, 2]
+    assert (setUpIndex.rank_warrior[ranks] == 4).all()
+    with pytest.raises(KeyError):
+        setUpIndex.ranks('not-a-warrior')
+
+
+def test_best_warriors(setUpIndex):
+    species = [4, 25, 133]
+    rank_ids, links = setUpIndex.best_warriors(species)
+    assert (links == setUpIndex.max_link[:, species].max(axis=0)).all()
+    assert (setUpIndex.link(rank_ids, species) == links).all()
+
+
+def test_best_warriors_among_some_ranks(setUpIndex):
+    ranks = setUpIndex.ranks('oichi')
+    rank_ids, links = setUpIndex.best_warriors([133], rank_ids=ranks, k=2)
+    assert set(rank_ids[0]) == set(ranks)
+    assert links[0, 0] >= links[0, 1]
+
+
+def test_best_are_never_the_unused_id_0(setUpIndex):
+    # bulbasaur has no link with any warrior.
+    assert setUpIndex.max_link[:, 1].max() == 0
+    rank_ids, links = setUpIndex.best_warriors()
+    assert rank_ids.min() > 0
+    assert len(rank_ids) == setUpIndex.max_link.shape[1] - 1
+    assert setUpIndex.best_warriors([1])[0][0] > 0
+    species, __ = setUpIndex.best_species(k=3)
+    assert species.min() > 0
+
+
+def test_best_species(setUpIndex):
+    species, links = setUpIndex.best_species([1, 2], k=3)
+    assert species.shape == (2, 3)
+    assert (links[:, 0] == setUpIndex.max_link[[1, 2]].max(axis=1)).all()
+
+
+def test_specialties(setUpIndex):
+    # The player specializes in normal-type Pokémon.
+    assert setUpIndex.specializes(1, 1)
+    assert not setUpIndex.specializes(1, 2)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.coverage import (efficacy_matrix, species_types,
+                                  effectiveness, coverage,
+                                  best_attack_types, best_team)
+import phanpy.core.tables as tb
+
+
+def test_effectiveness_matches_tables_efficacy():
+    defenders = species_types([6, 213, 445])
+    factors = effectiveness([4, 11, 15], defenders)
+    for i, attack in enumerate([4, 11, 15]):
+        for j, pair in enumerate(defenders):
+            pair = [t for t in pair if t]
+            assert factors[i, j] == tb.efficacy(attack, pair)
+
+
+def test_species_types():
+    # charizard is fire/flying, and pikachu only electric.
+    assert species_types([6, 25]).tolist() == [[10, 3], [13, 0]]
+    # clefairy became fairy in generation 6.
+    assert species_types([35], 6).tolist() == [[18, 0]]
+    assert species_types([35], 5).tolist() == [[1, 0]]
+
+
+def test_efficacy_matrix_by_generation():
+    assert efficacy_matrix(5).shape == (18, 18)
+    matrix = efficacy_matrix(6)
+    fairy, dragon = 18, 16
+    assert matrix[dragon, fairy] == 0.
+    assert (matrix[:18, :18] == efficacy_matrix(5)).all()
+
+
+def test_best_attack_types_is_exhaustive():
+    defenders = species_types()
+    types, score = best_attack_types(3, defenders)
+    brute = max(coverage(c, defenders)
+                for c in itertools.combinations(range(1, 18), 3))
+    assert score == pytest.approx(brute)
+    assert coverage(types, defenders) == pytest.approx(score)
+
+
+def test_best_attack_types_with_weights():
+    defenders = species_types([6, 25, 213])
+    # Only charizard matters: rock hits it for 4x.
+    types, score = best_attack_types(1, defenders, weights=[1, 0, 0])
+    assert score == 1
+    assert coverage(types, defenders, [1, 0, 0]) == 1
+
+
+def test_best_team_is_exhaustive():
+    species = np.arange(1, 41)
+    attacks = [5, 10, 11, 13]
+    team, cost = best_team(3, species, attacks)
+
+    weak = effectiveness(attacks, species_types(species)) > 1
+
+    def shared(members):
+        counts = weak[:, members].sum(axis=1)
+        return np.maximum(counts - 1, 0).mean()
+
+    brute = min(shared(list(c))
+                for c in itertools.combinations(range(len(species)), 3))
+    assert cost == pytest.approx(brute)
+    assert shared([s - 1 for s in team]) == pytest.approx(cost)
+    assert len(set(team)) == 3
+
+
+def test_best_team_repeats_a_type_pair():
+    # Pidgey and Pidgeotto are both normal/flying, and immune to ground.
+    team, cost = best_team(3, [16, 17, 25, 26, 74], attacks=[5])
+    assert sorted(team) == [16, 17, 25]
+    assert cost == 0.
+    team, cost = best_team(3, [16, 17, 25], attacks=[5])
+    assert sorted(team) == [16, 17, 25]
+    team, cost = best_team(3, [16, 17, 18, 25], attacks=[5])
+    assert len(set(team)) == 3 and cost == 0.
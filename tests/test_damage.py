@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.objects import Move, Pokemon
+import phanpy.core.damage as damage
+from phanpy.core.damage import (damage_distribution, damage_distributions,
+                                critical_hits, hit_chances, SKILL_LINK,
+                                _one_hit)
+from phanpy.core.algorithms import critical
+from phanpy.core.learnsets import learnset_index
+import phanpy.core.tables as tb
+
+
+@pytest.fixture(scope='function')
+def setUpPokemon():
+    np.random.seed(0)
+    return Pokemon('garchomp'), Pokemon('rhydon')
+
+
+def test_hit_chances():
+    hits, chances = hit_chances(2, 5, generation_id=4)
+    assert list(hits) == [2, 3, 4, 5]
+    assert list(chances) == [3/8., 3/8., 1/8., 1/8.]
+    assert list(hit_chances(2, 5, generation_id=5)[1]) == [.35, .35,
+                                                           .15, .15]
+    assert list(hit_chances(2, 2)[0]) == [2]
+    assert list(hit_chances(np.nan, np.nan)[0]) == [1]
+
+
+def test_default_generation_is_that_of_the_version_group(monkeypatch):
+    # omega-ruby-alpha-sapphire is of generation 6, in region 3.
+    monkeypatch.setattr(tb, 'VERSION_GROUP_ID', 16)
+    monkeypatch.setattr(tb, 'REGION_ID', 3)
+    assert list(hit_chances(2, 5)[1]) == [.35, .35, .15, .15]
+
+
+def test_single_hit(setUpPokemon):
+    f1, f2 = setUpPokemon
+    d = damage_distribution(f1, Move('tackle'), f2)
+    assert np.isclose(d.chances.sum(), 1)
+    # The 16 random factors, with and without a critical hit.
+    assert np.count_nonzero(d.chances) <= 32
+    assert damage_distribution(f1, Move('growl'), f2) is None
+
+
+def test_every_step_is_floored():
+    # 7 hp at the lowest roll is floor(5.95) = 5, and floor(5 * 1.5) = 7
+    # with STAB; flooring once would give floor(8.925) = 8.
+    chances = _one_hit(7, [1.5, 1., 1.], 2., 0.)
+    assert np.flatnonzero(chances)[[0, -1]].tolist() == [7, 10]
+    # Not very effective twice, but at least 1.
+    assert np.flatnonzero(_one_hit(2, [1., .25, 1.], 2., 0.)).tolist() == [1]
+    assert _one_hit(9, [1., 0., 1.], 2., 0.).tolist() == [1.]
+
+
+def test_critical_hits_depend_on_the_generation(setUpPokemon,
+                                               monkeypatch):
+    assert critical_hits(4)[0] == critical_hits(5)[0] == 2.
+    assert critical_hits(4)[1][0] == 1/16.
+    assert critical_hits(6)[0] == 1.5 and critical_hits(6)[1][3] == 1.
+    assert critical_hits(7)[1][0] == 1/24.
+
+    # From the third stage on, every hit of generation 6 is critical.
+    f1, f2 = setUpPokemon
+    f1.stage.critical = 3
+    tackle = Move('tackle')
+    sure = damage_distribution(f1, tackle, f2, generation_id=6)
+    assert np.count_nonzero(sure.chances) <= 16
+    assert sure.mean() > damage_distribution(f1, tackle, f2,
+                                             generation_id=5).mean()
+
+    monkeypatch.setattr(tb, 'VERSION_GROUP_ID', 15)  # x-y
+    assert critical(f1, tackle) == 1.5
+
+
+def test_multi_hit_is_a_convolution(setUpPokemon, monkeypatch):
+    f1, f2 = setUpPokemon
+    double_kick = damage_distribution(f1, Move('double-kick'), f2)
+    fury_attack = damage_distribution(f1, Move('fury-attack'), f2)
+
+    # The same moves, hitting once.
+    monkeypatch.setattr(damage, 'hit_chances',
+                        lambda *args: (np.array([1]), np.array([1.])))
+    kick = damage_distribution(f1, Move('double-kick'), f2)
+    attack = damage_distribution(f1, Move('fury-attack'), f2)
+
+    assert np.allclose(double_kick.chances,
+                       np.convolve(kick.chances, kick.chances))
+    assert np.isclose(fury_attack.chances.sum(), 1)
+    assert np.isclose(fury_attack.mean(), 3 * attack.mean())
+
+
+def test_triple_kick_hits_harder_each_time(setUpPokemon, monkeypatch):
+    f1, f2 = setUpPokemon
+    triple_kick = Move('triple-kick').id
+    kicks = damage_distribution(f1, triple_kick, f2)
+
+    # Single hits of 1, 2 and 3 times the power.
+    columns = damage.move_columns()
+    monkeypatch.setattr(damage, 'hit_chances',
+                        lambda *args: (np.array([1]), np.array([1.])))
+    hits = []
+    for n in (1, 2, 3):
+        power = columns['power'].copy()
+        power[triple_kick] *= n
+        monkeypatch.setattr(damage, 'move_columns',
+                            lambda power=power: dict(columns, power=power))
+        hits.append(damage_distribution(f1, triple_kick, f2).chances)
+
+    assert np.allclose(kicks.chances,
+                       np.convolve(np.convolve(hits[0], hits[1]), hits[2]))
+
+
+def test_skill_link_hits_five_times(setUpPokemon):
+    f1, f2 = setUpPokemon
+    fury_attack = damage_distribution(f1, Move('fury-attack'), f2)
+    f1.ability = SKILL_LINK
+    linked = damage_distribution(f1, Move('fury-attack'), f2)
+    assert np.isclose(linked.mean(), 5 / 3. * fury_attack.mean())
+    assert linked.ko_chance(0) == 1 and linked.ko_chance(10 ** 4) == 0
+
+
+def test_every_learnable_move(setUpPokemon):
+    f1, f2 = setUpPokemon
+    distributions = damage_distributions(f1, f2)
+    learnable = learnset_index().learnable(f1.id, level=f1.level)
+    assert set(distributions) < set(learnable)
+    assert Move('scratch').id in distributions
+    assert all(np.isclose(d.chances.sum(), 1)
+               for d in distributions.values())
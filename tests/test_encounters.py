@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.encounters import encounter_index, wild_pokemon
+
+
+@pytest.fixture(scope='module')
+def setUpIndex():
+    return encounter_index()
+
+
+def test_probabilities_sum_to_one(setUpIndex):
+    table = setUpIndex.table(14, 6, 'walk')
+    assert np.isclose(table.probability.sum(), 1)
+    assert (table.min_level <= table.max_level).all()
+
+
+def test_conditions_replace_the_default_encounters(setUpIndex):
+    # Ravaged Path: slot 134 is a zubat (41), or a geodude (74) with the
+    # Poké Radar on.
+    default = setUpIndex.table(14, 6, 'walk')
+    radar = setUpIndex.table(14, 6, 'walk', conditions=['radar-on'])
+    assert len(default.pokemon_id) == len(radar.pokemon_id)
+    assert (radar.pokemon_id == 74).sum() == (default.pokemon_id == 74).sum() + 1
+
+
+def test_invalid_condition_raises(setUpIndex):
+    with pytest.raises(KeyError):
+        setUpIndex.table(14, 6, 'walk', conditions=['not-a-condition'])
+    with pytest.raises(KeyError):
+        setUpIndex.table(14, 6, 'not-a-method')
+
+
+def test_samples_are_within_the_table(setUpIndex):
+    table = setUpIndex.table(14, 6, 'walk')
+    batch = setUpIndex.sample(14, 6, 'walk', n=10000, rng=0)
+    assert len(batch.pokemon_id) == 10000
+    assert set(batch.pokemon_id) <= set(table.pokemon_id)
+    assert batch.level.min() >= table.min_level.min()
+    assert batch.level.max() <= table.max_level.max()
+
+
+def test_seeded_samples_are_reproducible(setUpIndex):
+    a = setUpIndex.sample(14, 6, 'walk', n=100, rng=1)
+    b = setUpIndex.sample(14, 6, 'walk', n=100, rng=1)
+    assert (a.pokemon_id == b.pokemon_id).all()
+    assert (a.level == b.level).all()
+
+
+def test_wild_pokemon():
+    pokemon = wild_pokemon(14, 6, 'walk', n=3, rng=0)
+    assert len(pokemon) == 3
+    assert all(p.id in (41, 74, 95) for p in pokemon)
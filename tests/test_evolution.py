@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.evolution import evolution_index
+
+
+@pytest.fixture(scope='module')
+def setUpIndex():
+    return evolution_index()
+
+
+def test_chain_and_stages(setUpIndex):
+    assert list(setUpIndex.chain(5)) == [4, 5, 6]
+    assert list(setUpIndex.stage[[4, 5, 6]]) == [0, 1, 2]
+    assert setUpIndex.base_form(6) == 4
+    # pichu is the base form of pikachu's chain.
+    assert setUpIndex.base_form(26) == 172
+
+
+def test_next_evolutions(setUpIndex):
+    assert list(setUpIndex.next_evolutions(1)) == [2]
+    assert len(setUpIndex.next_evolutions(3)) == 0
+    assert {134, 135, 136} <= set(setUpIndex.next_evolutions(133))
+
+
+def test_evolution_conditions(setUpIndex):
+    ivysaur, = setUpIndex.evolutions(1)
+    assert ivysaur.trigger == 'level-up'
+    assert ivysaur.minimum_level == 16
+    assert ivysaur.trigger_item_id is None
+
+
+def test_invalid_species_raises(setUpIndex):
+    with pytest.raises(KeyError):
+        setUpIndex.chain(0)
+    assert 0 not in setUpIndex
+    assert 1 in setUpIndex
+
+
+def test_evolve_by_level(setUpIndex):
+    evolved = setUpIndex.evolve([1, 1, 1, 4], [10, 20, 40, 100], rng=0)
+    assert list(evolved) == [1, 2, 3, 6]
+
+
+def test_evolve_other_triggers(setUpIndex):
+    # pikachu evolves with a thunder stone.
+    assert setUpIndex.evolve([25], 100, rng=0)[0] == 25
+    assert setUpIndex.evolve([25], 100, other_level=30, rng=0)[0] == 26
+    assert setUpIndex.evolve([25], 20, other_level=30, rng=0)[0] == 25
+
+
+def test_evolve_branches_at_random(setUpIndex):
+    # wurmple evolves into silcoon or cascoon.
+    evolved = setUpIndex.evolve(np.full(1000, 265), 8, rng=0)
+    assert set(evolved) == {266, 268}
+
+
+def test_evolve_within_the_generation(setUpIndex):
+    # sylveon is of generation 6, glaceon of generation 4.
+    eevees = np.full(1000, 133)
+    evolved = setUpIndex.evolve(eevees, 100, other_level=1, rng=0,
+                                version_group_id=8)
+    assert 471 in evolved and 700 not in evolved
+    evolved = setUpIndex.evolve(eevees, 100, other_level=1, rng=0,
+                                version_group_id=15)
+    assert 700 in evolved
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.experience import (exp_for_level, level_for_exp, exp_yield,
+                                    growth_rate)
+
+
+def test_exp_for_level():
+    # slow and medium growth rates.
+    assert list(exp_for_level([1, 2], [50, 50])) == [156250, 125000]
+    assert exp_for_level(2, 1) == 0
+
+
+def test_level_for_exp_on_the_boundaries():
+    assert list(level_for_exp([1, 2], [156249, 125000])) == [49, 50]
+    assert level_for_exp(2, 0) == 1
+    assert level_for_exp(2, 10**9) == 100
+
+
+def test_level_for_exp_is_the_inverse_of_exp_for_level():
+    rng = np.random.default_rng(0)
+    rates = rng.integers(1, 7, 1000)
+    exps = rng.integers(0, 10**6, 1000)
+    levels = level_for_exp(rates, exps)
+    assert (exp_for_level(rates, levels) <= exps).all()
+    below = levels < 100
+    assert (exp_for_level(rates[below], levels[below] + 1)
+            > exps[below]).all()
+
+
+def test_growth_rate():
+    # bulbasaur is medium-slow.
+    assert growth_rate(1) == 4
+
+
+def test_exp_yield():
+    assert exp_yield(64, 10, scaled=False) == 91
+    assert exp_yield(64, 10, trainer=True, scaled=False) == 137
+    assert exp_yield(64, 10, participants=2, scaled=False) == 45
+    # A weaker winner gains more with the scaled formula.
+    assert list(exp_yield(64, [10, 10], [5, 30], scaled=True)) == [202, 36]
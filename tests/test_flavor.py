@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.flavor import flavor_text, reader
+import phanpy.core.tables as tb
+
+
+def test_quoted_text_over_several_lines():
+    # The soft hyphen of "fore-legs" is dropped with the line break.
+    assert flavor_text('move', 1, 3) == 'Pounds with forelegs or tail.'
+    assert flavor_text('item', 1, 5) == ('The best BALL that catches a '
+                                         'POKéMON without fail.')
+
+
+def test_unquoted_text():
+    assert flavor_text('ability', 1, 5) == 'Helps repel wild POKéMON.'
+
+
+def test_defaults_to_the_current_version_group():
+    assert flavor_text('move', 1) == flavor_text('move', 1,
+                                                 tb.VERSION_GROUP_ID)
+
+
+def test_every_row_is_indexed():
+    assert len(reader('move')) == len(tb.move_flavor_text)
+
+
+def test_versions():
+    versions = reader('item').versions(1)
+    assert versions[0] == 5
+    assert tb.VERSION_GROUP_ID in versions
+
+
+def test_missing_text_raises():
+    with pytest.raises(KeyError):
+        flavor_text('move', 1, 1)
+    with pytest.raises(KeyError):
+        flavor_text('pokemon', 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os, sys
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.jobs import run, run_all, read_jobs, dumps, make_pokemon
+
+
+def test_make_pokemon_from_a_spec():
+    p = make_pokemon({'pokemon': 'garchomp', 'level': 78,
+                      'nature': 'adamant', 'item': 'quick-claw',
+                      'moves': ['earthquake', 33]})
+    assert p.level == 78
+    assert p.nature['name'] == 'adamant'
+    assert p.item.name == 'quick-claw'
+    assert [m.name for m in p.moves] == ['earthquake', 'tackle']
+
+
+def test_simulate_counts_every_battle():
+    out = run({'kind': 'simulate', 'p1': 'garchomp', 'p2': 'shuckle',
+               'n': 3, 'seed': 0, 'id': 7})
+    result = out['result']
+    assert out['id'] == 7
+    assert result['p1_wins'] + result['p2_wins'] + result['draws'] == 3
+
+
+def test_damage_is_immuned_by_type():
+    # ghost-type gengar is immune to normal-type tackle.
+    out = run({'kind': 'damage', 'attacker': 'rattata',
+               'defender': 'gengar', 'move': 'tackle', 'n': 10})
+    assert out['result']['max'] == 0
+
+
+def test_lookup_by_id_and_by_identifier():
+    by_id = run({'kind': 'lookup', 'table': 'moves', 'key': 289})
+    by_name = run({'kind': 'lookup', 'table': 'moves', 'key': 'snatch'})
+    assert by_id['result'] == by_name['result']
+    assert by_id['result']['priority'] == 4
+
+
+def test_errors_are_reported_not_raised():
+    out = run({'kind': 'lookup', 'table': 'moves', 'key': 'not-a-move'})
+    assert 'error' in out
+    assert 'error' in run({'kind': 'not-a-kind'})
+
+
+def test_jobs_that_are_not_objects():
+    for job in read_jobs(io.StringIO('"x"\n[1]\n5\n')):
+        out = run(job)
+        assert out['kind'] is None
+        assert out['error'].startswith('A job should be a JSON object')
+
+
+def test_read_jobs_from_json_lines_and_from_a_list():
+    lines = io.StringIO('{"kind": "lookup"}\n\n{"kind": "damage"}\n')
+    array = io.StringIO('[{"kind": "lookup"}, {"kind": "damage"}]')
+    expected = [{'kind': 'lookup'}, {'kind': 'damage'}]
+    assert list(read_jobs(lines)) == expected
+    assert list(read_jobs(array)) == expected
+
+
+def test_results_are_valid_json():
+    jobs = [{'kind': 'lookup', 'table': 'moves', 'key': 'snatch'}]
+    for result in run_all(jobs):
+        # `power` is missing for status moves and should become null.
+        assert json.loads(dumps(result))['result']['power'] is None
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import phanpy.core.tables as tb
+from phanpy.core.objects import Pokemon
+from phanpy.core.learnsets import learnset_view, learnable_moves, render
+
+
+def test_view_has_each_move_once_per_pokemon():
+    view = learnset_view()
+    assert not view.duplicated(['pokemon_id', 'move_id']).any()
+
+
+def test_learnable_moves_match_the_pokemon_moves_table():
+    pm = tb.pokemon_moves
+    condition = (pm['pokemon_id'] == 231) & (pm['level'] <= 20)
+    expected = sorted(set(pm[condition]['move_id']))
+    assert list(learnable_moves(231, 20)['move_id']) == expected
+
+
+def test_pokemon_all_moves_has_no_duplicates():
+    p = Pokemon(231, 100)
+    assert len(p._all_moves) == len(set(p._all_moves))
+    assert set(p._all_moves) == set(learnable_moves(231, 100)['move_id'])
+
+
+def test_render_one_line_per_move():
+    moves = learnable_moves(231, 20)
+    lines = render(moves).split('\n')
+    assert len(lines) == len(moves)
+    assert all(len(line) == 5 + 15 + 6 + 6 + 40 + 4 for line in lines)
+
+
+@pytest.fixture(scope='module')
+def setUpIndex():
+    from phanpy.core.learnsets import LearnsetIndex, all_pokemon_moves
+    yield LearnsetIndex(), all_pokemon_moves()
+
+
+def test_index_learnable_matches_a_table_filter(setUpIndex):
+    index, pm = setUpIndex
+    for pokemon_id, level in [(231, 1), (231, 20), (445, 100)]:
+        condition = ((pm['pokemon_id'] == pokemon_id) &
+                     (pm['version_group_id'] == 8) &
+                     (pm['level'] <= level))
+        expected = sorted(set(pm[condition]['move_id']))
+        assert list(index.learnable(pokemon_id, 8, level)) == expected
+
+
+def test_index_level_up_moves_are_in_learning_order(setUpIndex):
+    index, __ = setUpIndex
+    learnset = index.learnset(445, 8)
+    assert list(learnset.levels) == sorted(learnset.levels)
+    assert len(index.level_up(445, 8, 0)) == 0
+    assert len(index.level_up(445, 8, 100)) == len(learnset.level_up)
+
+
+def test_index_default_moves_are_the_last_four(setUpIndex):
+    index, __ = setUpIndex
+    moves = index.default_moves(445, 8, 100)
+    assert len(moves) <= 4
+    assert len(set(moves)) == len(moves)
+    assert moves[-1] == index.level_up(445, 8, 100)[-1]
+
+
+def test_index_unknown_key_raises_keyerror(setUpIndex):
+    index, __ = setUpIndex
+    with pytest.raises(KeyError):
+        index.learnable(1, 999)
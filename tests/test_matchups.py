@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import phanpy.core.matchups as mu
+from phanpy.core.matchups import matchups, compute, _move_table
+import phanpy.core.tables as tb
+
+SPECIES = np.arange(1, 31)
+
+
+@pytest.fixture(scope='module')
+def setUpMatchups():
+    return compute(SPECIES, level=50, workers=0)
+
+
+def test_shapes(setUpMatchups):
+    m = setUpMatchups
+    assert m.damage.shape == m.turns.shape == (len(SPECIES), len(SPECIES))
+    assert (m.damage >= 0).all()
+    assert m.index(5) == 4
+
+
+def test_turns_follow_the_damage(setUpMatchups):
+    m = setUpMatchups
+    assert np.isinf(m.turns[m.damage == 0]).all()
+    hit = m.damage > 0
+    assert (m.turns[hit] >= 1).all()
+    assert np.isfinite(m.turns[hit]).all()
+
+
+def test_processes_give_the_same_result(setUpMatchups):
+    pooled = compute(SPECIES, level=50, workers=2)
+    assert np.allclose(pooled.damage, setUpMatchups.damage)
+
+
+def test_mean_number_of_hits():
+    # comet-punch hits 2 to 5 times, double-kick twice.
+    assert _move_table(4)['hits'][4] == 3.
+    assert _move_table(5)['hits'][4] == pytest.approx(3.1)
+    assert _move_table(7)['hits'][24] == 2.
+    assert _move_table(7)['hits'][33] == 1.
+    # triple-kick hits 3 times, with 1, 2 and 3 times its power.
+    assert _move_table(7)['hits'][167] == 6.
+
+
+def test_types_follow_the_version_group(monkeypatch):
+    arrays = []
+    monkeypatch.setattr(mu, '_init', arrays.append)
+    monkeypatch.setattr(mu, '_rows', lambda chunk: np.zeros((len(chunk), 1)))
+    # clefairy is normal before X and Y (version group 15), and fairy
+    # from them on.
+    compute([35], level=50, version_group_id=15, workers=0)
+    compute([35], level=50, version_group_id=8, workers=0)
+    assert arrays[0]['types'].tolist() == [[18, 0]]
+    assert arrays[0]['efficacy'].shape == (19, 19)
+    assert arrays[1]['types'].tolist() == [[1, 0]]
+    assert arrays[1]['efficacy'].shape == (18, 18)
+
+
+def test_cache_is_memory_mapped(tmp_path, monkeypatch, setUpMatchups):
+    monkeypatch.setattr(tb, 'CACHE_PATH', str(tmp_path) + '/')
+    first = matchups(level=50, species_ids=SPECIES, workers=0)
+    assert len(list(tmp_path.iterdir())) == 3
+    second = matchups(level=50, species_ids=SPECIES, workers=0)
+    assert isinstance(second.damage, np.memmap)
+    assert np.allclose(second.damage, setUpMatchups.damage)
+    assert np.allclose(first.turns, second.turns)
+
+    # Other parameters are another cache entry.
+    matchups(level=20, species_ids=SPECIES, workers=0)
+    assert len(list(tmp_path.iterdir())) == 6
+
+
+def test_data_files_are_hashed_once(monkeypatch):
+    mu._key(SPECIES, 50, 1, 15)
+    opened = []
+    monkeypatch.setattr(mu, 'open', lambda *args: opened.append(args),
+                        raising=False)
+    assert mu._key(SPECIES, 50, 1, 15) != mu._key(SPECIES, 20, 1, 15)
+    assert opened == []
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import phanpy.core.names as names
+from phanpy.core.names import NameIndex, FuzzyIndex, normalize, did_you_mean
+from phanpy.core.objects import Pokemon, Move, Item
+
+
+@pytest.fixture(scope='module')
+def setUpIndex():
+    return NameIndex(cache=False)
+
+
+def test_normalize():
+    assert normalize('Quick Claw') == normalize('quick-claw') == 'quickclaw'
+    assert normalize("Farfetch'd") == 'farfetchd'
+    assert normalize('Flabébé') == 'flabebe'
+    # Only the accents of latin letters are dropped.
+    assert normalize('ガブリアス') == 'ガブリアス'
+    assert normalize('Nidoran♀') == normalize('nidoran-f') == 'nidoranf'
+    assert normalize('Nidoran♂') == 'nidoranm'
+
+
+def test_resolve_in_any_language(setUpIndex):
+    assert setUpIndex.resolve('Pottrott', 'pokemon') == 213
+    assert setUpIndex.resolve('ガブリアス', 'pokemon') == 445
+    assert setUpIndex.resolve('QUICK CLAW', 'item') == 194
+
+
+def test_resolve_a_translated_name(setUpIndex):
+    # translations/cs.csv, in Czech (language 10).
+    assert setUpIndex.resolve('Smrad', 'ability') == 1
+    assert [entry.language_id
+            for entry in setUpIndex.lookup('Smrad', 'ability')] == [10]
+
+
+def test_gender_signs(setUpIndex):
+    assert setUpIndex.resolve('Nidoran♀', 'pokemon') == 29
+    assert setUpIndex.resolve('Nidoran♂', 'pokemon') == 32
+
+
+def test_names_shared_by_several_kinds(setUpIndex):
+    kinds = {entry.kind for entry in setUpIndex.lookup('metronome')}
+    assert kinds == {'move', 'item'}
+    assert setUpIndex.resolve('metronome', 'move') == 118
+
+
+def test_unknown_names(setUpIndex):
+    assert setUpIndex.lookup('not-a-name') == []
+    with pytest.raises(KeyError):
+        setUpIndex.resolve('not-a-name', 'move')
+    with pytest.raises(KeyError):
+        setUpIndex.lookup('tackle', kind='not-a-kind')
+
+
+def test_prefix(setUpIndex):
+    found = setUpIndex.prefix('garch', kind='pokemon')
+    assert found[0].id == 445
+    assert len({(entry.kind, entry.id) for entry in found}) == len(found)
+    assert len(setUpIndex.prefix('a', limit=5)) == 5
+
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(names, 'CACHE_PATH', str(tmp_path) + '/')
+    built = NameIndex()
+    assert (tmp_path / 'names.npz').exists()
+    loaded = NameIndex()
+    assert loaded.names == built.names
+    assert loaded.lookup('Pottrott') == built.lookup('Pottrott')
+
+
+def test_unreadable_cache_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(names, 'CACHE_PATH', str(tmp_path) + '/')
+    # As left by a writer that was interrupted.
+    (tmp_path / 'names.npz').write_bytes(b'PK\x03\x04 not a whole file')
+    index = NameIndex()
+    assert index.lookup('Pottrott')
+    assert NameIndex().names == index.names
+    assert [p.name for p in tmp_path.iterdir()] == ['names.npz']
+
+
+def test_constructors_accept_localized_names():
+    assert Pokemon('Pottrott').name == 'shuckle'
+    assert Move('Psychokinese').name == 'psychic'
+    assert Item('Quick Claw').name == 'quick-claw'
+
+
+@pytest.fixture(scope='module')
+def setUpFuzzyIndex(setUpIndex):
+    return FuzzyIndex(setUpIndex)
+
+
+def test_fuzzy_search_ranks_the_closest_first(setUpFuzzyIndex):
+    assert setUpFuzzyIndex.search('garchmop')[0].name == 'garchomp'
+    assert setUpFuzzyIndex.search('erthquake', kind='move')[0].id == 89
+    assert setUpFuzzyIndex.search('quik claw')[0].name == 'quick-claw'
+
+
+def test_fuzzy_search_by_kind(setUpFuzzyIndex):
+    found = setUpFuzzyIndex.search('adamant', kind='item')
+    assert found and all(s.kind == 'item' for s in found)
+
+
+def test_fuzzy_search_without_match(setUpFuzzyIndex):
+    assert setUpFuzzyIndex.search('x') == []
+    assert did_you_mean('zzzzzzzz', 'move') == ''
+
+
+def test_errors_suggest_names():
+    with pytest.raises(KeyError, match='shuckle'):
+        Pokemon('shukle')
+    with pytest.raises(KeyError, match='earthquake'):
+        Move('erthquake')
+    with pytest.raises(KeyError, match='quick-claw'):
+        Item('quik-claw')
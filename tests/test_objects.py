@@ -9,7 +9,9 @@ root_path = file_path.replace('/phanpy/tests', '')
 sys.path.append(root_path) if root_path not in sys.path else None
 
 import numpy as np
-from phanpy.core.objects import Status, Item, Move, Pokemon, Trainer
+from phanpy.core.objects import (Status, Item, Move, Pokemon, Trainer,
+                                 Pool, item_registry)
+import phanpy.core.tables as tb
 
 
 class TestItems():
@@ -47,6 +49,25 @@ class TestItems():
         assert item.fling.effect_name == 'berry-effect'
         assert item.flags.id.values == [7]
 
+    def test_items_share_their_record(self):
+        assert Item(126).record is Item('cheri-berry').record
+        assert Item(0).record is Pokemon(25).item.record
+
+    def test_item_flags_are_bits(self):
+        item = Item(1)
+        assert item.has_flag('holdable')
+        assert item.has_flag('countable', 'consumable')
+        assert not item.has_flag('holdable', 'underground')
+        assert not Item(0).has_flag('holdable')
+        assert item.flag_bits == item_registry().flag_mask(
+            'countable', 'consumable', 'usable-in-battle', 'holdable')
+
+    def test_unknown_item(self):
+        with pytest.raises(KeyError):
+            Item('not-an-item')
+        with pytest.raises(KeyError):
+            Item(-5)
+
 
 class TestStatusInstantiation():
 
@@ -148,6 +169,18 @@ class TestStatusMethods():
         with pytest.raises(KeyError):
             poison.remove('burn')
 
+    def test_iterate_twice(self, setUpStatus):
+        s = setUpStatus[0] + setUpStatus[2]
+        assert list(s) == list(s) == ['poison', 'confused']
+
+    def test_clear(self, setUpStatus):
+        poison, __, confused, disabled = setUpStatus
+        mixed = poison + confused + disabled
+        mixed.clear()
+        assert mixed == Status(0) and not mixed.volatile.any()
+        assert list(mixed.id) == [0]
+        assert list(mixed.duration) == [float('inf')]
+
     def test_reduce_duration_by_1(self, setUpStatus):
         __, burn, confused, disabled = setUpStatus
         mixed = burn + confused + disabled
@@ -231,11 +264,33 @@ class TestPokemon():
         p.stage.attack += 3  # the factor should be multiplied by 2.5
         assert p.stage_factor.attack == 2.5
 
+    def test_stages_are_capped_at_6(self, setUpPokemon):
+        p = setUpPokemon
+        p.stage.attack += 8
+        p.stage.defense -= 7
+        assert p.stage_factor.attack == 4
+        assert p.stage_factor.defense == 0.25
+
     def test_current_stats_change_when_factors_change(self, setUpPokemon):
         p = setUpPokemon
         p.stage.attack += 3
         assert p.current.attack == np.floor(p.stats.attack * 2.5)
 
+    def test_damage_persists_between_accesses(self, setUpPokemon):
+        p = setUpPokemon
+        p.current.hp -= 30
+        p.stage.attack += 1
+        assert p.current.hp == p.stats.hp - 30
+        assert p.current.attack == np.floor(p.stats.attack * 1.5)
+
+    def test_reset_current_restores_the_hp(self, setUpPokemon):
+        p = setUpPokemon
+        p.current.hp -= 30
+        p.stage.speed -= 2
+        p.reset_current()
+        assert p.current.hp == p.stats.hp
+        assert p.current.speed == p.stats.speed
+
     def test_add_received_damage(self, setUpPokemon):
         p = setUpPokemon
         p.history.damage.appendleft(288)
@@ -254,6 +309,12 @@ class TestPokemon():
         for i in range(4):
             assert p.moves[i].name == first_4_moves[i].name
 
+    def test_no_learnset_in_the_version_group(self, monkeypatch):
+        # garchomp is not in red and blue (version group 1).
+        monkeypatch.setattr(tb, 'VERSION_GROUP_ID', 1)
+        p = Pokemon(445, 50)
+        assert p.moves == []
+
     def test_set_pp_and_power(self, setUpPokemon):
         p = setUpPokemon
         p.moves[0] = Move(33)  # tackle, power 40, pp 35, accuracy 100.
@@ -300,3 +361,147 @@ class TestPokemon():
         t.set_pokemon(3, Pokemon(10001))
         t.party(1).moves[1] = Move(33)
         assert t.party(1).moves[1].name == 'tackle'
+
+
+class TestClone():
+
+    def test_clone_battles_on_its_own(self, setUpPokemon):
+        p = setUpPokemon
+        p.current.hp -= 10
+        q = p.clone()
+
+        assert q == p and q is not p
+        assert q.current.hp == p.current.hp
+
+        q.current.hp -= 20
+        q.stage.attack += 2
+        q.status += Status('burn')
+        q.status.reduce()
+        q.moves[0].pp -= 3
+        q.history.damage.appendleft(20)
+        q.history.stage += 1
+        q.flags['rest'] = True
+
+        assert p.current.hp == q.current.hp + 20
+        assert p.stage.attack == 0
+        assert 'burn' not in p.status
+        assert p.moves[0].pp == q.moves[0].pp + 3
+        assert len(p.history.damage) == 0 and p.history.stage == 0
+        assert 'rest' not in p.flags
+
+    def test_clone_shares_the_data(self, setUpPokemon):
+        p = setUpPokemon
+        q = p.clone()
+        assert q._iv is p._iv and q._base is p._base
+        assert q.moves[0].flag is p.moves[0].flag
+
+        # Setting the IVs of a clone does not change the prototype's.
+        q.set_iv([0] * 6)
+        assert (p.iv > 0).all()
+
+    def test_clone_trainer(self):
+        t = Trainer('Satoshi', 2)
+        u = t.clone()
+        assert u.name == t.name
+        assert all(p.trainer is u for p in u.party())
+        assert all(p.trainer is t for p in t.party())
+
+        u.party(1).current.hp = 0
+        assert t.party(1).current.hp > 0
+
+
+class TestResetForBattle():
+
+    def test_reset_pokemon(self, setUpPokemon):
+        p = setUpPokemon
+        hp = p.current.hp
+        pp = [m.pp for m in p.moves]
+        current = p._current
+
+        p.current.hp -= 30
+        p.stage.speed = 2
+        p.status += Status('poison')
+        p.moves[0].pp -= 2
+        p.flags['rest'] = True
+        p.history.damage.appendleft(30)
+        p.history.stage = 3
+        p.order = 2
+
+        status = p.status
+
+        assert p.reset_for_battle() is p
+        assert p.current.hp == hp and p._current is current
+        assert (p.stage == 0).all()
+        assert p.status is status and p.status == Status(0)
+        assert [m.pp for m in p.moves] == pp
+        assert not p.flags and not p.history.damage
+        assert p.history.stage == 0 and p.order == 0
+
+    def test_reset_keeps_the_critical_stage_of_items(self, setUpPokemon):
+        p = setUpPokemon
+        p.item = Item('scope-lens')
+        p.stage.critical = 3
+        p.reset_for_battle()
+        assert p.stage.critical == 1
+
+    def test_pool_reuses_instances(self):
+        t = Trainer('Satoshi', 2)
+        pool = Pool(t)
+
+        with pool.borrow() as u:
+            assert u is not t
+            u.party(1).current.hp = 0
+
+        with pool.borrow() as v:
+            assert v is u
+            assert v.party(1).current.hp > 0
+            w = pool.acquire()
+            assert w is not v
+
+        assert pool.size == 2
+        assert t.party(1).current.hp > 0
+
+
+class TestSlots():
+
+    def test_instances_have_no_dict(self, setUpPokemon):
+        p = setUpPokemon
+        for x in (p, p.moves[0], p.item, p.status, Trainer('Satoshi', 1)):
+            assert not hasattr(x, '__dict__')
+            with pytest.raises(AttributeError):
+                x.not_an_attribute = 1
+
+    def test_shared_data(self, setUpPokemon):
+        p = setUpPokemon
+        q = Pokemon(p.id)
+        assert q.iv.index is p.iv.index
+        assert Move(p.moves[0].id).flag is p.moves[0].flag
+
+    def test_stats_are_kept_in_arrays(self, setUpPokemon):
+        p = setUpPokemon
+        for name in ('_base', '_iv', '_ev', '_stage', '_history'):
+            assert type(getattr(p, name)) is np.ndarray
+        p.current.hp -= 10
+        p.stage.speed = 2
+        p.history.damage.appendleft(10)
+        assert type(p._current) is np.ndarray
+        assert p._current[0] == p.stats.hp - 10
+        assert p._stage[5] == 2
+        assert list(p._history[0]) == [10]
+
+    def test_nature_modifier_is_a_copy(self, setUpPokemon):
+        p = setUpPokemon
+        p.set_nature('lonely')
+        stats = p.stats
+        modifier = p.nature_modifier
+        modifier.attack = 2.
+        assert tb.nature_modifiers[5, 1] == 1.1
+        assert p.nature_modifier.attack == 1.1
+        assert (p.stats == stats).all()
+
+    def test_nature_from_its_id(self, setUpPokemon):
+        p = setUpPokemon
+        p.set_nature('lonely')
+        assert p.nature_id == p.nature.id == 6
+        assert p.nature_modifier.attack == 1.1
+        assert p.nature_modifier.defense == 0.9
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.replay import (RECORD, POKEMON_RECORD, MAGIC, POKEMON,
+                                ACTION, END, HIT, Replay, ReplayWriter,
+                                record, _Draws)
+
+SPECS = [('garchomp', {'pokemon': 'shuckle', 'item': 'quick-claw',
+                       'nature': 'adamant'}),
+         ({'pokemon': 'pikachu', 'level': 30}, 'magikarp')]
+
+
+@pytest.fixture(scope='module')
+def setUpLog(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('replay').join('battles.replay'))
+    outcomes = []
+    # A tiny buffer, to flush in the middle of battles.
+    with ReplayWriter(path, buffer_size=7) as log:
+        for seed, (p1, p2) in enumerate(SPECS):
+            outcomes.append(record(log, p1, p2, seed))
+    return path, outcomes
+
+
+def test_log_is_fixed_size_records(setUpLog):
+    path, __ = setUpLog
+    with open(path, 'rb') as f:
+        assert f.read(len(MAGIC)) == MAGIC
+    assert (os.path.getsize(path) - len(MAGIC)) % RECORD.itemsize == 0
+
+
+def test_log_records_every_battle(setUpLog):
+    path, outcomes = setUpLog
+    replay = Replay(path)
+    assert len(replay) == len(SPECS)
+
+    for i, (winner, turns) in enumerate(outcomes):
+        side, logged_turns = replay.outcome(i)
+        assert logged_turns == turns
+        assert (side is None) == (winner is None)
+
+        actions = replay.actions(i)
+        assert (actions['kind'] == ACTION).all()
+        assert actions['turn'].max() == turns
+        hits = actions[actions['flags'] & HIT > 0]
+        assert (hits['damage'] >= 0).any()
+
+
+def test_pokemon_records(setUpLog):
+    path, __ = setUpLog
+    records = Replay(path).battle(0)
+    pokemon = records[records['kind'] == POKEMON].view(POKEMON_RECORD)
+    assert POKEMON_RECORD.itemsize == RECORD.itemsize
+    assert list(pokemon['actor']) == [0, 1]
+    assert list(pokemon['pokemon_id']) == [445, 213]
+    assert list(pokemon['level']) == [50, 50]
+    assert (pokemon['iv'] <= 31).all()
+
+
+def test_draws_are_counted_past_a_twist():
+    # Each float takes two 32-bit words, and the state is twisted every
+    # 624 words.
+    np.random.seed(0)
+    draws = _Draws()
+    counts = []
+    for n in (1, 311, 312, 1000):
+        np.random.random_sample(n)
+        counts.append(draws())
+    assert counts == [2, 624, 1248, 3248]
+
+    np.random.seed(1)
+    with pytest.raises(ValueError):
+        draws()
+
+
+def test_replay_reproduces_the_battles(setUpLog):
+    path, outcomes = setUpLog
+    replay = Replay(path)
+
+    for i, (winner, turns) in enumerate(outcomes):
+        replayed = replay.replay(i)
+        assert replayed.turns == turns
+        assert replayed.winner == replay.outcome(i)[0]
+        if winner is not None:
+            loser = replayed.p2 if replayed.winner == 0 else replayed.p1
+            assert loser.current.hp <= 0
+
+
+def test_replay_detects_a_different_log(setUpLog, tmpdir):
+    path, __ = setUpLog
+    records = np.array(Replay(path).battle(0))
+    actions = np.flatnonzero(records['kind'] == ACTION)
+    records['damage'][actions[0]] += 1
+
+    changed = str(tmpdir.join('changed.replay'))
+    with open(changed, 'wb') as f:
+        f.write(MAGIC)
+        records.tofile(f)
+
+    with pytest.raises(ValueError):
+        Replay(changed).replay(0)
+
+
+def test_writer_appends_to_a_log(setUpLog, tmpdir):
+    path, __ = setUpLog
+    copy = str(tmpdir.join('copy.replay'))
+    with open(path, 'rb') as f, open(copy, 'wb') as g:
+        g.write(f.read())
+
+    with ReplayWriter(copy) as log:
+        record(log, 'pikachu', 'pikachu', 5, max_turns=2)
+
+    replay = Replay(copy)
+    assert len(replay) == len(SPECS) + 1
+    assert replay.battle(-1)['kind'][-1] == END
+    assert replay.outcome(-1)[1] <= 2
+
+
+def test_not_a_log(tmpdir):
+    path = str(tmpdir.join('not.replay'))
+    with open(path, 'wb') as f:
+        f.write(b'something else')
+    with pytest.raises(ValueError):
+        Replay(path)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os, sys
+import threading
+import time
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.server import Server, Client, LocalClient
+
+
+JOBS = [{'kind': 'lookup', 'table': 'moves', 'key': 'snatch', 'id': 1},
+        {'kind': 'ping', 'id': 2},
+        {'kind': 'simulate', 'p1': 'garchomp', 'p2': 'shuckle', 'id': 3},
+        {'kind': 'lookup', 'table': 'natures', 'key': 'lax', 'id': 4}]
+
+
+@pytest.fixture(scope='module', params=[0, 1])
+def setUpServer(request, tmpdir_factory):
+    """Run a server in a background thread, with and without a pool."""
+    path = str(tmpdir_factory.mktemp('server').join('phanpy.sock'))
+    server = Server(path, workers=request.param)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_local_client_runs_jobs_in_process():
+    with LocalClient() as client:
+        result = client.request(JOBS[0])
+    assert result['result']['identifier'] == 'snatch'
+
+
+def test_pipelined_results_come_back_in_order(setUpServer):
+    with Client(setUpServer) as client:
+        results = client.requests(JOBS)
+    assert [r['id'] for r in results] == [1, 2, 3, 4]
+    assert results[1]['result'] == 'pong'
+    assert 'p1_wins' in results[2]['result']
+    assert results[3]['result']['id'] == 18
+
+
+def test_jobs_that_are_not_objects(setUpServer):
+    with Client(setUpServer) as client:
+        results = client.requests(['x', [1], 5, JOBS[1]])
+    assert all(r['error'].startswith('A job should be a JSON object')
+               for r in results[:3])
+    assert results[3]['result'] == 'pong'
+
+
+def test_server_and_local_client_agree(setUpServer):
+    with Client(setUpServer) as client, LocalClient() as local:
+        assert client.request(JOBS[0]) == local.request(JOBS[0])
+
+
+def draw():
+    # Long enough for the other worker to take the next draw.
+    time.sleep(.2)
+    return os.getpid(), np.random.random()
+
+
+def test_workers_draw_different_numbers(tmpdir):
+    server = Server(str(tmpdir.join('phanpy.sock')), workers=2,
+                    share_tables=False)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    try:
+        draws = dict(f.result() for f in [server.pool.submit(draw)
+                                          for __ in range(4)])
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    assert len(draws) == 2
+    assert len(set(draws.values())) == 2
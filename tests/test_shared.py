@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os, sys
+import pytest
+import tracemalloc
+from types import SimpleNamespace
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+import numpy as np
+import phanpy.core.shared as shared
+import phanpy.core.tables as tb
+from phanpy.core.shared import publish, attach, release
+
+
+def local_copy(tables):
+    return SimpleNamespace(**{name: getattr(tb, name) for name in tables})
+
+
+@pytest.fixture(scope='function', params=['shm', 'file'])
+def setUpHandle(request, tmpdir):
+    tables = ('moves', 'pokemon_stats', 'type_efficacy')
+    path = str(tmpdir.join('tables.bin')) if request.param == 'file' else None
+    handle = publish(tables, path=path)
+    yield handle, tables
+    release(handle)
+
+
+def test_attached_tables_equal_the_originals(setUpHandle):
+    handle, tables = setUpHandle
+    target = local_copy(tables)
+    attach(handle, target)
+    assert (target.moves['power'].fillna(-1).values ==
+            tb.moves['power'].fillna(-1).values).all()
+    assert list(target.moves.index) == list(tb.moves.index)
+    assert list(target.moves.columns) == list(tb.moves.columns)
+    assert (target.moves['identifier'].values ==
+            tb.moves['identifier'].values).all()
+    assert (target.pokemon_stats['base_stat'].values ==
+            tb.pokemon_stats['base_stat'].values).all()
+    assert np.array_equal(target.type_efficacy, tb.type_efficacy)
+
+
+def test_attached_columns_are_read_only(setUpHandle):
+    handle, tables = setUpHandle
+    target = local_copy(tables)
+    attach(handle, target)
+    with pytest.raises(ValueError):
+        target.pokemon_stats['base_stat'].values[0] = 0
+
+
+def test_mismatched_rows_raise_valueerror(setUpHandle):
+    handle, tables = setUpHandle
+    target = local_copy(tables)
+    target.moves = tb.moves.iloc[:10]
+    with pytest.raises(ValueError):
+        attach(handle, target)
+
+
+def test_attached_columns_are_shared(setUpHandle):
+    handle, tables = setUpHandle
+    target = local_copy(tables)
+    attach(handle, target)
+    power = target.moves['power'].values
+    # Selections still work on the shared views.
+    assert len(target.moves[power > 100]) > 0
+    assert not power.flags.owndata and not power.flags.writeable
+
+
+def test_memory_stays_flat_as_workers_attach(setUpHandle):
+    handle, tables = setUpHandle
+    attach(handle, local_copy(tables))
+
+    # Each worker only allocates its own frames, not the shared data.
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    targets = []
+    for __ in range(8):
+        targets.append(local_copy(tables))
+        attach(handle, targets[-1])
+    per_worker = (tracemalloc.get_traced_memory()[0] - start) / 8
+    tracemalloc.stop()
+
+    assert per_worker < handle.size / 10
+
+
+def base_stats(__):
+    return tb.pokemon_stats['base_stat'].values[:3].tolist()
+
+
+def test_workers_read_the_shared_segment():
+    handle = publish(('pokemon_stats',))
+    try:
+        # Written after the tables are loaded: only a worker reading
+        # the segment itself sees it.
+        block, = [b for b in handle.layout if b.columns
+                  and 'base_stat' in b.columns]
+        view = np.ndarray(block.shape, dtype=block.dtype, offset=block.offset,
+                          buffer=shared._segments[handle.name].buf)
+        view[block.columns.index('base_stat'), :3] = [1, 2, 3]
+
+        context = multiprocessing.get_context('fork')
+        with context.Pool(2, initializer=attach,
+                          initargs=(handle,)) as pool:
+            seen = pool.map(base_stats, range(8), chunksize=1)
+        del view
+    finally:
+        release(handle)
+
+    assert seen == [[1, 2, 3]] * 8
+    assert tb.pokemon_stats['base_stat'].values[0] != 1
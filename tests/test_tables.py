@@ -9,6 +9,7 @@ root_path = file_path.replace('/phanpy/tests', '')
 sys.path.append(root_path) if root_path not in sys.path else None
 
 from phanpy.core.tables import which_ability, efficacy
+import phanpy.core.tables as tb
 
 def test_ability_id_to_name():
     assert which_ability(10001) == 'mountaineer'
@@ -23,3 +24,58 @@ def test_ability_keyerror():
 def test_all_efficacy():
     assert efficacy(4,[9]) == 0
     assert efficacy(17, [2, 14]) == 1
+
+
+def test_nature_modifiers():
+    assert tb.nature_modifiers.shape == (25, 6)
+    # lax raises defense and lowers special-defense.
+    assert list(tb.nature_modifiers[tb.nature_ids['lax'] - 1]) == \
+        [1., 1., 1.1, 1., 0.9, 1.]
+    # Neutral natures.
+    assert (tb.nature_modifiers[tb.nature_ids['hardy'] - 1] == 1.).all()
+    assert ((tb.nature_modifiers == 1.).sum(axis=1) >= 4).all()
+    assert tb.nature_names[tb.nature_ids['adamant']] == 'adamant'
+
+
+def test_which_generation():
+    assert tb.which_generation() == 4
+    # The remakes of ruby and sapphire are set in Hoenn, region 3.
+    assert tb.which_generation(16) == 6
+    with pytest.raises(KeyError):
+        tb.which_generation(100)
+
+
+def test_write_atomically(tmp_path):
+    file_name = str(tmp_path / 'x.json')
+    with tb.write_atomically(file_name, 'w') as f:
+        f.write('[1]')
+    with open(file_name) as f:
+        assert f.read() == '[1]'
+
+    # A failed write leaves the old file, and nothing aside it.
+    with pytest.raises(ValueError):
+        with tb.write_atomically(file_name, 'w') as f:
+            f.write('[2')
+            raise ValueError
+    with open(file_name) as f:
+        assert f.read() == '[1]'
+    assert os.listdir(str(tmp_path)) == ['x.json']
+
+
+def test_once():
+    calls = []
+
+    @tb.once
+    def build():
+        """Build it."""
+        calls.append(1)
+        return object()
+
+    assert build() is build()
+    assert calls == [1]
+    assert build.__doc__ == "Build it."
+
+
+def test_read_table():
+    assert list(tb.read_table('types')['identifier'][:2]) == ['normal',
+                                                              'fighting']
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os, sys
+import numpy as np
+import pytest
+
+file_path = os.path.dirname(os.path.abspath(__file__))
+root_path = file_path.replace('/phanpy/tests', '')
+sys.path.append(root_path) if root_path not in sys.path else None
+
+from phanpy.core.tournament import (Entry, Tournament, round_robin,
+                                    swiss_pairings, make_trainer)
+from phanpy.core.algorithms import trainer_battle
+
+ENTRIES = [Entry('a', [{'pokemon': 'garchomp', 'level': 60}]),
+           Entry('b', [{'pokemon': 'magikarp', 'level': 5}]),
+           Entry('c', ['pikachu'])]
+
+
+@pytest.mark.parametrize('n', [2, 5, 6])
+def test_round_robin_meets_everyone_once(n):
+    rounds = round_robin(n)
+    pairs = [tuple(sorted(p)) for r in rounds for p in r]
+    assert len(pairs) == len(set(pairs)) == n * (n - 1) // 2
+    for r in rounds:
+        players = [x for p in r for x in p]
+        assert len(players) == len(set(players))
+
+
+def test_swiss_pairings_avoid_rematches():
+    pairs = swiss_pairings([2, 2, 1, 0], played={(0, 1)})
+    assert pairs == [(0, 2), (1, 3)]
+    # The last one rests.
+    assert swiss_pairings([0, 1, 2], set()) == [(2, 1)]
+
+
+def test_trainer_battle_ends_with_a_winner():
+    np.random.seed(0)
+    strong, weak = make_trainer(ENTRIES[0]), make_trainer(ENTRIES[1])
+    winner, turns = trainer_battle(strong, weak)
+    assert winner is strong
+    assert turns >= 1
+    assert all(p.current.hp <= 0 for p in weak.party())
+
+
+def test_tournament_and_resume(tmp_path):
+    checkpoint = str(tmp_path / 'tournament.json')
+    full = Tournament(ENTRIES, workers=0, checkpoint=checkpoint, seed=1)
+    standings = full.run()
+
+    assert [row['rank'] for row in standings] == [1, 2, 3]
+    assert sum(row['points'] for row in standings) == 3
+    assert standings[0]['name'] == 'a'
+    assert standings[0]['elo'] > 1500 > standings[-1]['elo']
+
+    # Forget the last battle, as if interrupted.
+    with open(checkpoint) as f:
+        saved = json.load(f)
+    saved['results'] = saved['results'][:-1]
+    with open(checkpoint, 'w') as f:
+        json.dump(saved, f)
+
+    resumed = Tournament(ENTRIES, workers=0, checkpoint=checkpoint, seed=1)
+    assert len(resumed.results) == 2
+    assert resumed.run() == standings
+
+    with pytest.raises(ValueError):
+        Tournament(ENTRIES, workers=0, checkpoint=checkpoint, seed=2)